@@ -1,15 +1,114 @@
+import importlib.metadata
+import itertools
+import os
+import shutil
 import sys
 import warnings
+from typing import Union
 
 import numpy as np
 import pandas as pd
-from astropy.io import fits
-from astropy.coordinates import SkyCoord, BarycentricMeanEcliptic
 
+from lifesim.util import columnar
+from lifesim.util.coordinates import equatorial_to_ecliptic
+from lifesim.util.fits_table import FitsTable
 from lifesim.util.options import Options
 from lifesim.util.habitable import single_habitable_zone
 
 
+# columns of the P-Pop output, given as the name in the P-Pop header (or the .fits table) followed
+# by the name in the catalog and the data type. The stellar type 'Stype' is handled separately
+PPOP_COLUMNS = {'Nuniverse': ('nuniverse', np.int64),
+                'Rp': ('radius_p', np.float64),  # Rearth
+                'Porb': ('p_orb', np.float64),  # d
+                'Mp': ('mass_p', np.float64),  # Mearth
+                'ep': ('ecc_p', np.float64),
+                'ip': ('inc_p', np.float64),  # rad
+                'Omegap': ('large_omega_p', np.float64),  # rad
+                'omegap': ('small_omega_p', np.float64),  # rad
+                'thetap': ('theta_p', np.float64),  # rad
+                'Abond': ('albedo_bond', np.float64),
+                'AgeomVIS': ('albedo_geom_vis', np.float64),
+                'AgeomMIR': ('albedo_geom_mir', np.float64),
+                'z': ('z', np.float64),
+                'ap': ('semimajor_p', np.float64),  # au
+                'rp': ('sep_p', np.float64),  # au
+                'AngSep': ('angsep', np.float64),  # arcsec
+                'maxAngSep': ('maxangsep', np.float64),  # arcsec
+                'Fp': ('flux_p', np.float64),  # Searth
+                'fp': ('fp', np.float64),
+                'Tp': ('temp_p', np.float64),  # K
+                'Nstar': ('nstar', np.int64),
+                'Rs': ('radius_s', np.float64),  # Rsun
+                'Ms': ('mass_s', np.float64),  # Msun
+                'Ts': ('temp_s', np.float64),  # K
+                'Ds': ('distance_s', np.float64),  # pc
+                'RA': ('ra', np.float64),  # deg
+                'Dec': ('dec', np.float64)}  # deg
+
+# columns of the catalog that are always read from the P-Pop output, since they are needed for the
+# habitable zones or are part of the star table (see `STAR_COLUMNS`)
+PPOP_REQUIRED = ['nuniverse', 'nstar', 'radius_p', 'semimajor_p', 'radius_s', 'mass_s', 'temp_s',
+                 'distance_s', 'ra', 'dec']
+
+
+def ppop_selection(nuniverse: np.ndarray,
+                   stype: np.ndarray,
+                   distance_s: np.ndarray,
+                   stypes: Union[list, type(None)] = None,
+                   distance: Union[dict, type(None)] = None,
+                   universes: Union[list, range, np.ndarray, type(None)] = None):
+    """
+    Selects the planets of a P-Pop output that fulfill all of the given conditions.
+
+    Parameters
+    ----------
+    nuniverse : np.ndarray
+        Universe index of the planets.
+    stype : np.ndarray
+        Stellar type of the host stars as integer (see `Data.other['stype_key']`).
+    distance_s : np.ndarray
+        Distance of the host stars in [pc].
+    stypes : Union[list, type(None)]
+        Stellar types to keep.
+    distance : Union[dict, type(None)]
+        Maximum distance in [pc] with the stellar type as key. Planets around stars of this type at
+        this distance or further away are removed, same as for
+        `Data.catalog_remove_distance(mode='larger')`.
+    universes : Union[list, range, np.ndarray, type(None)]
+        Universe indices to keep, e.g. ``range(0, 100)``.
+
+    Returns
+    -------
+    mask
+        True for all planets that fulfill the conditions.
+    """
+
+    mask = np.ones_like(stype, dtype=bool)
+    if stypes is not None:
+        mask &= np.isin(stype, np.asarray(stypes))
+    if distance is not None:
+        for key, value in distance.items():
+            mask &= ~((stype == key) & (distance_s >= value))
+    if universes is not None:
+        mask &= np.isin(nuniverse, np.asarray(universes))
+
+    return mask
+
+
+# numeric keys of the stellar types
+STYPE_KEY = {'A': 0,
+             'F': 1,
+             'G': 2,
+             'K': 3,
+             'M': 4}
+
+# columns describing the host star of a planet. They are stored once per star in the star table
+# `Data.stars` instead of once per planet in the catalog
+STAR_COLUMNS = ['stype', 'radius_s', 'mass_s', 'temp_s', 'distance_s', 'ra', 'dec', 'lon', 'lat',
+                's_in', 's_out', 'l_sun', 'hz_in', 'hz_out', 'hz_center']
+
+
 # TODO: automatically add data storage for all
 class Data(object):
     """
@@ -22,7 +121,13 @@ class Data(object):
     inst : dict
         Data used for simulation of the instrument.
     catalog : pd.DataFrame
-        Catalog containing all exoplanets in the sample.
+        Catalog containing all exoplanets in the sample. The properties of the host stars are not
+        stored in the catalog, instead the column `'star'` gives the row position of the host star
+        in `stars`.
+    stars : pd.DataFrame
+        Table containing the properties of all host stars in the sample, i.e. the columns listed
+        in `STAR_COLUMNS` and the star number `'nstar'`, with one row per star. The stars are
+        sorted by their star number.
     single : dict
         Data used for the spectral simulation of single exoplanets.
     other : dict
@@ -30,31 +135,429 @@ class Data(object):
     options : Options
         Location of the Options class. All options and free parameters used in a LIFEsim simulation
         must be stored here.
+    spectra : dict
+        Spectral results of the planets in the catalog, stored as two-dimensional arrays of the
+        shape (planets, wl_bins) under their name, e.g. `'noise_astro'`. The phase curves of the
+        optimizer are stored in the same way under `'snr_phase'` in the shape (planets, N_pf).
+        The column `'spectrum'` of the catalog gives the row position of every planet in these
+        arrays.
+    star_index : dict
+        Index grouping the planets in the catalog by their host star. Under the key `'nstar'`, the
+        sorted unique star numbers are stored. `'order'` contains the row positions of the planets
+        sorted by their star number and `'offsets'` the positions in `'order'` at which the
+        planets of every star start, followed by the total number of planets. The planets of the
+        i-th star are located at the row positions `order[offsets[i]:offsets[i + 1]]`.
     """
 
     def __init__(self):
         self.inst = {}
         self.catalog = None
+        self.stars = None
         self.single = {}
         self.other = {}
         self.options = Options()
         self.optm = {}
+        self.spectra = {}
+        self.star_index = None
 
     def catalog_delete(self):
         self.catalog = None
+        self.stars = None
+        self.spectra = {}
+        self.star_index = None
+
+    def star_column(self,
+                    name: str,
+                    index: Union[int, np.ndarray, type(None)] = None):
+        """
+        Returns the property of the host star of the specified planets from the star table.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column in the star table, e.g. `'distance_s'`.
+        index : Union[int, np.ndarray, type(None)]
+            Row position of the planet in the catalog. If an array of row positions is given, the
+            property is returned for all of them. If `None` is given, the property is returned
+            for every planet in the catalog.
+
+        Returns
+        -------
+        value
+            Property of the host stars of the planets.
+        """
+
+        if index is None:
+            index = slice(None)
+
+        return self.stars[name].to_numpy()[self.catalog['star'].to_numpy()[index]]
+
+    def spectrum(self,
+                 name: str,
+                 index: Union[int, np.ndarray, type(None)] = None):
+        """
+        Returns the spectral result of the specified planets.
+
+        Parameters
+        ----------
+        name : str
+            Name of the spectral result in `spectra`, e.g. `'noise_astro'`.
+        index : Union[int, np.ndarray, type(None)]
+            Row position of the planet in the catalog. If an array of row positions is given, the
+            spectra of all of them are returned in the shape (planets, wl_bins). If `None` is
+            given, the spectra are returned for every planet in the catalog.
+
+        Returns
+        -------
+        spectrum
+            Spectral result of the planets.
+        """
+
+        if index is None:
+            index = slice(None)
+
+        return self.spectra[name][self.catalog['spectrum'].to_numpy()[index]]
+
+    def spectra_create(self,
+                       names: list,
+                       n_wl: int):
+        """
+        Creates empty arrays of the shape (planets, wl_bins) for the spectral results of all
+        planets in the catalog and points the column `'spectrum'` of the catalog to their rows.
+        If a directory is given in `options.other['spectra_path']`, the arrays are created as
+        memory-mapped .npy files in this directory, which is created if it does not exist.
+        Otherwise, the arrays are held in memory.
+
+        Parameters
+        ----------
+        names : list
+            Names of the spectral results.
+        n_wl : int
+            Number of spectral bins.
+        """
+
+        self.spectra = {}
+        for _, name in enumerate(names):
+            self.spectra_add(name=name,
+                             n_col=n_wl)
+
+    def spectra_add(self,
+                    name: str,
+                    n_col: int):
+        """
+        Creates an empty array for a further result per planet, e.g. the phase curves of the
+        optimizer, with the same rows as the existing arrays in `spectra`. If no arrays exist, the
+        array is created for all planets in the catalog and the column `'spectrum'` of the catalog
+        is pointed to its rows. The array is memory-mapped as described in `spectra_create`.
+
+        Parameters
+        ----------
+        name : str
+            Name of the result.
+        n_col : int
+            Number of values per planet.
+        """
+
+        if self.spectra:
+            shape = (next(iter(self.spectra.values())).shape[0], n_col)
+        else:
+            shape = (self.catalog.shape[0], n_col)
+            self.catalog['spectrum'] = np.arange(0, shape[0], 1)
+
+        if self.options.other['spectra_path']:
+            os.makedirs(self.options.other['spectra_path'], exist_ok=True)
+            self.spectra[name] = np.lib.format.open_memmap(
+                os.path.join(self.options.other['spectra_path'], name + '.npy'),
+                mode='w+',
+                dtype=float,
+                shape=shape)
+        else:
+            self.spectra[name] = np.zeros(shape)
+
+    def catalog_split_spectra(self):
+        """
+        Moves spectral results and phase curves that are saved as objects in the catalog, as done
+        by earlier versions of LIFEsim, to the arrays in `spectra`. Missing phase curves are
+        filled with NaN.
+        """
+
+        names = [key for key in ['noise_astro', 'planet_flux_use', 'snr_phase']
+                 if (key in self.catalog.keys()) and (self.catalog[key].dtype == object)]
+        if not names:
+            return
+
+        if self.spectra:
+            n_rows = next(iter(self.spectra.values())).shape[0]
+        else:
+            n_rows = self.catalog.shape[0]
+            self.catalog['spectrum'] = np.arange(0, n_rows, 1)
+
+        for _, name in enumerate(names):
+            if self.catalog[name].notna().any():
+                array, _ = columnar.encode_column(self.catalog[name].to_numpy())
+                self.spectra[name] = np.full((n_rows, array.shape[1]), np.nan)
+                self.spectra[name][self.catalog['spectrum'].to_numpy()] = array
+        self.catalog = self.catalog.drop(columns=names)
+
+    def catalog_split_stars(self):
+        """
+        Moves the star columns (see `STAR_COLUMNS`) from the catalog to the star table `stars` and
+        replaces them by the row position of the host star in the column `'star'`. The properties
+        of every star are taken from its first planet in the catalog.
+        """
+
+        self.catalog_star_index()
+        star_first = self.star_index['order'][self.star_index['offsets'][:-1]]
+        star_inverse = np.empty_like(self.star_index['order'])
+        star_inverse[self.star_index['order']] = np.repeat(
+            np.arange(self.star_index['nstar'].shape[0]),
+            np.diff(self.star_index['offsets']))
+
+        columns = ['nstar'] + [key for key in STAR_COLUMNS if key in self.catalog.keys()]
+        self.stars = pd.DataFrame({key: self.catalog[key].to_numpy()[star_first]
+                                   for key in columns})
+        self.catalog = self.catalog.drop(columns=columns[1:])
+        self.catalog['star'] = star_inverse
+
+    def catalog_remove_stars(self):
+        """
+        Removes all stars without planets in the catalog from the star table and updates the
+        row positions of the host stars in the catalog accordingly.
+        """
+
+        keep = np.unique(self.catalog['star'].to_numpy())
+        self.stars = self.stars.iloc[keep]
+        self.stars.index = np.arange(0, self.stars.shape[0], 1)
+        self.catalog['star'] = np.searchsorted(keep, self.catalog['star'].to_numpy())
+
+    def catalog_star_index(self):
+        """
+        Builds the star index of the catalog, see `star_index`. The index is rebuilt automatically
+        whenever the catalog is created or planets are removed by the functions of this class. If
+        the rows of the catalog are changed by other means, this function needs to be called.
+        """
+
+        nstar = self.catalog.nstar.to_numpy()
+
+        # the stable sort keeps the planets of every star in the order of the catalog
+        order = np.argsort(nstar, kind='stable')
+        stars, offsets = np.unique(nstar[order], return_index=True)
+        self.star_index = {'nstar': stars,
+                           'order': order,
+                           'offsets': np.append(offsets, nstar.shape[0])}
+
+    def catalog_star_rows(self,
+                          nstar: Union[int, np.ndarray]):
+        """
+        Returns the row positions of all planets orbiting the specified star or stars without
+        scanning the catalog.
+
+        Parameters
+        ----------
+        nstar : Union[int, np.ndarray]
+            Star number of the host star. If an array of star numbers is given, the planets of all
+            stars are returned, grouped by star in the order of `nstar`.
+
+        Returns
+        -------
+        rows
+            Row positions of the planets in the catalog. The planets of a single star are given in
+            the order of the catalog.
+
+        Raises
+        ------
+        KeyError
+            If a star number is not found in the catalog.
+        """
+
+        # make sure that the index belongs to the current catalog
+        if (self.star_index is None) or (self.star_index['order'].shape[0]
+                                         != self.catalog.shape[0]):
+            self.catalog_star_index()
+
+        pos = np.searchsorted(self.star_index['nstar'], nstar)
+        found = self.star_index['nstar'][np.minimum(pos, self.star_index['nstar'].shape[0] - 1)]
+        if np.any(found != nstar):
+            raise KeyError('Star ' + str(np.asarray(nstar)[found != nstar].ravel()[0])
+                           + ' not found in the catalog')
+        start = self.star_index['offsets'][pos]
+        stop = self.star_index['offsets'][pos + 1]
+
+        if np.ndim(nstar) == 0:
+            return self.star_index['order'][start:stop]
+
+        # concatenate the slices of all stars
+        counts = stop - start
+        index = (np.repeat(start - np.cumsum(counts) + counts, counts)
+                 + np.arange(counts.sum()))
+        return self.star_index['order'][index]
+
+    def ppop_chunks(self,
+                    input_path: str,
+                    chunksize: int = 100000,
+                    stypes: Union[list, type(None)] = None,
+                    distance: Union[dict, type(None)] = None,
+                    universes: Union[list, range, np.ndarray, type(None)] = None,
+                    columns: Union[list, type(None)] = None):
+        """
+        Reads the P-Pop output file (in .txt or .fits format) in chunks of lines. The planets can
+        be selected while reading (see `ppop_selection`), such that the removed planets are never
+        held in memory. A .fits file is memory-mapped, such that only the requested columns and
+        planets are read from it.
+
+        Parameters
+        ----------
+        input_path : str
+            Path to the P-Pop output file in a .txt, .txt.gz or .fits format.
+        chunksize : int
+            Number of lines of the file that are read at once.
+        stypes : Union[list, type(None)]
+            Stellar types to keep, given as integers (e.g. ``[1, 2, 3, 4]`` to remove A-stars).
+        distance : Union[dict, type(None)]
+            Maximum distance in [pc] with the stellar type as key, e.g. ``{4: 10.}`` to remove
+            planets around M-stars at 10 pc or further away.
+        universes : Union[list, range, np.ndarray, type(None)]
+            Universe indices to keep, e.g. ``range(0, 100)`` for the first 100 universes.
+        columns : Union[list, type(None)]
+            Names of the catalog columns to read (see `PPOP_COLUMNS`). The columns in
+            `PPOP_REQUIRED`, which include all properties of the host stars, are always read. If
+            `None` is given, all columns are read.
+
+        Yields
+        ------
+        chunk : dict
+            Catalog columns of the selected planets of the chunk with the catalog name as key,
+            including the stellar type `'stype'` as integer and the position `'id'` of the
+            planets in the file.
+
+        Raises
+        ------
+        ValueError
+            If the format of the file is not supported.
+        """
+
+        # set keys for the stellar types to avoid type mismatched DataFrames
+        self.other['stype_key'] = dict(STYPE_KEY)
+
+        # the P-Pop names of the columns to read
+        keys = [key for key, value in PPOP_COLUMNS.items()
+                if (columns is None) or (value[0] in columns) or (value[0] in PPOP_REQUIRED)]
+
+        # check the format of the input file
+        if (input_path[-4:] == '.txt') or (input_path[-7:] == '.txt.gz'):
+            nlines = 0
+
+            # the table is streamed in chunks, only the needed columns are parsed and directly
+            # converted to their final type. The first line contains the column names of the old
+            # P-Pop and is skipped, the second line contains the column names of the new P-Pop.
+            # Compressed files (e.g. .txt.gz) are decompressed on the fly. The floats are parsed
+            # by the C parser of pandas, which can deviate from the correctly rounded value in the
+            # last digits (relative deviations below 1e-13)
+            reader = pd.read_csv(input_path,
+                                 sep='\t',
+                                 skiprows=1,
+                                 header=0,
+                                 usecols=keys + ['Stype'],
+                                 dtype={**{key: PPOP_COLUMNS[key][1] for key in keys},
+                                        'Stype': str},
+                                 float_precision='high',
+                                 chunksize=chunksize)
+
+            for chunk in reader:
+                # convert stellar type to int
+                stype_chunk = chunk['Stype'].to_numpy().astype(str)
+                stype_int = np.zeros_like(stype_chunk, dtype=int)
+                for _, k in enumerate(self.other['stype_key'].keys()):
+                    stype_int[stype_chunk == k] = self.other['stype_key'][k]
+
+                # only the selected planets of the chunk are kept
+                mask = ppop_selection(nuniverse=chunk['Nuniverse'].to_numpy(),
+                                      stype=stype_int,
+                                      distance_s=chunk['Ds'].to_numpy(),
+                                      stypes=stypes,
+                                      distance=distance,
+                                      universes=universes)
+                parsed = {PPOP_COLUMNS[key][0]: chunk[key].to_numpy()[mask] for key in keys}
+                parsed['stype'] = stype_int[mask]
+                parsed['id'] = np.arange(nlines, nlines + chunk.shape[0], 1)[mask]
+
+                nlines += chunk.shape[0]
+                sys.stdout.write('\rProcessed line %.0f' % nlines)
+                sys.stdout.flush()
+                yield parsed
+            print('')
+
+        # check the format of the input file
+        elif input_path[-5:] == '.fits':
+            table = FitsTable(path=input_path)
+
+            try:
+                for start in range(0, len(table), chunksize):
+                    lines = slice(start, min(start + chunksize, len(table)))
+                    stype_str = table.column('Stype', rows=lines)
+                    stype_int = np.zeros_like(stype_str, dtype=int)
+                    for _, k in enumerate(self.other['stype_key'].keys()):
+                        stype_int[stype_str == k] = self.other['stype_key'][k]
+
+                    # only the selected planets are read from the table. The columns are converted
+                    # to the native byte order (numpy usually works with little endian) and to the
+                    # type of the catalog while being read
+                    mask = ppop_selection(nuniverse=table.column('Nuniverse', rows=lines),
+                                          stype=stype_int,
+                                          distance_s=table.column('Ds', rows=lines),
+                                          stypes=stypes,
+                                          distance=distance,
+                                          universes=universes)
+                    rows = lines if mask.all() else start + np.where(mask)[0]
+
+                    parsed = {PPOP_COLUMNS[key][0]: table.column(name=key,
+                                                                 rows=rows,
+                                                                 dtype=PPOP_COLUMNS[key][1])
+                              for key in keys}
+                    parsed['stype'] = stype_int[mask]
+                    parsed['id'] = start + np.where(mask)[0]
+                    yield parsed
+            finally:
+                table.close()
+
+        else:
+            raise ValueError('Format of the P-Pop output file not supported')
 
     def catalog_from_ppop(self,
                           input_path: str,
-                          overwrite: bool = False):
+                          overwrite: bool = False,
+                          chunksize: int = 100000,
+                          stypes: Union[list, type(None)] = None,
+                          distance: Union[dict, type(None)] = None,
+                          universes: Union[list, range, np.ndarray, type(None)] = None,
+                          columns: Union[list, type(None)] = None):
         """
-        Read the contents of the P-Pop output file (in .txt or .fits format) to a catalog.
+        Read the contents of the P-Pop output file (in .txt or .fits format) to a catalog. The
+        planets can be selected while reading (see `ppop_selection`), such that the removed
+        planets are never added to the catalog. The column `'id'` gives the position of the
+        planets in the P-Pop output file. A .fits file is memory-mapped, such that only the
+        requested columns and planets are read from it.
 
         Parameters
         ----------
         input_path : str
-            Path to the P-Pop output file in a .txt or .fits format.
+            Path to the P-Pop output file in a .txt, .txt.gz or .fits format.
         overwrite : bool
             If set to true, existing catalogs can overwritten.
+        chunksize : int
+            Number of lines of the file that are read at once. Only the read chunk is held in
+            memory in addition to the typed columns of the catalog.
+        stypes : Union[list, type(None)]
+            Stellar types to keep, given as integers (e.g. ``[1, 2, 3, 4]`` to remove A-stars).
+        distance : Union[dict, type(None)]
+            Maximum distance in [pc] with the stellar type as key, e.g. ``{4: 10.}`` to remove
+            planets around M-stars at 10 pc or further away.
+        universes : Union[list, range, np.ndarray, type(None)]
+            Universe indices to keep, e.g. ``range(0, 100)`` for the first 100 universes.
+        columns : Union[list, type(None)]
+            Names of the catalog columns to read (see `PPOP_COLUMNS`), e.g. ``['z', 'temp_p',
+            'angsep']``. The columns in `PPOP_REQUIRED`, which include all properties of the host
+            stars, are always read. If `None` is given, all columns are read.
 
         Raises
         ------
@@ -67,239 +570,111 @@ class Data(object):
             raise ValueError('A catalog has already been imported. Delete the old catalog or set '
                              'overwrite=True')
 
-        # set keys for the stellar types to avoid type mismatched DataFrames
-        self.other['stype_key'] = {'A': 0,
-                                   'F': 1,
-                                   'G': 2,
-                                   'K': 3,
-                                   'M': 4}
-
-        # initialize catalog
-        self.catalog = pd.DataFrame(columns=['radius_p',
-                                             'p_orb',
-                                             'mass_p',
-                                             'ecc_p',
-                                             'inc_p',
-                                             'large_omega_p',
-                                             'small_omega_p',
-                                             'theta_p',
-                                             'albedo_bond',
-                                             'albedo_geom_vis',
-                                             'albedo_geom_mir',
-                                             'z',
-                                             'semimajor_p',
-                                             'sep_p',
-                                             'angsep',
-                                             'maxangsep',
-                                             'flux_p',
-                                             'fp',
-                                             'temp_p',
-                                             'radius_s',
-                                             'mass_s',
-                                             'temp_s',
-                                             'distance_s',
-                                             'ra',
-                                             'dec',
-                                             'nuniverse',
-                                             'nstar',
-                                             'stype',
-                                             'id'])
+        parsed = {}
+        for chunk in self.ppop_chunks(input_path=input_path,
+                                      chunksize=chunksize,
+                                      stypes=stypes,
+                                      distance=distance,
+                                      universes=universes,
+                                      columns=columns):
+            for key, value in chunk.items():
+                parsed.setdefault(key, []).append(value)
 
-        # check the format of the input file
-        if input_path[-4:] == '.txt':
-            table = open(input_path, 'r')
-            table_lines = table.readlines()
-
-            nuniverse = []
-            radius_p = []  # Rearth
-            p_orb = []  # d
-            mass_p = []  # Mearth
-            ecc_p = []
-            inc_p = []  # rad
-            large_omega_p = []  # rad
-            small_omega_p = []  # rad
-            theta_p = []  # rad
-            albedo_bond = []
-            albedo_geom_vis = []
-            albedo_geom_mir = []
-            z = []
-            semimajor_p = []  # au
-            sep_p = []  # au
-            angsep = []  # arcsec
-            maxangsep = []  # arcsec
-            flux_p = []  # Searth
-            fp = []
-            temp_p = []  # K
-            nstar = []
-            radius_s = []  # Rsun
-            mass_s = []  # Msun
-            temp_s = []  # K
-            distance_s = []  # pc
-            stype = []
-            ra = []  # deg
-            dec = []  # deg
-
-            nlines = len(table_lines)
-
-            # The second line (i = 1) contains the column names of the new
-            # Ppop while the first line (i = 0) contains the column names
-            # of the old Ppop.
-
-            tempLine = table_lines[1].split('\t')
-            col_nuniverse = np.where(np.array(tempLine) == 'Nuniverse')[0][0]
-            col_radius_p = np.where(np.array(tempLine) == 'Rp')[0][0]
-            col_p_orb = np.where(np.array(tempLine) == 'Porb')[0][0]
-            col_mass_p = np.where(np.array(tempLine) == 'Mp')[0][0]
-            col_ecc_p = np.where(np.array(tempLine) == 'ep')[0][0]
-            col_inc_p = np.where(np.array(tempLine) == 'ip')[0][0]
-            col_large_omega_p = np.where(np.array(tempLine) == 'Omegap')[0][0]
-            col_small_omega_p = np.where(np.array(tempLine) == 'omegap')[0][0]
-            col_theta_p = np.where(np.array(tempLine) == 'thetap')[0][0]
-            col_albedo_bond = np.where(np.array(tempLine) == 'Abond')[0][0]
-            col_albedo_geom_vis = np.where(
-                np.array(tempLine) == 'AgeomVIS')[0][0]
-            col_albedo_geom_mir = np.where(
-                np.array(tempLine) == 'AgeomMIR')[0][0]
-            col_z = np.where(np.array(tempLine) == 'z')[0][0]
-            col_semimajor_p = np.where(np.array(tempLine) == 'ap')[0][0]
-            col_sep_p = np.where(np.array(tempLine) == 'rp')[0][0]
-            col_angsep = np.where(np.array(tempLine) == 'AngSep')[0][0]
-            col_maxangsep = np.where(np.array(tempLine) == 'maxAngSep')[0][0]
-            col_flux_p = np.where(np.array(tempLine) == 'Fp')[0][0]
-            col_fp = np.where(np.array(tempLine) == 'fp')[0][0]
-            col_temp_p = np.where(np.array(tempLine) == 'Tp')[0][0]
-            col_nstar = np.where(np.array(tempLine) == 'Nstar')[0][0]
-            col_radius_s = np.where(np.array(tempLine) == 'Rs')[0][0]
-            col_mass_s = np.where(np.array(tempLine) == 'Ms')[0][0]
-            col_temp_s = np.where(np.array(tempLine) == 'Ts')[0][0]
-            col_distance_s = np.where(np.array(tempLine) == 'Ds')[0][0]
-            col_stype = np.where(np.array(tempLine) == 'Stype')[0][0]
-            col_ra = np.where(np.array(tempLine) == 'RA')[0][0]
-            col_dec = np.where(np.array(tempLine) == 'Dec')[0][0]
-
-            for i, line in enumerate(table_lines[2:]):
-
-                if (i % 10000) == 0:
-                    sys.stdout.write(
-                        '\rProcessed line %.0f of %.0f' % (i, nlines))
-                    sys.stdout.flush()
-
-                tempLine = line.split('\t')
-                nuniverse += [int(tempLine[col_nuniverse])]
-                radius_p += [float(tempLine[col_radius_p])]  # Rearth
-                p_orb += [float(tempLine[col_p_orb])]  # d
-                mass_p += [float(tempLine[col_mass_p])]  # Mearth
-                ecc_p += [float(tempLine[col_ecc_p])]
-                inc_p += [float(tempLine[col_inc_p])]  # rad
-                large_omega_p += [float(tempLine[col_large_omega_p])]  # rad
-                small_omega_p += [float(tempLine[col_small_omega_p])]  # rad
-                theta_p += [float(tempLine[col_theta_p])]  # rad
-                albedo_bond += [float(tempLine[col_albedo_bond])]
-                albedo_geom_vis += [float(tempLine[col_albedo_geom_vis])]
-                albedo_geom_mir += [float(tempLine[col_albedo_geom_mir])]
-                z += [float(tempLine[col_z])]
-                semimajor_p += [float(tempLine[col_semimajor_p])]  # au
-                sep_p += [float(tempLine[col_sep_p])]  # au
-                angsep += [float(tempLine[col_angsep])]  # arcsec
-                maxangsep += [float(tempLine[col_maxangsep])]  # arcsec
-                flux_p += [float(tempLine[col_flux_p])]  # Searth
-                fp += [float(tempLine[col_fp])]
-                temp_p += [float(tempLine[col_temp_p])]  # K
-                nstar += [int(tempLine[col_nstar])]
-                radius_s += [float(tempLine[col_radius_s])]  # Rsun
-                mass_s += [float(tempLine[col_mass_s])]  # Msun
-                temp_s += [float(tempLine[col_temp_s])]  # K
-                distance_s += [float(tempLine[col_distance_s])]  # pc
-                stype += [str(tempLine[col_stype])]
-                ra += [float(tempLine[col_ra])]  # deg
-                dec += [float(tempLine[col_dec])]  # deg
-
-            sys.stdout.write('\rProcessed line %.0f of %.0f' %
-                             (nlines, nlines))
-            sys.stdout.flush()
-            print('')
+        # save the data to the pandas DataFrame
+        self.catalog = pd.DataFrame()
+        for key in list(parsed.keys()):
+            self.catalog[key] = np.concatenate(parsed.pop(key))
 
-            # TODO: Move the stype to char
-            # convert stellar type to int
-            stype = np.array(stype)
-            stype_int = np.zeros_like(stype, dtype=int)
-            for _, k in enumerate(self.other['stype_key'].keys()):
-                stype_int[stype == k] = self.other['stype_key'][k]
-
-            # save the data to the pandas DataFrame
-            self.catalog['nuniverse'] = np.array(nuniverse).astype(int)
-            self.catalog['radius_p'] = np.array(radius_p).astype(float)
-            self.catalog['p_orb'] = np.array(p_orb)
-            self.catalog['mass_p'] = np.array(mass_p)
-            self.catalog['ecc_p'] = np.array(ecc_p)
-            self.catalog['inc_p'] = np.array(inc_p)
-            self.catalog['large_omega_p'] = np.array(large_omega_p)
-            self.catalog['small_omega_p'] = np.array(small_omega_p)
-            self.catalog['theta_p'] = np.array(theta_p)
-            self.catalog['albedo_bond'] = np.array(albedo_bond)
-            self.catalog['albedo_geom_vis'] = np.array(albedo_geom_vis)
-            self.catalog['albedo_geom_mir'] = np.array(albedo_geom_mir)
-            self.catalog['z'] = np.array(z)
-            self.catalog['semimajor_p'] = np.array(semimajor_p)
-            self.catalog['sep_p'] = np.array(sep_p)
-            self.catalog['angsep'] = np.array(angsep)
-            self.catalog['maxangsep'] = np.array(maxangsep)
-            self.catalog['flux_p'] = np.array(flux_p)
-            self.catalog['fp'] = np.array(fp)
-            self.catalog['temp_p'] = np.array(temp_p)
-            self.catalog['nstar'] = np.array(nstar)
-            self.catalog['radius_s'] = np.array(radius_s)
-            self.catalog['mass_s'] = np.array(mass_s)
-            self.catalog['temp_s'] = np.array(temp_s)
-            self.catalog['distance_s'] = np.array(distance_s)
-            self.catalog['stype'] = stype_int
-            self.catalog['ra'] = np.array(ra)
-            self.catalog['dec'] = np.array(dec)
-            self.catalog['id'] = np.arange(0, len(dec), 1)
+        self.catalog_prepare()
 
-        # check the format of the input file
-        elif input_path[-5:] == '.fits':
-            hdu = fits.open(input_path)
-            stype_int = np.zeros_like(hdu[1].data.Nstar.astype(int), dtype=int)
-            for _, k in enumerate(self.other['stype_key'].keys()):
-                stype_int[hdu[1].data.Stype.astype(str)
-                          == k] = self.other['stype_key'][k]
-
-            # save the data to the pandas DataFrame, make sure it is saved in the correct type
-            # some errors were produced here by not respecting the endianess of the data (numpy
-            # usually works with little endian)
-            self.catalog = pd.DataFrame({'nuniverse': hdu[1].data.Nuniverse.astype(int),
-                                         'nstar': hdu[1].data.Nstar.astype(int),
-                                         'stype': stype_int,
-                                         'id': np.arange(0, hdu[1].data.Dec.shape[0], 1).astype(int),
-                                         'radius_p': hdu[1].data.Rp.astype(float),
-                                         'p_orb': hdu[1].data.Porb.astype(float),
-                                         'mass_p': hdu[1].data.Mp.astype(float),
-                                         'ecc_p': hdu[1].data.ep.astype(float),
-                                         'inc_p': hdu[1].data.ip.astype(float),
-                                         'large_omega_p': hdu[1].data.Omegap.astype(float),
-                                         'small_omega_p': hdu[1].data.omegap.astype(float),
-                                         'theta_p': hdu[1].data.thetap.astype(float),
-                                         'albedo_bond': hdu[1].data.Abond.astype(float),
-                                         'albedo_geom_vis': hdu[1].data.AgeomVIS.astype(float),
-                                         'albedo_geom_mir': hdu[1].data.AgeomMIR.astype(float),
-                                         'z': hdu[1].data.z.astype(float),
-                                         'semimajor_p': hdu[1].data.ap.astype(float),
-                                         'sep_p': hdu[1].data.rp.astype(float),
-                                         'angsep': hdu[1].data.AngSep.astype(float),
-                                         'maxangsep': hdu[1].data.maxAngSep.astype(float),
-                                         'flux_p': hdu[1].data.Fp.astype(float),
-                                         'fp': hdu[1].data.fp.astype(float),
-                                         'temp_p': hdu[1].data.Tp.astype(float),
-                                         'radius_s': hdu[1].data.Rs.astype(float),
-                                         'mass_s': hdu[1].data.Ms.astype(float),
-                                         'temp_s': hdu[1].data.Ts.astype(float),
-                                         'distance_s': hdu[1].data.Ds.astype(float),
-                                         'ra': hdu[1].data.RA.astype(float),
-                                         'dec': hdu[1].data.Dec.astype(float),
-                                         'lat': hdu[1].data.lat.astype(float),
-                                         'lon': hdu[1].data.lon.astype(float)})
-            hdu.close()
+    def catalog_blocks_from_ppop(self,
+                                 input_path: str,
+                                 universes_per_block: int = 10,
+                                 chunksize: int = 100000,
+                                 stypes: Union[list, type(None)] = None,
+                                 distance: Union[dict, type(None)] = None,
+                                 universes: Union[list, range, np.ndarray, type(None)] = None,
+                                 columns: Union[list, type(None)] = None):
+        """
+        Reads the P-Pop output file (in .txt or .fits format) block by block, where every block
+        contains the planets of a number of consecutive universes. At every step of the iteration,
+        the catalog of the data class is replaced by the catalog of the next block, such that
+        only a single block is held in memory. The P-Pop output file needs to be sorted by
+        universe, as it is written by P-Pop.
+
+        Parameters
+        ----------
+        input_path : str
+            Path to the P-Pop output file in a .txt, .txt.gz or .fits format.
+        universes_per_block : int
+            Number of universes per block. The universes ``[i * universes_per_block,
+            (i + 1) * universes_per_block)`` form the i-th block.
+        chunksize : int
+            Number of lines of the file that are read at once.
+        stypes : Union[list, type(None)]
+            Stellar types to keep, given as integers (e.g. ``[1, 2, 3, 4]`` to remove A-stars).
+        distance : Union[dict, type(None)]
+            Maximum distance in [pc] with the stellar type as key, e.g. ``{4: 10.}`` to remove
+            planets around M-stars at 10 pc or further away.
+        universes : Union[list, range, np.ndarray, type(None)]
+            Universe indices to keep, e.g. ``range(0, 100)`` for the first 100 universes.
+        columns : Union[list, type(None)]
+            Names of the catalog columns to read (see `PPOP_COLUMNS`). The columns in
+            `PPOP_REQUIRED`, which include all properties of the host stars, are always read. If
+            `None` is given, all columns are read.
+
+        Yields
+        ------
+        block : int
+            Index of the block that is loaded to the catalog. Blocks without selected planets are
+            skipped.
+
+        Raises
+        ------
+        ValueError
+            If the P-Pop output file is not sorted by universe.
+        """
+
+        parsed = {}
+        current = None
+
+        # the end of the file is marked by None, which completes the last block
+        for chunk in itertools.chain(self.ppop_chunks(input_path=input_path,
+                                                      chunksize=chunksize,
+                                                      stypes=stypes,
+                                                      distance=distance,
+                                                      universes=universes,
+                                                      columns=columns),
+                                     [None]):
+            if chunk is None:
+                blocks = [None]
+            else:
+                block = chunk['nuniverse'] // universes_per_block
+                if np.any(np.diff(block) < 0) or ((current is not None) and block.shape[0]
+                                                   and (block[0] < current)):
+                    raise ValueError('The P-Pop output file is not sorted by universe')
+                blocks = np.unique(block)
+
+            # split the chunk at the borders of the blocks, every completed block is loaded to the
+            # catalog
+            for _, b in enumerate(blocks):
+                if (current is not None) and (b != current):
+                    self.catalog = pd.DataFrame()
+                    for key in list(parsed.keys()):
+                        self.catalog[key] = np.concatenate(parsed.pop(key))
+                    self.catalog_prepare()
+                    yield int(current)
+                current = b
+                if b is not None:
+                    for key, value in chunk.items():
+                        parsed.setdefault(key, []).append(value[block == b])
+
+    def catalog_prepare(self):
+        """
+        Completes a catalog read from the P-Pop output by moving the stellar properties to the
+        star table and adding the ecliptic coordinates, the habitable zone and the habitability of
+        the planets.
+        """
 
         # create array saving the stellar types in character format
         self.other['stype'] = np.zeros_like(self.catalog.nstar, dtype=str)
@@ -307,48 +682,34 @@ class Data(object):
             self.other['stype'][self.catalog.stype ==
                                 self.other['stype_key'][k]] = k
 
-        # create mask returning only unique stars
-        _, temp = np.unique(self.catalog.nstar, return_index=True)
-        star_mask = np.zeros_like(self.catalog.nstar, dtype=bool)
-        star_mask[temp] = True
+        # results of an earlier catalog do not belong to the new planets
+        self.spectra = {}
+
+        # the stellar properties are stored and calculated once for every star
+        self.catalog_split_stars()
 
         # TODO: why is this commented out? AFAIK P-Pop uses equitorial coordinates
         # transform from equitorial to ecliptic coordinates
-        coord = SkyCoord(self.catalog.ra, self.catalog.dec,
-                         frame='icrs', unit='deg')
-        coord_ec = coord.transform_to(BarycentricMeanEcliptic())
-        self.catalog['lon'] = np.array(coord_ec.lon.radian)
-        self.catalog['lat'] = np.array(coord_ec.lat.radian)
+        self.stars['lon'], self.stars['lat'] = equatorial_to_ecliptic(
+            ra=self.stars.ra.to_numpy(),
+            dec=self.stars.dec.to_numpy())
 
         # add the inner/ outer edges and centers of the habitable zone
-        s_in = np.zeros_like(self.catalog.nstar, dtype=float)
-        s_out = np.zeros_like(self.catalog.nstar, dtype=float)
-        l_sun = np.zeros_like(self.catalog.nstar, dtype=float)
-
-        hz_in = np.zeros_like(self.catalog.nstar, dtype=float)
-        hz_out = np.zeros_like(self.catalog.nstar, dtype=float)
-        hz_center = np.zeros_like(self.catalog.nstar, dtype=float)
-
-        for _, n in enumerate(np.where(star_mask)[0]):
-            s_in[self.catalog.nstar == self.catalog.nstar[n]], \
-                s_out[self.catalog.nstar == self.catalog.nstar[n]], \
-                l_sun[self.catalog.nstar == self.catalog.nstar[n]], \
-                hz_in[self.catalog.nstar == self.catalog.nstar[n]], \
-                hz_out[self.catalog.nstar == self.catalog.nstar[n]], \
-                hz_center[self.catalog.nstar == self.catalog.nstar[n]] \
-                = single_habitable_zone(model=self.options.models['habitable'],
-                                        temp_s=self.catalog.temp_s[n],
-                                        radius_s=self.catalog.radius_s[n])
-
-        self.catalog['s_in'] = s_in
-        self.catalog['s_out'] = s_out
-        self.catalog['l_sun'] = l_sun
-        self.catalog['hz_in'] = hz_in
-        self.catalog['hz_out'] = hz_out
-        self.catalog['hz_center'] = hz_center
+        s_in, s_out, l_sun, \
+            hz_in, hz_out, \
+            hz_center = single_habitable_zone(model=self.options.models['habitable'],
+                                              temp_s=self.stars.temp_s.to_numpy(),
+                                              radius_s=self.stars.radius_s.to_numpy())
+
+        self.stars['s_in'] = s_in
+        self.stars['s_out'] = s_out
+        self.stars['l_sun'] = l_sun
+        self.stars['hz_in'] = hz_in
+        self.stars['hz_out'] = hz_out
+        self.stars['hz_center'] = hz_center
         self.catalog['habitable'] = np.logical_and.reduce((
-            (self.catalog['semimajor_p'] > self.catalog['hz_in']).to_numpy(),
-            (self.catalog['semimajor_p'] < self.catalog['hz_out']).to_numpy(),
+            self.catalog['semimajor_p'].to_numpy() > self.star_column('hz_in'),
+            self.catalog['semimajor_p'].to_numpy() < self.star_column('hz_out'),
             (self.catalog['radius_p'].ge(0.5)).to_numpy(),
             (self.catalog['radius_p'].le(1.5)).to_numpy()))
 
@@ -384,20 +745,22 @@ class Data(object):
 
         # create masks selecting closer or more far away planets
         if mode == 'larger':
-            mask = np.logical_and(self.catalog.stype == stype,
-                                  self.catalog.distance_s >= dist)
+            mask = np.logical_and(self.star_column('stype') == stype,
+                                  self.star_column('distance_s') >= dist)
         elif mode == 'smaller':
-            mask = np.logical_and(self.catalog.stype == stype,
-                                  self.catalog.distance_s <= dist)
+            mask = np.logical_and(self.star_column('stype') == stype,
+                                  self.star_column('distance_s') <= dist)
         else:
             warnings.warn('Mode ' + mode +
                           ' not available. Using mode larger.')
-            mask = np.logical_and(self.catalog.stype == stype,
-                                  self.catalog.distance_s >= dist)
+            mask = np.logical_and(self.star_column('stype') == stype,
+                                  self.star_column('distance_s') >= dist)
 
         # drop the planets to remove from the data
         self.catalog = self.catalog.drop(np.where(mask)[0])
         self.catalog.index = np.arange(0, self.catalog.shape[0], 1)
+        self.catalog_remove_stars()
+        self.catalog_star_index()
 
     def catalog_safe_add(self,
                          name: str,
@@ -430,44 +793,250 @@ class Data(object):
         self.catalog[name] = data
 
     def export_catalog(self,
-                       output_path: str):
+                       output_path: str,
+                       columns: Union[list, type(None)] = None,
+                       append: bool = False,
+                       chunksize: int = 1000000,
+                       append_rows: bool = False):
         """
-        Save the catalog to an file in the hdf-format.
+        Save the catalog, the star table and the spectral results. If the path ends with
+        ``.hdf5``, ``.hdf`` or ``.h5``, everything is saved to a single file in the hdf-format.
+        Otherwise, a directory in a columnar format is created (see `lifesim.util.columnar`), in
+        which every column is saved in compressed chunks of rows together with the options and
+        the LIFEsim version in the metadata. Single columns or further planets can later be added
+        to such a directory without rewriting the existing ones.
 
         Parameters
         ----------
         output_path : str
-            path to the new file.
+            path to the new file or directory.
+        columns : Union[list, type(None)]
+            Names of the catalog columns or spectral results to save, only available for the
+            columnar format. If `None` is given, all of them are saved or, if `append` is True, all
+            of them that are not yet present in the directory.
+        append : bool
+            If set to True, the columns are added to the existing directory at `output_path`,
+            columns already present in the directory are replaced. The catalog must contain the
+            same planets as the one saved to the directory.
+        chunksize : int
+            Number of rows saved per chunk in the columnar format.
+        append_rows : bool
+            If set to True, the planets of the catalog are added to the existing directory at
+            `output_path` as a new chunk, e.g. for the blocks of universes of
+            `catalog_blocks_from_ppop`. The catalog must contain the same columns and spectral
+            results as the one saved to the directory. Stars that are not yet present in the star
+            table of the directory are added to it.
 
         Raises
         ------
         ValueError
             If not catalog exists in this data class.
+            If columns or appending are requested for the hdf-format.
+            If the catalog does not match the one in the directory to append to.
         """
         if self.catalog is None:
             raise ValueError('No catalog found')
-        self.catalog.to_hdf(path_or_buf=output_path, key='catalog', mode='w')
+
+        if os.path.splitext(output_path)[1] in ('.hdf5', '.hdf', '.h5'):
+            if (columns is not None) or append or append_rows:
+                raise ValueError('Columns can only be selected or appended in the columnar '
+                                 'format')
+            self.catalog.to_hdf(path_or_buf=output_path, key='catalog', mode='w')
+            self.stars.to_hdf(path_or_buf=output_path, key='stars', mode='a')
+            for name, spectra in self.spectra.items():
+                pd.DataFrame(spectra).to_hdf(path_or_buf=output_path, key='spectra/' + name,
+                                             mode='a')
+            return
+
+        # the row positions of the spectra and of the host stars are not saved. The spectra are
+        # saved in the order of the catalog and the host stars are found by their star number
+        names = [key for key in self.catalog.keys() if key not in ('spectrum', 'star')]
+
+        if append_rows:
+            if append or (columns is not None):
+                raise ValueError('Columns can not be selected when appending rows')
+            metadata = columnar.read_metadata(output_path)
+
+            # the star table is small and is rewritten with the new stars
+            stars = pd.concat((pd.DataFrame(columnar.read_table(path=output_path,
+                                                                metadata=metadata,
+                                                                table='stars')),
+                               self.stars))
+            stars = stars.drop_duplicates(subset='nstar').sort_values('nstar')
+            del metadata['tables']['stars']
+            shutil.rmtree(os.path.join(output_path, 'stars'))
+            columnar.write_table(path=output_path,
+                                 metadata=metadata,
+                                 table='stars',
+                                 columns={key: stars[key].to_numpy() for key in stars.keys()},
+                                 chunksize=chunksize)
+
+            columnar.append_rows(path=output_path,
+                                 metadata=metadata,
+                                 table='catalog',
+                                 columns={key: self.catalog[key].to_numpy() for key in names})
+            columnar.append_rows(path=output_path,
+                                 metadata=metadata,
+                                 table='spectra',
+                                 columns={key: self.spectrum(key) for key in self.spectra.keys()})
+            columnar.write_metadata(path=output_path,
+                                    metadata=metadata)
+            return
+
+        if append:
+            metadata = columnar.read_metadata(output_path)
+            if (metadata['tables']['catalog']['rows'] != self.catalog.shape[0]) or np.any(
+                    columnar.read_table(path=output_path,
+                                        metadata=metadata,
+                                        table='catalog',
+                                        columns=['nstar'])['nstar']
+                    != self.catalog.nstar.to_numpy()):
+                raise ValueError('The catalog does not match the catalog in ' + output_path)
+            if columns is None:
+                columns = ([key for key in names
+                            if key not in metadata['tables']['catalog']['columns']]
+                           + [key for key in self.spectra.keys()
+                              if key not in metadata['tables'].get('spectra',
+                                                                   {'columns': {}})['columns']])
+        else:
+            # remove the tables of an earlier export to the same directory
+            if os.path.isfile(os.path.join(output_path, 'metadata.json')):
+                for _, table in enumerate(columnar.read_metadata(output_path)['tables']):
+                    shutil.rmtree(os.path.join(output_path, table), ignore_errors=True)
+            os.makedirs(output_path, exist_ok=True)
+            metadata = {'format': columnar.FORMAT_VERSION,
+                        'tables': {}}
+            if columns is None:
+                columns = names + list(self.spectra.keys())
+
+            # the star table and the keys of the catalog are always saved
+            columns = [key for key in names + list(self.spectra.keys())
+                       if (key in columns) or (key == 'nstar')]
+            columnar.write_table(path=output_path,
+                                 metadata=metadata,
+                                 table='stars',
+                                 columns={key: self.stars[key].to_numpy()
+                                          for key in self.stars.keys()},
+                                 chunksize=chunksize)
+
+        try:
+            version = importlib.metadata.version('LIFEsim')
+        except importlib.metadata.PackageNotFoundError:
+            version = None
+        metadata['lifesim_version'] = version
+        metadata['options'] = {'array': self.options.array,
+                               'other': self.options.other,
+                               'models': self.options.models,
+                               'optimization': self.options.optimization}
+
+        columnar.write_table(path=output_path,
+                             metadata=metadata,
+                             table='catalog',
+                             columns={key: self.catalog[key].to_numpy()
+                                      for key in columns if key in names},
+                             chunksize=chunksize)
+        columnar.write_table(path=output_path,
+                             metadata=metadata,
+                             table='spectra',
+                             columns={key: self.spectrum(key)
+                                      for key in columns if key in self.spectra.keys()},
+                             chunksize=chunksize)
+        columnar.write_metadata(path=output_path,
+                                metadata=metadata)
 
     def import_catalog(self,
                        input_path: str,
-                       overwrite: bool = False):
+                       overwrite: bool = False,
+                       columns: Union[list, type(None)] = None,
+                       rows: Union[slice, np.ndarray, type(None)] = None):
         """
-        Import catalog from external file of hdf-format.
+        Import catalog from an external file of hdf-format or a directory in the columnar format
+        (see `export_catalog`). For files written by earlier versions without a star table, the
+        star table is created from the catalog. Spectral results saved as objects in the catalog
+        by earlier versions are moved to `spectra`.
 
         Parameters
         ----------
         input_path : str
-            path to the P-Pop output file in a .txt or .fits format.
+            path to the file or directory created by `export_catalog`.
         overwrite : bool
             if set to true, existing catalogs can overwritten.
+        columns : Union[list, type(None)]
+            Names of the catalog columns and spectral results to import, only available for the
+            columnar format. The column `'nstar'` and the star table are always imported. If
+            `None` is given, all columns are imported.
+        rows : Union[slice, np.ndarray, type(None)]
+            Row positions of the planets to import, only available for the columnar format. If
+            `None` is given, all planets are imported.
 
         Raises
         ------
         ValueError
             If the data class already has an initialized catalog and overwrite is set to False.
+            If columns or rows are requested for the hdf-format.
         """
         if (self.catalog is not None) and (not overwrite):
             raise ValueError('Can not overwrite existing catalog')
 
+        if os.path.isdir(input_path):
+            metadata = columnar.read_metadata(input_path)
+            self.other['catalog_metadata'] = metadata
+
+            if rows is not None:
+                rows = np.unique(np.arange(0, metadata['tables']['catalog']['rows'], 1)[rows])
+            names = [key for key in (list(metadata['tables']['catalog']['columns'].keys())
+                                     + list(metadata['tables'].get('spectra',
+                                                                   {'columns': {}})['columns']))
+                     if key != 'star']
+            if columns is None:
+                columns = names
+            columns = [key for key in names
+                       if (key in columns) or (key == 'nstar')]
+
+            self.catalog = pd.DataFrame(columnar.read_table(
+                path=input_path,
+                metadata=metadata,
+                table='catalog',
+                columns=[key for key in columns
+                         if key in metadata['tables']['catalog']['columns']],
+                rows=rows))
+            self.stars = pd.DataFrame(columnar.read_table(path=input_path,
+                                                          metadata=metadata,
+                                                          table='stars'))
+            self.spectra = {}
+            if 'spectra' in metadata['tables']:
+                self.spectra = columnar.read_table(
+                    path=input_path,
+                    metadata=metadata,
+                    table='spectra',
+                    columns=[key for key in columns
+                             if key in metadata['tables']['spectra']['columns']],
+                    rows=rows)
+            if self.spectra:
+                self.catalog['spectrum'] = np.arange(0, self.catalog.shape[0], 1)
+            self.catalog_split_spectra()
+            self.catalog['star'] = np.searchsorted(self.stars.nstar.to_numpy(),
+                                                   self.catalog.nstar.to_numpy())
+            if rows is not None:
+                self.catalog_remove_stars()
+            self.catalog_star_index()
+            return
+
+        if (columns is not None) or (rows is not None):
+            raise ValueError('Columns and rows can only be selected in the columnar format')
+
         self.catalog = pd.read_hdf(path_or_buf=input_path,
                                    key='catalog')
+        try:
+            self.stars = pd.read_hdf(path_or_buf=input_path,
+                                     key='stars')
+        except KeyError:
+            self.catalog_split_stars()
+
+        self.spectra = {}
+        with pd.HDFStore(input_path, mode='r') as store:
+            for _, key in enumerate(store.keys()):
+                if key.startswith('/spectra/'):
+                    self.spectra[key[len('/spectra/'):]] = store[key].to_numpy()
+        self.catalog_split_spectra()
+        self.catalog_star_index()
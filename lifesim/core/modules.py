@@ -82,19 +82,32 @@ class PhotonNoiseModule(Module):
     """
     Module for simulating astrophysical sources and their photon shot noise contribution to the
     interferometric measurement.
+
+    Attributes
+    ----------
+    zodi_scaling : bool
+        If True, the photon noise of the source is linear in the zodi level `z` of the observed
+        system. The `noise` function of such a module needs to accept the keyword `unit_zodi`,
+        with which the noise is calculated for a zodi level of one, independent of the zodi level
+        in the catalog. The noise can then be scaled to the zodi level of every planet.
     """
+    zodi_scaling = False
+
     @abc.abstractmethod
     def noise(self,
-              index: Union[int, type(None)]):
+              index: Union[int, np.ndarray, type(None)]):
         """
         Calculates the photon shot noise contribution.
 
         Parameters
         ----------
-        index : Union[int, type(None)]
+        index : Union[int, np.ndarray, type(None)]
             If an integer is given, the photon noise of the planet corresponding to the respective
-            interger row position in the catalog is given. If `None` is given, the photon noise is
-            calculated for the parameters found in `bus.data.single`.
+            interger row position in the catalog is given. If an array of integers is given, the
+            photon noise of all corresponding planets is given with the planets along the first
+            axis. In this case, the baseline in `bus.data.inst['bl']` holds one baseline per
+            given row. If `None` is given, the photon noise is calculated for the parameters found
+            in `bus.data.single`.
         """
         pass
 
@@ -119,19 +132,34 @@ class TransmissionModule(Module):
         """
         pass
 
+    @abc.abstractmethod
+    def transmission_profile(self,
+                             t_map: np.ndarray):
+        """
+        Integrates a transmission map azimuthally into a radial transmission profile.
+
+        Parameters
+        ----------
+        t_map : np.ndarray
+            Transmission map as returned by `transmission_map`.
+        """
+        pass
+
     @abc.abstractmethod
     def transmission_efficiency(self,
-                                index: Union[int, type(None)]):
+                                index: Union[int, np.ndarray, type(None)]):
         """
         Calculates the transmission efficiency on a single specified angular distance from the
         central star.
 
         Parameters
         ----------
-        index : Union[int, type(None)]
+        index : Union[int, np.ndarray, type(None)]
             If an integer is given, the transmission efficiency of the planet corresponding to the
-            respective interger row position in the catalog is given. If `None` is given, the
-            transmission efficiency is calculated for the parameters found in `bus.data.single`.
+            respective interger row position in the catalog is given. If an array of integers is
+            given, the transmission efficiencies of all corresponding planets are given with the
+            planets along the first axis. If `None` is given, the transmission efficiency is
+            calculated for the parameters found in `bus.data.single`.
         """
         pass
 
@@ -1,4 +1,7 @@
 from warnings import warn
+from typing import Union
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
 
 import numpy as np
 from tqdm import tqdm
@@ -56,6 +59,17 @@ class Instrument(InstrumentModule):
     data.inst['radius_map'] : np.ndarray
         A map used for speeding up calculations. Contains the distance of a pixel
         from the center of the detector in [pix].
+    data.inst['ring_pixels'] : np.ndarray
+        Flat indices of the pixels within the aperture, sorted by the ring they belong to.
+    data.inst['ring_starts'] : np.ndarray
+        Position of the first pixel of every ring in `data.inst['ring_pixels']`.
+    data.inst['ring_radius'] : np.ndarray
+        Mean distance of the pixels in every ring from the center of the detector in [pix], in
+        the shape (1, rings).
+    data.inst['noise_cache'] : dict
+        Baseline and background noise of the simulated stars with the star number as key. Only
+        present while `get_snr_stream` is running, in which case the stars are simulated only once
+        for all blocks of universes.
     """
 
     def __init__(self,
@@ -119,6 +133,23 @@ class Instrument(InstrumentModule):
                         + (y_map - (self.data.options.other['image_size'] - 1) / 2) ** 2)
         self.data.inst['radius_map'] = np.sqrt(r_square_map)
 
+        # group the pixels within the aperture into rings for radial integrations. Within the
+        # central 32 pixels every ring contains only pixels of identical radius, further out the
+        # rings are one pixel wide
+        radius_ap = self.data.inst['radius_map'].ravel()
+        pixels = np.where(radius_ap <= self.data.options.other['image_size'] / 2)[0]
+        ring_key = np.where(radius_ap[pixels] < 32,
+                            np.round(4 * r_square_map.ravel()[pixels]),
+                            4 * 32 ** 2 + np.floor(radius_ap[pixels]))
+        order = np.argsort(ring_key, kind='stable')
+        _, ring_starts, ring_counts = np.unique(ring_key[order],
+                                                return_index=True,
+                                                return_counts=True)
+        self.data.inst['ring_pixels'] = pixels[order]
+        self.data.inst['ring_starts'] = ring_starts
+        self.data.inst['ring_radius'] = (np.add.reduceat(radius_ap[pixels[order]], ring_starts)
+                                         / ring_counts)[np.newaxis, :]
+
     def get_wl_bins_const_spec_res(self):
         """
         Create the wavelength bins for the given spectral resolution and wavelength limits.
@@ -155,18 +186,19 @@ class Instrument(InstrumentModule):
 
     # TODO does not take the inclination into account!
     def adjust_bl_to_hz(self,
-                        hz_center: float,
-                        distance_s: float):
+                        hz_center: Union[float, np.ndarray],
+                        distance_s: Union[float, np.ndarray]):
         """
         Adjusts the baseline of the array to be optimal for observations in the habitable zone of
         the target star for the selected optimal wavelength.
 
         Parameters
         ----------
-        hz_center : float
+        hz_center : Union[float, np.ndarray]
             Separation of the center of the habitable zone in [AU].
-        distance_s : float
-            Distance between the observed star and the LIFE array in [pc].
+        distance_s : Union[float, np.ndarray]
+            Distance between the observed star and the LIFE array in [pc]. If arrays are given for
+            `hz_center` and `distance_s`, one baseline per star is saved to `data.inst['bl']`.
         """
 
         # convert the habitable zone to radians
@@ -180,14 +212,14 @@ class Instrument(InstrumentModule):
         self.apply_baseline(baseline=baseline)
 
     def apply_baseline(self,
-                       baseline: float,
+                       baseline: Union[float, np.ndarray],
                        print_warning: bool = False):
         """
         Adjusts the nulling baseline of the array to the specified value.
 
         Parameters
         ----------
-        baseline : float
+        baseline : Union[float, np.ndarray]
             Length of the nulling baseline in [m].
         print_warning : bool
             If set to true, function will print a warning if the specified baseline lies outside
@@ -198,24 +230,50 @@ class Instrument(InstrumentModule):
                                           self.data.options.array['bl_min'])
         self.data.inst['bl'] = np.minimum(baseline,
                                           self.data.options.array['bl_max'])
-        if (self.data.inst['bl'] != baseline) and print_warning:
+        if print_warning and np.any(self.data.inst['bl'] != baseline):
             warn('Specified baseline exceeded baseline limits. Baseline fixed to '
                  'respective limit')
 
-        # update the position of the apertures
+        # update the position of the apertures, for multiple baselines the positions of the
+        # individual arrays are given along the last axis
         self.data.inst['apertures'] = np.array([
             [-self.data.inst['bl'] / 2,
-             -self.data.options.array['ratio'] * self.data.inst['bl'] / 2., 1.],
+             -self.data.options.array['ratio'] * self.data.inst['bl'] / 2.,
+             np.ones_like(self.data.inst['bl'])],
             [self.data.inst['bl'] / 2,
-             -self.data.options.array['ratio'] * self.data.inst['bl'] / 2., 1.],
+             -self.data.options.array['ratio'] * self.data.inst['bl'] / 2.,
+             np.ones_like(self.data.inst['bl'])],
             [self.data.inst['bl'] / 2,
-             self.data.options.array['ratio'] * self.data.inst['bl'] / 2., 1.],
+             self.data.options.array['ratio'] * self.data.inst['bl'] / 2.,
+             np.ones_like(self.data.inst['bl'])],
             [-self.data.inst['bl'] / 2,
-             self.data.options.array['ratio'] * self.data.inst['bl'] / 2., 1.]
+             self.data.options.array['ratio'] * self.data.inst['bl'] / 2.,
+             np.ones_like(self.data.inst['bl'])]
         ])
 
+    def get_batch_size(self):
+        """
+        Returns the number of stars that are simulated at once in the batch mode of `get_snr`.
+        The number is chosen such that the intermediate arrays of a batch fit into the memory
+        specified in `data.options.other['batch_memory']`.
+
+        Returns
+        -------
+        int
+            Number of stars per batch.
+        """
+
+        # the exozodi calculation holds about ten arrays of the shape
+        # (wl_bins, image_size, image_size) per star in memory at the same time
+        bytes_star = (10 * 8 * self.data.inst['wl_bins'].shape[0]
+                      * self.data.options.other['image_size'] ** 2)
+
+        return int(max(1, self.data.options.other['batch_memory'] * 1e9 // bytes_star))
+
     def get_snr(self,
-                safe_mode: bool = False):
+                safe_mode: bool = False,
+                batch_mode: bool = False,
+                workers: int = 1):
         """
         Calculates the one-hour signal-to-noise ration for all planets in the catalog.
 
@@ -223,7 +281,15 @@ class Instrument(InstrumentModule):
         ----------
         safe_mode : bool
             If safe mode is enables, the individual photon counts of the planet and noise sources
-            are written to the catalog.
+            are written to the catalog. The photon counts per spectral bin are saved as arrays of
+            the shape (planets, wl_bins) in `data.spectra`.
+        batch_mode : bool
+            If set to True, multiple stars are simulated at once by adding a leading star axis to
+            the transmission maps and noise calculations. The number of stars per batch is chosen
+            from the memory budget given in `data.options.other['batch_memory']`.
+        workers : int
+            Number of processes the stars are distributed over. The results do not depend on the
+            number of workers and are identical to the ones of a serial run.
         """
 
         # options are applied before the simulation run
@@ -235,105 +301,416 @@ class Instrument(InstrumentModule):
         # time
         integration_time = 60 * 60 * self.data.options.array['rotation_period']
 
-        self.data.catalog['snr_1h'] = np.zeros_like(
-            self.data.catalog.nstar, dtype=float)
-        self.data.catalog['baseline'] = np.zeros_like(
-            self.data.catalog.nstar, dtype=float)
+        snr_1h = np.zeros_like(self.data.catalog.nstar, dtype=float)
+        baseline = np.zeros_like(self.data.catalog.nstar, dtype=float)
         if safe_mode:
-            self.data.catalog['noise_astro'] = None
-            self.data.catalog['planet_flux_use'] = None
-            self.data.catalog['photon_rate_planet'] = None
-            self.data.catalog['photon_rate_noise'] = None
-
-        # create mask returning only unique stars
-        _, temp = np.unique(self.data.catalog.nstar, return_index=True)
-        star_mask = np.zeros_like(self.data.catalog.nstar, dtype=bool)
-        star_mask[temp] = True
-
-        # iterate over all stars
-        for i, n in enumerate(tqdm(np.where(star_mask)[0])):
-            # if i == 10:
-            #     break
-            nstar = self.data.catalog.nstar.iloc[n]
-
-            # adjust baseline of array and give new baseline to transmission generator plugin
-            self.adjust_bl_to_hz(hz_center=float(self.data.catalog.hz_center.iloc[n]),
-                                 distance_s=float(self.data.catalog.distance_s.iloc[n]))
-
-            # get transmission map
-            _, _, self.data.inst['t_map'], _, _ = self.run_socket(s_name='transmission',
-                                                                  method='transmission_map',
-                                                                  map_selection='tm3')
-
-            # calculate the noise from the background sources
-            noise_bg_list = self.run_socket(s_name='photon_noise',
-                                            method='noise',
-                                            index=n)
-
-            # TODO: Reinstate the method in which the noise list is keyed by the name of the
-            #  producing noise module
-            if type(noise_bg_list) == list:
-                noise_bg = np.zeros_like(noise_bg_list[0])
-                for _, noise in enumerate(noise_bg_list):
-                    noise_bg += noise
+            photon_rate_planet = np.zeros_like(self.data.catalog.nstar, dtype=float)
+            photon_rate_noise = np.zeros_like(self.data.catalog.nstar, dtype=float)
+
+        # the row position of the first planet of every star, in the order of the catalog
+        self.data.catalog_star_index()
+        stars = np.sort(self.data.star_index['order'][self.data.star_index['offsets'][:-1]])
+
+        # in batch mode, the stars are split into batches of row positions, otherwise the stars are
+        # calculated one by one
+        if batch_mode:
+            stars = np.array_split(stars, np.ceil(stars.shape[0] / self.get_batch_size()))
+
+        if workers > 1:
+            # the chunks of stars are handed to the next idle worker, starting from the most
+            # expensive ones. The results are merged by their row position in the catalog and are
+            # therefore independent of the order in which the workers finish
+            chunks = self.get_snr_chunks(stars=stars,
+                                         workers=workers)
+
+        with (ProcessPoolExecutor(max_workers=workers,
+                                  initializer=_init_snr_worker,
+                                  initargs=(self,))
+              if workers > 1 else nullcontext()) as executor:
+            if workers > 1:
+                futures = [executor.submit(_run_snr_worker, chunk, integration_time, safe_mode)
+                           for chunk in chunks]
+                results = (future.result() for future in tqdm(as_completed(futures),
+                                                              total=len(futures)))
             else:
-                noise_bg = noise_bg_list
-
-            noise_bg = noise_bg * integration_time * \
-                self.data.inst['eff_tot'] * 2
-
-            # go through all planets for the chosen star
-            for _, n_p in enumerate(np.argwhere(
-                    self.data.catalog.nstar.to_numpy() == nstar)[:, 0]):
-
-                # calculate the photon flux originating from the planet
-                flux_planet_thermal = black_body(mode='planet',
-                                                 bins=self.data.inst['wl_bins'],
-                                                 width=self.data.inst['wl_bin_widths'],
-                                                 temp=self.data.catalog['temp_p'].iloc[n_p],
-                                                 radius=self.data.catalog['radius_p'].iloc[n_p],
-                                                 distance=self.data.catalog['distance_s'].iloc[n_p]
-                                                 )
-
-                # calculate the transmission efficiency of the planets separation
-                transm_eff, transm_noise = self.run_socket(s_name='transmission',
-                                                           method='transmission_efficiency',
-                                                           index=n_p)
-
-                # calculate the signal and photon noise flux received from the planet
-                flux_planet = (flux_planet_thermal
-                               * transm_eff
-                               * integration_time
-                               * self.data.inst['eff_tot']
-                               * self.data.inst['telescope_area'])
-                noise_planet = (flux_planet_thermal
-                                * transm_noise
-                                * integration_time
-                                * self.data.inst['eff_tot']
-                                * self.data.inst['telescope_area']
-                                * 2)
-
-                # Add up the noise and caluclate the SNR
-                noise = noise_bg + noise_planet
-                self.data.catalog.snr_1h.iat[n_p] = np.sqrt(
-                    (flux_planet ** 2 / noise).sum())
-
-                # save baseline
-                self.data.catalog['baseline'].iat[n_p] = self.data.inst['bl']
+                results = ((self.get_snr_chunk(stars=[n],
+                                               integration_time=integration_time,
+                                               safe_mode=safe_mode), {})
+                           for n in tqdm(stars))
+
+            # the spectral results are written to arrays owned by the data class. They are created
+            # after the start of the workers, which do not need them
+            if safe_mode:
+                self.data.spectra_create(names=['noise_astro', 'planet_flux_use'],
+                                         n_wl=self.data.inst['wl_bins'].shape[0])
+
+            # iterate over all stars, the noise of stars newly simulated by the workers is added
+            # to the noise cache
+            for (n_p, snr_p, bl_p, noise_bg_p,
+                 flux_planet_use, rate_planet, rate_noise), cache in results:
+                if cache:
+                    self.data.inst['noise_cache'].update(cache)
+                snr_1h[n_p] = snr_p
+                baseline[n_p] = bl_p
 
                 if safe_mode:
-                    self.data.catalog.noise_astro.iat[n_p] = [noise_bg]
-                    self.data.catalog.planet_flux_use.iat[n_p] = (
-                        [flux_planet_thermal
-                         * integration_time
-                         * self.data.inst['eff_tot']
-                         * self.data.inst['telescope_area']])
-                    self.data.catalog['photon_rate_planet'].iat[n_p] = (flux_planet
-                                                                        / integration_time
-                                                                        / self.data.inst['eff_tot']).sum()
-                    self.data.catalog['photon_rate_noise'].iat[n_p] = (noise
-                                                                       / integration_time
-                                                                       / self.data.inst['eff_tot']).sum()
+                    self.data.spectra['noise_astro'][n_p] = noise_bg_p
+                    self.data.spectra['planet_flux_use'][n_p] = flux_planet_use
+                    photon_rate_planet[n_p] = rate_planet
+                    photon_rate_noise[n_p] = rate_noise
+
+        # write the results to the catalog in a single step
+        self.data.catalog['snr_1h'] = snr_1h
+        self.data.catalog['baseline'] = baseline
+        if safe_mode:
+            self.data.catalog['photon_rate_planet'] = photon_rate_planet
+            self.data.catalog['photon_rate_noise'] = photon_rate_noise
+
+    def get_snr_stream(self,
+                       input_path: str,
+                       output_path: str,
+                       universes_per_block: int = 10,
+                       safe_mode: bool = False,
+                       batch_mode: bool = False,
+                       workers: int = 1,
+                       **kwargs):
+        """
+        Calculates the one-hour signal-to-noise ratio for all planets in a P-Pop output file
+        without loading the full catalog. The file is read block by block, where every block
+        contains the planets of a number of universes (see `Data.catalog_blocks_from_ppop`). The
+        signal-to-noise ratio of every block is calculated with `get_snr` and the block is
+        appended to the columnar directory at `output_path` (see `Data.export_catalog`), from
+        which the full results can be imported. The memory needed is set by the size of the
+        blocks instead of the size of the catalog.
+
+        The same stars appear in all universes. Their baselines and background noise are therefore
+        calculated only once and kept in `data.inst['noise_cache']` for the following blocks.
+        After the run, the catalog of the data class contains the last block.
+
+        Parameters
+        ----------
+        input_path : str
+            Path to the P-Pop output file in a .txt, .txt.gz or .fits format, sorted by universe.
+        output_path : str
+            Path to the columnar directory the results are saved to. An existing directory is
+            overwritten.
+        universes_per_block : int
+            Number of universes per block.
+        safe_mode : bool
+            If safe mode is enables, the individual photon counts of the planet and noise sources
+            are saved, see `get_snr`.
+        batch_mode : bool
+            If set to True, multiple stars are simulated at once, see `get_snr`.
+        workers : int
+            Number of processes the stars of every block are distributed over.
+        **kwargs
+            Selection of the planets read from the P-Pop output file, passed on to
+            `Data.catalog_blocks_from_ppop` (e.g. `stypes`, `distance`, `universes` or
+            `columns`).
+        """
+
+        self.data.inst['noise_cache'] = {}
+        try:
+            for i, block in enumerate(self.data.catalog_blocks_from_ppop(
+                    input_path=input_path,
+                    universes_per_block=universes_per_block,
+                    **kwargs)):
+                print('Block ' + str(block) + ': ' + str(self.data.catalog.shape[0]) + ' planets')
+                self.get_snr(safe_mode=safe_mode,
+                             batch_mode=batch_mode,
+                             workers=workers)
+                self.data.export_catalog(output_path=output_path,
+                                         append_rows=(i > 0))
+        finally:
+            del self.data.inst['noise_cache']
+
+    def get_snr_chunks(self,
+                       stars: list,
+                       workers: int):
+        """
+        Groups the stars into chunks of similar computational cost for the distribution over
+        multiple worker processes.
+
+        Parameters
+        ----------
+        stars : list
+            Row positions of one planet per star, or arrays of such row positions in batch mode.
+        workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        chunks : list
+            Lists of entries of `stars`, ordered from the most to the least expensive chunk.
+        """
+
+        # the simulation of a star is dominated by the calculations on the pixel maps, the one of
+        # a planet by the Bessel functions of its transmission efficiency in every spectral bin
+        nstar_all = self.data.catalog.nstar.to_numpy()
+        counts = np.diff(self.data.star_index['offsets'])
+        cost = np.array([(self.data.options.other['image_size'] ** 2
+                          + 10 * self.data.inst['wl_bins'].shape[0]
+                          * counts[np.searchsorted(self.data.star_index['nstar'], nstar_all[n])]
+                          ).sum()
+                         for n in stars])
+
+        # several chunks per worker allow the workers that finish early to pick up the remaining
+        # work
+        target = cost.sum() / (4 * workers)
+
+        chunks = []
+        chunk = []
+        chunk_cost = 0.
+        for _, i in enumerate(np.argsort(-cost, kind='stable')):
+            chunk.append(stars[i])
+            chunk_cost += cost[i]
+            if chunk_cost >= target:
+                chunks.append(chunk)
+                chunk = []
+                chunk_cost = 0.
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
+
+    def get_snr_chunk(self,
+                      stars: list,
+                      integration_time: float,
+                      safe_mode: bool = False):
+        """
+        Calculates the signal-to-noise ratio of all planets orbiting the stars in a chunk.
+
+        Parameters
+        ----------
+        stars : list
+            Row positions of one planet per star, or arrays of such row positions in batch mode.
+        integration_time : float
+            Time that the LIFE array spends for integrating on the observed planets in [s].
+        safe_mode : bool
+            If set to True, the photon counts of the planets and noise sources are returned.
+
+        Returns
+        -------
+        n_p : np.ndarray
+            Row positions of all planets orbiting the stars in the chunk.
+        snr_p : np.ndarray
+            Signal-to-noise ratio of the planets after the integration time.
+        bl_p : np.ndarray
+            Baseline used for the observation of the planets in [m].
+        noise_bg_p
+            Photon counts of the astrophysical background sources in the shape
+            (planets, wl_bins). Only returned in safe mode, `None` otherwise.
+        flux_planet_use
+            Photon counts from the planets before applying the transmission efficiency in the
+            shape (planets, wl_bins). Only returned in safe mode, `None` otherwise.
+        photon_rate_planet
+            Total photon rate of the planet signal in [photon s-1]. Only returned in safe mode,
+            `None` otherwise.
+        photon_rate_noise
+            Total photon rate of all noise sources in [photon s-1]. Only returned in safe mode,
+            `None` otherwise.
+        """
+
+        results = []
+        for _, n in enumerate(stars):
+            (n_p, snr_p, bl_p, noise_bg_p,
+             flux_planet_use, flux_planet, noise) = self.get_snr_stars(
+                index=n,
+                integration_time=integration_time)
+
+            if safe_mode:
+                results.append((n_p, snr_p, bl_p, noise_bg_p, flux_planet_use,
+                                (flux_planet
+                                 / integration_time
+                                 / self.data.inst['eff_tot']).sum(axis=-1),
+                                (noise
+                                 / integration_time
+                                 / self.data.inst['eff_tot']).sum(axis=-1)))
+            else:
+                results.append((n_p, snr_p, bl_p))
+
+        if safe_mode:
+            return tuple(np.concatenate(r) for r in zip(*results))
+        else:
+            return tuple(np.concatenate(r) for r in zip(*results)) + (None, ) * 4
+
+    def get_snr_stars(self,
+                      index: Union[int, np.ndarray],
+                      integration_time: float):
+        """
+        Calculates the signal-to-noise ratio of all planets orbiting the specified star or stars.
+
+        Parameters
+        ----------
+        index : Union[int, np.ndarray]
+            Row position in the catalog of one planet per star. If an array of row positions is
+            given, all stars are simulated at once.
+        integration_time : float
+            Time that the LIFE array spends for integrating on the observed planets in [s].
+
+        Returns
+        -------
+        n_p : np.ndarray
+            Row positions of all planets orbiting the specified stars.
+        snr_p : np.ndarray
+            Signal-to-noise ratio of the planets after the integration time.
+        bl_p : np.ndarray
+            Baseline used for the observation of the planets in [m].
+        noise_bg_p : np.ndarray
+            Photon counts of the astrophysical background sources in the shape
+            (planets, wl_bins).
+        flux_planet_use : np.ndarray
+            Photon counts from the planets before applying the transmission efficiency in the
+            shape (planets, wl_bins).
+        flux_planet : np.ndarray
+            Photon counts of the planet signal in the shape (planets, wl_bins).
+        noise : np.ndarray
+            Photon counts of all noise sources in the shape (planets, wl_bins).
+        """
+
+        nstar_all = self.data.catalog.nstar.to_numpy()
+
+        # the baseline and the background noise only depend on the star. If the noise cache is
+        # active, they are only calculated for stars that have not been simulated before
+        if self.data.inst.get('noise_cache') is None:
+            bl, noise_bg, noise_zodi = self.get_noise_stars(index=index,
+                                                            integration_time=integration_time)
+        else:
+            cache = self.data.inst['noise_cache']
+            if np.ndim(index) == 0:
+                if nstar_all[index] not in cache:
+                    cache[nstar_all[index]] = self.get_noise_stars(
+                        index=index,
+                        integration_time=integration_time)
+                bl, noise_bg, noise_zodi = cache[nstar_all[index]]
+            else:
+                new = np.array([n not in cache for n in nstar_all[index]], dtype=bool)
+                if new.any():
+                    for n, *entry in zip(nstar_all[index[new]],
+                                         *self.get_noise_stars(index=index[new],
+                                                               integration_time=integration_time)):
+                        cache[n] = tuple(entry)
+                bl, noise_bg, noise_zodi = (np.stack(values) for values in zip(
+                    *(cache[n] for n in nstar_all[index])))
+        self.data.inst['bl'] = bl
+
+        # all planets of the chosen stars are calculated at once, the planets are placed along
+        # the first and the spectral bins along the second axis
+        n_p = self.data.catalog_star_rows(nstar=nstar_all[index])
+        if np.ndim(index) == 0:
+            host = np.zeros_like(n_p)
+            noise_bg = noise_bg[np.newaxis, :]
+            noise_zodi = noise_zodi[np.newaxis, :]
+        else:
+            # find the position of the host star of every planet within the batch and give every
+            # planet the baseline of its host star
+            sorter = np.argsort(nstar_all[index])
+            host = sorter[np.searchsorted(nstar_all[index], nstar_all[n_p], sorter=sorter)]
+            self.data.inst['bl'] = self.data.inst['bl'][host]
+
+        # give every planet the background noise of its host star with the exozodi leakage of its
+        # own zodi level
+        noise_bg_p = (noise_bg[host]
+                      + self.data.catalog.z.to_numpy()[n_p, np.newaxis] * noise_zodi[host])
+
+        # calculate the photon flux originating from the planets
+        flux_planet_thermal = black_body(
+            mode='planet',
+            bins=self.data.inst['wl_bins'],
+            width=self.data.inst['wl_bin_widths'],
+            temp=self.data.catalog.temp_p.to_numpy()[n_p, np.newaxis],
+            radius=self.data.catalog.radius_p.to_numpy()[n_p, np.newaxis],
+            distance=self.data.star_column('distance_s', n_p)[:, np.newaxis])
+
+        # calculate the transmission efficiency of the planets separation
+        transm_eff, transm_noise = self.run_socket(s_name='transmission',
+                                                   method='transmission_efficiency',
+                                                   index=n_p)
+
+        # calculate the signal and photon noise flux received from the planets
+        flux_planet_use = (flux_planet_thermal
+                           * integration_time
+                           * self.data.inst['eff_tot']
+                           * self.data.inst['telescope_area'])
+        flux_planet = (flux_planet_thermal
+                       * transm_eff
+                       * integration_time
+                       * self.data.inst['eff_tot']
+                       * self.data.inst['telescope_area'])
+        noise_planet = (flux_planet_thermal
+                        * transm_noise
+                        * integration_time
+                        * self.data.inst['eff_tot']
+                        * self.data.inst['telescope_area']
+                        * 2)
+
+        # Add up the noise and caluclate the SNR
+        noise = noise_bg_p + noise_planet
+        snr_p = np.sqrt((flux_planet ** 2 / noise).sum(axis=-1))
+
+        bl_p = np.broadcast_to(self.data.inst['bl'], n_p.shape)
+
+        return n_p, snr_p, bl_p, noise_bg_p, flux_planet_use, flux_planet, noise
+
+    def get_noise_stars(self,
+                        index: Union[int, np.ndarray],
+                        integration_time: float):
+        """
+        Calculates the baseline and the photon counts of the astrophysical background sources of
+        the specified star or stars.
+
+        Parameters
+        ----------
+        index : Union[int, np.ndarray]
+            Row position in the catalog of one planet per star. If an array of row positions is
+            given, all stars are simulated at once.
+        integration_time : float
+            Time that the LIFE array spends for integrating on the observed planets in [s].
+
+        Returns
+        -------
+        bl : Union[float, np.ndarray]
+            Baseline used for the observation of the stars in [m].
+        noise_bg : np.ndarray
+            Photon counts of the background sources that do not scale with the zodi level of the
+            planets in the shape (stars, wl_bins).
+        noise_zodi : np.ndarray
+            Photon counts of the background sources that scale with the zodi level of the planets
+            for a zodi level of one in the shape (stars, wl_bins).
+        """
+
+        # adjust baseline of array and give new baseline to transmission generator plugin
+        self.adjust_bl_to_hz(hz_center=self.data.star_column('hz_center', index),
+                             distance_s=self.data.star_column('distance_s', index))
+
+        # get transmission map
+        _, _, self.data.inst['t_map'], _, _ = self.run_socket(s_name='transmission',
+                                                              method='transmission_map',
+                                                              map_selection='tm3')
+
+        # get the radial transmission profile for the radial integration of the exozodi
+        if self.data.options.other['exozodi_mode'] == 'radial':
+            self.data.inst['t_profile'] = self.run_socket(s_name='transmission',
+                                                          method='transmission_profile',
+                                                          t_map=self.data.inst['t_map'])
+
+        # calculate the noise from the background sources. The leakage of sources that are linear
+        # in the zodi level is calculated for a single zodi and scaled to the zodi level of every
+        # planet individually
+        noise_bg = np.zeros(np.shape(index) + (self.data.inst['wl_bins'].shape[0], ))
+        noise_zodi = np.zeros_like(noise_bg)
+        for module in filter(None, self.sockets['photon_noise']['modules']):
+            if module.zodi_scaling:
+                noise_zodi += module.noise(index=index, unit_zodi=True)
+            else:
+                noise_bg += module.noise(index=index)
+
+        noise_bg = noise_bg * integration_time * \
+            self.data.inst['eff_tot'] * 2
+        noise_zodi = noise_zodi * integration_time * \
+            self.data.inst['eff_tot'] * 2
+
+        return self.data.inst['bl'], noise_bg, noise_zodi
 
     # TODO: fix units in documentation
     def get_spectrum(self,
@@ -482,6 +859,10 @@ class Instrument(InstrumentModule):
         _, _, self.data.inst['t_map'], _, _ = self.run_socket(s_name='transmission',
                                                               method='transmission_map',
                                                               map_selection='tm3')
+        if self.data.options.other['exozodi_mode'] == 'radial':
+            self.data.inst['t_profile'] = self.run_socket(s_name='transmission',
+                                                          method='transmission_profile',
+                                                          t_map=self.data.inst['t_map'])
 
         transm_eff, transm_noise = self.run_socket(s_name='transmission',
                                                    method='transmission_efficiency',
@@ -528,3 +909,31 @@ class Instrument(InstrumentModule):
             return ([self.data.inst['wl_bins'], snr_spec],
                     flux_planet,
                     [noise, noise_bg_list])
+
+
+def _init_snr_worker(instrument: Instrument):
+    """
+    Initializes a worker process of `Instrument.get_snr` with a copy of the instrument module and
+    the data and modules connected to it.
+    """
+    global _snr_worker_instrument
+    _snr_worker_instrument = instrument
+
+
+def _run_snr_worker(stars: list,
+                    integration_time: float,
+                    safe_mode: bool):
+    """
+    Runs `Instrument.get_snr_chunk` on the instrument module of a worker process. Together with
+    the results, the entries added to the noise cache of the worker are returned.
+    """
+    cache = _snr_worker_instrument.data.inst.get('noise_cache')
+    known = set() if cache is None else set(cache.keys())
+
+    result = _snr_worker_instrument.get_snr_chunk(stars=stars,
+                                                  integration_time=integration_time,
+                                                  safe_mode=safe_mode)
+
+    if cache is None:
+        return result, {}
+    return result, {n: cache[n] for n in cache.keys() - known}
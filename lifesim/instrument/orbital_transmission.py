@@ -89,22 +89,33 @@ class OrbitalTransmissionMap(TransmissionMap):
             return self.transmission_curve(x, z, n_rotations, rotation_steps)
 
     def transmission_efficiency(self,
-                                index: Union[int, None],
-                                time_dependent=True):
+                                index: Union[int, np.ndarray, None],
+                                time_dependent=True,
+                                analytic: bool = True,
+                                angsep: Union[float, np.ndarray, None] = None):
         """
         Integrates over transmission curves to get the transmission efficiency for signal and noise
 
         Parameters
         ----------
-        bl : float
-            Length of the shorter, nulling baseline in [m]
-        wl_bins : np.ndarray
-            Central values of the spectral bins in the wavelength regime in [m]
-        angsep : float
-            Angular separation between the observed star and the observed exoplanet in [arcsec]
-        ratio : float
-            Ratio between the nulling and the imaging baseline. E.g. if the imaging baseline is
-            twice as long as the nulling baseline, the ratio will be 2
+        index : Union[int, np.ndarray, None]
+            Integer row position of the planet in the catalog. If an array of row positions is
+            given, the efficiencies of all planets are returned in the shape (planets, wl_bins).
+            If `data.inst['bl']` holds an array of baselines, it needs to contain one baseline per
+            planet.
+        time_dependent : bool
+            If set to True, the movement of the planet along its orbit during the observation is
+            taken into account.
+        analytic : bool
+            Only used together with `angsep`. If set to True, the efficiencies are evaluated in
+            closed form (see `TransmissionMap.transmission_efficiency`), otherwise the transmission
+            curves are sampled in 360 azimuthal steps.
+        angsep : Union[float, np.ndarray, None]
+            Angular separation between the observed star and the observed exoplanet in [arcsec].
+            If given, the orbits of the planets are ignored and the planets are placed at a fixed
+            position with this separation. For an array of angular separations,
+            `data.inst['bl']` needs to hold a single baseline or one baseline per angular
+            separation.
 
         Returns
         -------
@@ -116,6 +127,35 @@ class OrbitalTransmissionMap(TransmissionMap):
 
         """
 
+        # without the orbital motion, the efficiency only depends on the angular separation
+        if angsep is not None:
+            if analytic:
+                return super().transmission_efficiency(index=index,
+                                                       angsep=angsep)
+
+            angsep_rad = angsep / (3600 * 180) * np.pi
+            if np.ndim(angsep_rad) > 0:
+                angsep_rad = np.reshape(angsep_rad, (-1, 1, 1, 1))
+            tc_chop, tc_tm4 = self.transmission_curve(xs=angsep_rad,
+                                                      zs=0.)
+            return (np.sqrt((tc_chop ** 2).mean(axis=(-2, -1))),
+                    np.sqrt((tc_tm4 ** 2).mean(axis=(-2, -1))))
+
+        # the orbits of the planets differ in inclination and period, such that the transmission
+        # curves are calculated planet by planet with the baseline of every planet
+        if np.ndim(index) > 0:
+            bl = self.data.inst['bl']
+            results = []
+            try:
+                for i, n in enumerate(index):
+                    self.data.inst['bl'] = bl if np.ndim(bl) == 0 else bl[i]
+                    results.append(self.transmission_efficiency(index=n,
+                                                                time_dependent=time_dependent))
+            finally:
+                self.data.inst['bl'] = bl
+            transm_eff, transm_noise = (np.stack(r) for r in zip(*results))
+            return transm_eff, transm_noise
+
         tc_chop, tc_tm4 = self.get_transmission_curve(index, time_dependent)
 
         # integrate over angles to get transmission efficiency
@@ -11,6 +11,7 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
     This class simulates the noise contribution of an exozodi disk to the interferometric
     measurement of LIFE.
     """
+    zodi_scaling = True
 
     def __init__(self,
                  name: str):
@@ -23,27 +24,35 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
         """
 
     def noise(self,
-              index: Union[int, type(None)]):
+              index: Union[int, np.ndarray, type(None)],
+              unit_zodi: bool = False):
         """
         Simulates the amount of photon noise originating from the exozodi of the observed system
         leaking into the LIFE array measurement.
 
         Parameters
         ----------
-        index: Union[int, type(None)]
+        index: Union[int, np.ndarray, type(None)]
             Specifies the planet for which to calculate the noise contribution. If an integer n is
-            given, the noise will be calculated for the n-th row in the `data.catalog`. If `None`
-            is given, the noise is caluculated for the parameters located in `data.single`.
+            given, the noise will be calculated for the n-th row in the `data.catalog`. If an
+            array of row positions is given, the noise is calculated for all of them at once. If
+            `None` is given, the noise is caluculated for the parameters located in `data.single`.
+        unit_zodi : bool
+            If set to True, the leakage is calculated for a zodi level of one instead of the zodi
+            level `z` of the observed system. Since the leakage is linear in the zodi level, it can
+            then be scaled to the zodi level of any system around the same star.
 
         Returns
         -------
         ez_leak
-            Exozodi leakage in [photon s-1] per wavelength bin.
+            Exozodi leakage in [photon s-1] per wavelength bin. For an array of row positions, the
+            leakage is returned in the shape (rows, wl_bins).
 
         Notes
         -----
         All of the following parameters are needed for the calculation of the exozodi noise
-        contribution and should be specified either in `data.catalog` or in `data.single`.
+        contribution and should be specified either in `data.catalog` (properties of the host star
+        in `data.stars`) or in `data.single`.
 
         l_sun : float
             Luminosity of the observed star in [solar luminosities].
@@ -69,6 +78,17 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
         data.inst['t_map'] : np.ndarray
             Transmission map of the TM3 mode of the array created by the
             lifesim.TransmissionMap module.
+        data.options.other['exozodi_mode'] : str
+            If set to ``'radial'``, the disk emission is only evaluated on the rings of pixels
+            given by `data.inst['ring_radius']` and multiplied with the radial transmission
+            profile in `data.inst['t_profile']`, reducing the cost from the number of pixels to
+            the number of rings. The leakage deviates from the one summed over all pixels by a
+            few 1e-4.
+
+        Raises
+        ------
+        ValueError
+            If the specified exozodi mode does not exist.
         """
 
         # read from catalog or single data depending on index specification
@@ -76,10 +96,19 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
             l_sun = self.data.single['l_sun']
             distance_s = self.data.single['distance_s']
             z = self.data.single['z']
-        else:
-            l_sun = self.data.catalog.l_sun.iloc[index]
-            distance_s = self.data.catalog.distance_s.iloc[index]
+        elif np.ndim(index) == 0:
+            l_sun = self.data.star_column('l_sun', index)
+            distance_s = self.data.star_column('distance_s', index)
             z = self.data.catalog.z.iloc[index]
+        else:
+            # for multiple stars, place the stars on a leading axis in front of the
+            # (wl_bins, image_size, image_size) dimensions
+            l_sun = self.data.star_column('l_sun', index).reshape((-1, 1, 1, 1))
+            distance_s = self.data.star_column('distance_s', index).reshape((-1, 1, 1, 1))
+            z = self.data.catalog.z.to_numpy()[index].reshape((-1, 1, 1, 1))
+
+        if unit_zodi:
+            z = 1.
 
         # calculate the parameters required by Kennedy2015
         alpha = 0.34
@@ -97,8 +126,18 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
 
         au_pix = mas_pix / 1e3 * distance_s
 
+        # in the radial mode, the disk is evaluated on the rings of pixels instead of the
+        # individual pixels. Since the disk is face-on and radially symmetric, it only needs to be
+        # multiplied with the transmission summed over every ring
+        if self.data.options.other['exozodi_mode'] == 'map':
+            radius_map = self.data.inst['radius_map']
+        elif self.data.options.other['exozodi_mode'] == 'radial':
+            radius_map = self.data.inst['ring_radius']
+        else:
+            raise ValueError('Specified exozodi mode does not exist')
+
         # the radius as measured from the central star for every pixel in [AU]
-        r_au = self.data.inst['radius_map'] * au_pix
+        r_au = radius_map * au_pix
 
         # identify all pixels where the radius is larges than the inner radius by Kennedy+2015
         r_cond = ((r_au >= r_in)
@@ -128,9 +167,21 @@ class PhotonNoiseExozodi(PhotonNoiseModule):
                                mode='wavelength') \
                     * sigma * rad_pix ** 2 * self.data.inst['telescope_area']
 
-        ap = np.where(self.data.inst['radius_map']
-                      <= self.data.options.other['image_size'] / 2, 1, 0)
+        if self.data.options.other['exozodi_mode'] == 'radial':
+            # the rings only contain pixels within the aperture
+            t_map = self.data.inst['t_profile']
+        else:
+            ap = np.where(self.data.inst['radius_map']
+                          <= self.data.options.other['image_size'] / 2, 1, 0)
+
+            # a transmission map that is the same in all spectral bins is handed out as a
+            # broadcast view, in this case the aperture is only applied to a single bin
+            t_map = self.data.inst['t_map']
+            if t_map.strides[-3] == 0:
+                t_map = t_map[..., :1, :, :]
+            t_map = t_map * ap
+
         # add the transmission map
-        ez_leak = (f_nu_disk * self.data.inst['t_map'] * ap).sum(axis=(-2, -1))
+        ez_leak = (f_nu_disk * t_map).sum(axis=(-2, -1))
 
         return ez_leak
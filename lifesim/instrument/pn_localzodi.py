@@ -3,6 +3,7 @@ from typing import Union
 import numpy as np
 
 from lifesim.core.modules import PhotonNoiseModule
+from lifesim.instrument.transmission import disk_transmission
 from lifesim.util.radiation import black_body
 
 
@@ -24,27 +25,30 @@ class PhotonNoiseLocalzodi(PhotonNoiseModule):
         super().__init__(name=name)
 
     def noise(self,
-              index: Union[int, type(None)]):
+              index: Union[int, np.ndarray, type(None)]):
         """
         Simulates the amount of photon noise originating from the localzodi leaking into the LIFE
         array measurement.
 
         Parameters
         ----------
-        index: Union[int, type(None)]
+        index: Union[int, np.ndarray, type(None)]
             Specifies the planet for which to calculate the noise contribution. If an integer n is
-            given, the noise will be calculated for the n-th row in the `data.catalog`. If `None`
-            is given, the noise is caluculated for the parameters located in `data.single`.
+            given, the noise will be calculated for the n-th row in the `data.catalog`. If an
+            array of row positions is given, the noise is calculated for all of them at once. If
+            `None` is given, the noise is caluculated for the parameters located in `data.single`.
 
         Returns
         -------
         lz_leak
-            Localzodi leakage in [photon s-1] per wavelength bin.
+            Localzodi leakage in [photon s-1] per wavelength bin. For an array of row positions,
+            the leakage is returned in the shape (rows, wl_bins).
 
         Notes
         -----
         All of the following parameters are needed for the calculation of the localzodi noise
-        contribution and should be specified either in `data.catalog` or in `data.single`.
+        contribution and should be specified either in `data.catalog` (properties of the host star
+        in `data.stars`) or in `data.single`.
 
         lat_s : str
             Ecliptic latitude of the observed star in [rad].
@@ -64,23 +68,38 @@ class PhotonNoiseLocalzodi(PhotonNoiseModule):
             bins.
         data.inst['t_map'] : np.ndarray
             Transmission map of the TM3 mode of the array created by the
-            lifesim.TransmissionMap module.
+            lifesim.TransmissionMap module. Only needed in the ``'map'`` localzodi mode.
         data.inst['telescope_area'] : float
             Area of all array apertures combined in [m^2].
+        data.options.other['localzodi_mode'] : str
+            If set to ``'analytic'``, the transmission of the TM3 mode averaged over the field of
+            view is calculated in closed form. Since the half field of view is wl / (2 * D), it
+            only depends on the ratio of the nulling baseline and the aperture diameter. If set to
+            ``'map'``, the transmission map is averaged over the pixels within the aperture,
+            which deviates from the closed form by about 1e-3 due to the pixelation of the
+            aperture edge.
 
         Raises
         ------
         ValueError
             If the specified localzodi model does not exits.
+        ValueError
+            If the specified localzodi mode does not exist.
         """
 
         # TODO Implement longitude dependence of localzodi
         # TODO Find model after which this is calculated and reference
 
+        bl = self.data.inst['bl']
         if index is None:
             lat_s = self.data.single['lat']
+        elif np.ndim(index) == 0:
+            lat_s = self.data.star_column('lat', index)
         else:
-            lat_s = self.data.catalog.lat.iloc[index]
+            # for multiple stars, place the stars on a leading axis in front of the wl_bins
+            lat_s = self.data.star_column('lat', index).reshape((-1, 1))
+            if np.ndim(bl) > 0:
+                bl = np.reshape(bl, (-1, 1))
 
         # check if the model exists
         if not ((self.data.options.models['localzodi'] == 'glasse')
@@ -92,9 +111,6 @@ class PhotonNoiseLocalzodi(PhotonNoiseModule):
         long = 3 / 4 * np.pi
         lat = lat_s
 
-        ap = np.where(self.data.inst['radius_map']
-                      <= self.data.options.other['image_size'] / 2, 1, 0)
-
         # calculate the localzodi flux depending on the correct model
         if self.data.options.models['localzodi'] == 'glasse':
             temp = 270
@@ -128,8 +144,24 @@ class PhotonNoiseLocalzodi(PhotonNoiseModule):
 
         lz_flux = lz_flux_sr * (np.pi * self.data.inst['hfov'] ** 2)
 
+        if self.data.options.other['localzodi_mode'] == 'analytic':
+            # the field of view is a disk with the radius hfov = wl / (2 * D)
+            t_avg = disk_transmission(k=np.pi * bl / (2 * self.data.options.array['diameter']))
+        elif self.data.options.other['localzodi_mode'] == 'map':
+            ap = np.where(self.data.inst['radius_map']
+                          <= self.data.options.other['image_size'] / 2, 1, 0)
+
+            # a transmission map that is the same in all spectral bins is handed out as a
+            # broadcast view, in this case the average over the aperture is only taken on a
+            # single bin
+            t_map = self.data.inst['t_map']
+            if t_map.strides[-3] == 0:
+                t_map = t_map[..., :1, :, :]
+            t_avg = (ap * t_map).sum(axis=(-2, -1)) / ap.sum()
+        else:
+            raise ValueError('Specified localzodi mode does not exist')
+
         # calculate the leakage contribution to the measurement
-        lz_leak = (ap * self.data.inst['t_map']).sum(axis=(-2, -1)) / ap.sum() * lz_flux \
-                  * self.data.inst['telescope_area']
+        lz_leak = t_avg * lz_flux * self.data.inst['telescope_area']
 
         return lz_leak
@@ -3,6 +3,7 @@ from typing import Union
 import numpy as np
 
 from lifesim.core.modules import PhotonNoiseModule, TransmissionModule
+from lifesim.instrument.transmission import disk_transmission
 from lifesim.util.radiation import black_body
 
 
@@ -26,27 +27,30 @@ class PhotonNoiseStar(PhotonNoiseModule):
                         s_type=TransmissionModule)
 
     def noise(self,
-              index: Union[int, type(None)]):
+              index: Union[int, np.ndarray, type(None)]):
         """
         Simulates the amount of photon noise originating from the star of the observed system
         leaking into the LIFE array measurement.
 
         Parameters
         ----------
-        index: Union[int, type(None)]
+        index: Union[int, np.ndarray, type(None)]
             Specifies the planet for which to calculate the noise contribution. If an integer n is
-            given, the noise will be calculated for the n-th row in the `data.catalog`. If `None`
-            is given, the noise is caluculated for the parameters located in `data.single`.
+            given, the noise will be calculated for the n-th row in the `data.catalog`. If an
+            array of row positions is given, the noise is calculated for all of them at once. If
+            `None` is given, the noise is caluculated for the parameters located in `data.single`.
 
         Returns
         -------
         sl_leak
-            Stellar leakage in [photon s-1] per wavelength bin.
+            Stellar leakage in [photon s-1] per wavelength bin. For an array of row positions, the
+            leakage is returned in the shape (rows, wl_bins).
 
         Notes
         -----
         All of the following parameters are needed for the calculation of the exozodi noise
-        contribution and should be specified either in `data.catalog` or in `data.single`.
+        contribution and should be specified either in `data.catalog` (properties of the host star
+        in `data.stars`) or in `data.single`.
 
         radius_s : float
             Radius of the observed star in [sun radii].
@@ -60,24 +64,43 @@ class PhotonNoiseStar(PhotonNoiseModule):
             Widths of the spectral wavelength bins in [m].
         data.inst['telescope_area'] : float
             Area of all array apertures combined in [m^2].
+        data.options.other['star_mode'] : str
+            If set to ``'analytic'``, the transmission of the TM3 mode averaged over the stellar
+            disk is calculated in closed form, which only depends on the product of the stellar
+            angular radius and the baseline divided by the wavelength. For all realistic stars
+            this product is small and the power series of the closed form is used, which is
+            exact to machine precision. If set to ``'map'``, the transmission map over the stellar
+            disk is calculated on a 50x50 pixel grid via the `transmission_star` socket. The
+            pixelated disk is slightly larger than the star, resulting in an about 5% larger
+            leakage.
 
         Raises
         ------
         ValueError
             If the specified transmission map does not exits.
+        ValueError
+            If the specified star mode does not exist.
         """
 
         image_size = 50
         map_selection = 'tm3'
 
+        bl = self.data.inst['bl']
         if index is None:
             radius_s = self.data.single['radius_s']
             distance_s = self.data.single['distance_s']
             temp_s = self.data.single['temp_s']
+        elif np.ndim(index) == 0:
+            radius_s = self.data.star_column('radius_s', index)
+            distance_s = self.data.star_column('distance_s', index)
+            temp_s = self.data.star_column('temp_s', index)
         else:
-            radius_s = self.data.catalog.radius_s.iloc[index]
-            distance_s = self.data.catalog.distance_s.iloc[index]
-            temp_s = self.data.catalog.temp_s.iloc[index]
+            # for multiple stars, place the stars on a leading axis in front of the wl_bins
+            radius_s = self.data.star_column('radius_s', index).reshape((-1, 1))
+            distance_s = self.data.star_column('distance_s', index).reshape((-1, 1))
+            temp_s = self.data.star_column('temp_s', index).reshape((-1, 1))
+            if np.ndim(bl) > 0:
+                bl = np.reshape(bl, (-1, 1))
 
         # check if the specified map exists
         if map_selection not in ['tm1', 'tm2', 'tm3', 'tm4']:
@@ -86,31 +109,47 @@ class PhotonNoiseStar(PhotonNoiseModule):
         # convert units
         Rs_au = 0.00465047 * radius_s
         Rs_as = Rs_au / distance_s
-        Rs_mas = float(Rs_as)
-        Rs_rad = Rs_mas / (3600. * 180.) * np.pi
-
-        # TODO Instead of recalculating the transmission map for the stellar radius here, one could try
-        #   to reuse the inner part of the transmission map already calculated in the get_snr function
-        #   of the instrument class
-        # TODO: why are we not reusing the maps calculated in the instrument class
-        tm_star = self.run_socket(method='transmission_map',
-                                  s_name='transmission_star',
-                                  map_selection=[map_selection],
-                                  hfov=Rs_rad,
-                                  image_size=image_size)[int(map_selection[-1]) - 1]
-
-        x_map = np.tile(np.array(range(0, image_size)), (image_size, 1))
-        y_map = x_map.T
-        r_square_map = (x_map - (image_size - 1) / 2) ** 2 + (y_map - (image_size - 1) / 2) ** 2
-        star_px = np.where(r_square_map < (image_size / 2) ** 2, 1, 0)
+        Rs_rad = Rs_as / (3600. * 180.) * np.pi
+
+        if self.data.options.other['star_mode'] == 'analytic':
+            t_avg = disk_transmission(k=np.pi * bl * Rs_rad / self.data.inst['wl_bins'])
+        elif self.data.options.other['star_mode'] == 'map':
+            # create the pixel grid spanning the stellar disk in [rad], for multiple stars the
+            # grids are placed along a leading axis such that the maps have the shape
+            # (stars, wl_bins, image_size, image_size)
+            angle = np.linspace(-1, 1, image_size)
+            if np.ndim(Rs_rad) > 0:
+                Rs_rad = np.reshape(Rs_rad, (-1, 1, 1, 1))
+            alpha = np.tile(angle, (image_size, 1)) * Rs_rad
+            beta = np.tile(angle, (image_size, 1)).T * Rs_rad
+
+            # TODO Instead of recalculating the transmission map for the stellar radius here, one
+            #   could try to reuse the inner part of the transmission map already calculated in the
+            #   get_snr function of the instrument class
+            # TODO: why are we not reusing the maps calculated in the instrument class
+            tm_star = self.run_socket(method='transmission_map',
+                                      s_name='transmission_star',
+                                      map_selection=[map_selection],
+                                      direct_mode=True,
+                                      d_alpha=alpha,
+                                      d_beta=beta)[int(map_selection[-1]) - 1]
+
+            x_map = np.tile(np.array(range(0, image_size)), (image_size, 1))
+            y_map = x_map.T
+            r_square_map = ((x_map - (image_size - 1) / 2) ** 2
+                            + (y_map - (image_size - 1) / 2) ** 2)
+            star_px = np.where(r_square_map < (image_size / 2) ** 2, 1, 0)
+
+            t_avg = (star_px * tm_star).sum(axis=(-2, -1)) / star_px.sum()
+        else:
+            raise ValueError('Specified star mode does not exist')
 
         # get the stellar leakage
-        sl_leak = (star_px * tm_star).sum(axis=(-2, -1)) / star_px.sum(
-        ) * black_body(bins=self.data.inst['wl_bins'],
-                       width=self.data.inst['wl_bin_widths'],
-                       temp=temp_s,
-                       radius=radius_s,
-                       distance=distance_s,
-                       mode='star') * self.data.inst['telescope_area']
+        sl_leak = t_avg * black_body(bins=self.data.inst['wl_bins'],
+                                     width=self.data.inst['wl_bin_widths'],
+                                     temp=temp_s,
+                                     radius=radius_s,
+                                     distance=distance_s,
+                                     mode='star') * self.data.inst['telescope_area']
 
         return sl_leak
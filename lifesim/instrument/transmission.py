@@ -1,13 +1,311 @@
 import numpy as np
+from collections import OrderedDict
+from fractions import Fraction
+from math import comb, factorial
 from typing import Union
+from scipy.special import j0, j1, jv
 
 from lifesim.core.modules import TransmissionModule
 
 
+def _bessel_series(terms: tuple,
+                   n_terms: int = 10):
+    """
+    Calculates the coefficients of the power series in u^2 and v^2 of a sum of Bessel functions
+    of the form sum(w * J0(sqrt(a * u^2 + b * v^2))).
+
+    Parameters
+    ----------
+    terms : tuple
+        Tuple of integer triples (w, a, b) specifying the weight and the argument of every Bessel
+        function in the sum.
+    n_terms : int
+        Highest order of the series in u^2 and v^2 combined.
+
+    Returns
+    -------
+    coeff
+        Coefficients of the series without the constant term in the form used by
+        `np.polynomial.polynomial.polyval2d`, i.e. coeff[i, j] belongs to u^(2i) * v^(2j).
+    """
+
+    coeff = np.zeros((n_terms + 1, n_terms + 1))
+    for k in range(1, n_terms + 1):
+        for i in range(k + 1):
+            # the sum over the weights is an exact integer, such that terms cancelling each other
+            # result in exact zeros
+            c = sum([w * a ** i * b ** (k - i) for (w, a, b) in terms])
+            coeff[i, k - i] = (-1) ** k * comb(k, i) * c / (4 ** k * factorial(k) ** 2)
+    return coeff
+
+
+def _bessel_u_series(const: int,
+                     terms: tuple,
+                     n_terms: int = 12):
+    """
+    Calculates the coefficients of the power series in u^2 of a sum of Bessel functions of the
+    form const + sum(w * J0(sqrt(a * u^2 + b * v^2))), where the dependence on v is kept exact.
+    The series follows from the expansion
+
+        J0(sqrt(x^2 + t)) = sum_k (-t / 2)^k / k! * J_k(x) / x^k,
+
+    such that the coefficient of u^(2k) is c_k + sum_b d_k,b * J_k(sqrt(b) v) / (sqrt(b) v)^k.
+
+    Parameters
+    ----------
+    const : int
+        Constant term.
+    terms : tuple
+        Tuple of integer triples (w, a, b) specifying the weight and the argument of every Bessel
+        function in the sum.
+    n_terms : int
+        Highest order of the series in u^2.
+
+    Returns
+    -------
+    coeff
+        Coefficients c_k of the terms independent of v, in the shape (n_terms + 1, ).
+    coeff_v
+        Coefficients d_k,b of the terms depending on v with b as key, each in the shape
+        (n_terms + 1, ).
+    """
+
+    # the sums over the weights are exact fractions, such that terms cancelling each other
+    # result in exact zeros
+    coeff = [Fraction(const)] + [Fraction(0)] * n_terms
+    coeff_v = {}
+    for (w, a, b) in terms:
+        for k in range(n_terms + 1):
+            if b == 0:
+                coeff[k] += Fraction(w * (-a) ** k, 4 ** k * factorial(k) ** 2)
+            else:
+                coeff_v.setdefault(b, [Fraction(0)] * (n_terms + 1))[k] += Fraction(
+                    w * (-a) ** k, 2 ** k * factorial(k))
+
+    return (np.array(coeff, dtype=float),
+            {b: np.array(c, dtype=float) for b, c in coeff_v.items()})
+
+
+def _bessel_ratios(n: int,
+                   x: np.ndarray):
+    """
+    Evaluates J_k(x) / x^k for all orders k up to n, where J_k is the Bessel function of the first
+    kind of order k. For x < 1, the power series is used, which is also valid at x = 0. Otherwise,
+    only the two highest orders are evaluated directly and the lower ones follow from the downward
+    recurrence J_(k-1)(x) = 2k / x * J_k(x) - J_(k+1)(x), which is stable.
+
+    Returns
+    -------
+    ratios
+        Values in the shape (n + 1, ) + x.shape.
+    """
+
+    ratios = np.empty((n + 1, ) + x.shape)
+    small = x < 1
+    y = -x[small] ** 2 / 4
+    for k in range(n + 1):
+        ratios[k][small] = np.polynomial.polynomial.polyval(
+            y, [1 / (factorial(m) * factorial(m + k) * 2 ** k) for m in range(12)])
+
+    x_large = x[~small]
+    j_next, j_k = jv(n, x_large), jv(n - 1, x_large)
+    ratios[n][~small] = j_next / x_large ** n
+    for k in range(n - 1, -1, -1):
+        ratios[k][~small] = j_k / x_large ** k
+        j_next, j_k = j_k, 2 * k / x_large * j_k - j_next
+
+    return ratios
+
+
+# Bessel function terms (w, a, b) of the azimuthal averages of tm_chop^2 and tm4^2 (see
+# TransmissionMap.transmission_efficiency) together with the constant term and the normalization
+_CHOP_TERMS = ((-4, 4, 0), (1, 16, 0), (-3, 0, 16), (4, 4, 16), (-1, 16, 16))
+_TM4_TERMS = ((-12, 4, 0), (3, 16, 0), (-3, 0, 16), (4, 4, 16), (-1, 16, 16))
+_CHOP_SERIES = _bessel_series(_CHOP_TERMS)
+_TM4_SERIES = _bessel_series(_TM4_TERMS)
+_CHOP_U_SERIES = _bessel_u_series(const=3, terms=_CHOP_TERMS)
+_TM4_U_SERIES = _bessel_u_series(const=9, terms=_TM4_TERMS)
+
+# below this phase along the nulling baseline, the closed form loses precision to the
+# cancellation of the Bessel functions and the series in u^2 is used
+_U_SERIES_MAX = 0.5
+
+
+def _mean_square(u: np.ndarray,
+                 v: np.ndarray,
+                 const: int,
+                 terms: tuple,
+                 series: np.ndarray,
+                 u_series: tuple,
+                 norm: int):
+    """
+    Evaluates (const + sum(w * J0(sqrt(a * u^2 + b * v^2)))) / norm. The sum vanishes with u^4,
+    such that the Bessel functions cancel each other for small u. There, the power series in u^2
+    is used instead, and the power series in u^2 and v^2 if v is small as well.
+
+    Parameters
+    ----------
+    u : np.ndarray
+        Phase of the transmission pattern along the nulling baseline.
+    v : np.ndarray
+        Phase of the transmission pattern along the imaging baseline, same shape as `u`.
+    const : int
+        Constant term.
+    terms : tuple
+        Tuple of integer triples (w, a, b) specifying the weight and the argument of every Bessel
+        function in the sum.
+    series : np.ndarray
+        Power series coefficients of the sum as returned by `_bessel_series`.
+    u_series : tuple
+        Power series coefficients of the sum in u^2 as returned by `_bessel_u_series`.
+    norm : int
+        Normalization of the sum.
+
+    Returns
+    -------
+    mean_square
+        Value of the sum in the shape of `u`.
+    """
+
+    mean_square = const + sum([w * j0(np.sqrt(a * u ** 2 + b * v ** 2)) for (w, a, b) in terms])
+
+    # the terms of the series in u^2 are bounded by (4 u^2)^k / k!^2, such that the series
+    # converges to machine precision within the first twelve terms for u below 0.5. The orders
+    # zero and one vanish exactly. Above, the closed form has a relative error of about
+    # 1e-15 / u^4
+    small_u = u < _U_SERIES_MAX
+    if np.any(small_u):
+        coeff, coeff_v = u_series
+        u_small, v_small = u[small_u], v[small_u]
+        ratios = {b: _bessel_ratios(coeff.shape[0] - 1, np.sqrt(b) * v_small) for b in coeff_v}
+        mean_u = np.zeros_like(u_small)
+        for k in range(coeff.shape[0] - 1, 1, -1):
+            c_k = coeff[k] + sum([d[k] * ratios[b][k] for b, d in coeff_v.items()])
+            mean_u = (mean_u + c_k) * u_small ** 2
+        mean_square = np.where(small_u, 0., mean_square)
+        mean_square[small_u] = mean_u * u_small ** 2
+
+    # the argument of all Bessel functions is below 1 here and the series converges to machine
+    # precision within the first ten terms
+    small = 16 * (u ** 2 + v ** 2) < 1
+    if np.any(small):
+        mean_square = np.where(small, 0., mean_square)
+        mean_square[small] = np.polynomial.polynomial.polyval2d(u[small] ** 2,
+                                                                v[small] ** 2,
+                                                                series)
+
+    return mean_square / norm
+
+
+# power series of 1 - J1(2k) / k in k^2
+_DISK_SERIES = np.array([0.] + [(-1) ** (m + 1) / (factorial(m) * factorial(m + 1))
+                                for m in range(1, 11)])
+
+
+def disk_transmission(k: Union[float, np.ndarray]):
+    """
+    Calculates the transmission of the TM3 mode averaged over a uniformly bright disk centered on
+    the optical axis. The modulation along the imaging baseline averages out, such that the result
+    only depends on the nulling baseline.
+
+    Parameters
+    ----------
+    k : Union[float, np.ndarray]
+        Dimensionless size of the disk given by pi * bl * radius / wl, where bl is the length of
+        the nulling baseline in [m], radius the angular radius of the disk in [rad] and wl the
+        wavelength in [m].
+
+    Returns
+    -------
+    transm
+        Mean transmission over the disk, (1 - J1(2k) / k) / 4, where J1 is the Bessel function of
+        the first kind of order one. For k < 0.5, the power series is used to avoid the
+        cancellation of the leading terms.
+    """
+
+    k = np.asarray(k, dtype=float)
+    small = k < 0.5
+    transm = (1 - j1(2 * k) / np.where(small, 1., k)) / 4
+    return np.where(small,
+                    np.polynomial.polynomial.polyval(k ** 2, _DISK_SERIES) / 4,
+                    transm)
+
+
+def _array_memory(array: np.ndarray):
+    """
+    Returns the memory occupied by an array in [byte], counting broadcast axes only once.
+    """
+
+    return int(np.prod([n for n, stride in zip(array.shape, array.strides) if stride != 0])
+               * array.itemsize)
+
+
+def _cache_entry_memory(entry: dict):
+    """
+    Returns the memory occupied by an entry of the transmission map cache in [byte].
+    """
+
+    arrays = [tm for tm in entry['maps'] + tuple(entry['profiles']) if tm is not None]
+    return sum([_array_memory(array) for array in arrays])
+
+
 class TransmissionMap(TransmissionModule):
+    """
+    Transmission maps of the double Bracewell nulling interferometer.
+
+    Attributes
+    ----------
+    cache : OrderedDict
+        Least recently used cache of the transmission maps of a single baseline on the detector
+        grid and of the radial transmission profiles derived from them. The total memory of the
+        cache is limited by `data.options.other['cache_memory']`.
+    cache_hits : int
+        Number of transmission maps that were taken from the cache.
+    cache_misses : int
+        Number of transmission maps that were calculated and added to the cache.
+    """
+
     def __init__(self,
                  name: str):
         super().__init__(name)
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def clear_cache(self):
+        """
+        Removes all entries from the transmission map cache and resets the hit and miss counters.
+        """
+
+        self.cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def cache_add(self,
+                  key: tuple,
+                  maps: tuple):
+        """
+        Adds transmission maps to the cache and evicts the least recently used entries until the
+        memory of the cache is below `data.options.other['cache_memory']`.
+
+        Parameters
+        ----------
+        key : tuple
+            Key under which the maps are cached.
+        maps : tuple
+            Transmission maps as returned by `transmission_map`.
+        """
+
+        for tm in maps:
+            if tm is not None:
+                tm.flags.writeable = False
+        self.cache[key] = {'maps': maps,
+                           'profiles': [None] * len(maps)}
+
+        while ((sum([_cache_entry_memory(entry) for entry in self.cache.values()])
+                > self.data.options.other['cache_memory'] * 1e9)
+               and self.cache):
+            self.cache.popitem(last=False)
 
     def transmission_map(self,
                          map_selection: list,
@@ -60,6 +358,29 @@ class TransmissionMap(TransmissionModule):
             Transmission map from fourth mode
         tm_chop
             The chopped transmission map calculated by subtracting tm4 from tm3
+
+        Notes
+        -----
+        If `data.inst['bl']` holds an array of baselines, all maps are returned with an additional
+        leading axis running over the baselines, e.g. in the shape (baselines, wl_bins,
+        image_size, image_size).
+
+        If the half field of view is proportional to the wavelength, as is the case for the
+        default `data.inst['hfov']`, the map is identical in all spectral bins. It is then only
+        calculated once and returned as a read-only view (with zero stride along the wavelength
+        axis) of the full shape.
+
+        Maps of a single baseline on the detector grid (i.e. not in direct mode) are cached,
+        keyed by the baseline, the baseline ratio, the image size, the wavelength bins, the half
+        field of view and the map selection. Cached maps are returned read-only. If
+        `data.options.other['bl_quantization']` is larger than zero, the baseline is rounded to
+        a multiple of it before the maps are calculated. The baseline then deviates by at most
+        bl_quantization / 2, which only affects the noise sources calculated from the maps (the
+        transmission efficiency of the planets uses the exact baseline). In tests on simulated
+        catalogs, the relative change of the signal-to-noise ratio of every planet stayed below
+        bl_quantization / (2 * bl), e.g. 0.5% for a step of 0.1 m and baselines of 10 m or
+        longer. A step of 0.1 m is therefore recommended if the cache is to be shared by stars
+        with similar baselines.
         """
 
         if hfov is None:
@@ -67,11 +388,34 @@ class TransmissionMap(TransmissionModule):
         if image_size is None:
             image_size = self.data.options.other['image_size']
 
+        # maps of a single baseline on the detector grid are taken from the cache if possible
+        bl = self.data.inst['bl']
+        cache_key = None
+        if ((not direct_mode)
+                and (np.ndim(bl) == 0)
+                and (self.data.options.other['cache_memory'] > 0)):
+            if self.data.options.other['bl_quantization'] > 0:
+                bl = (np.round(bl / self.data.options.other['bl_quantization'])
+                      * self.data.options.other['bl_quantization'])
+            cache_key = (float(bl),
+                         self.data.options.array['ratio'],
+                         image_size,
+                         np.asarray(self.data.inst['wl_bins'], dtype=float).tobytes(),
+                         np.asarray(hfov, dtype=float).tobytes(),
+                         tuple([tm for tm in ['tm1', 'tm2', 'tm3', 'tm4', 'tm_chop']
+                                if tm in map_selection]))
+            if cache_key in self.cache:
+                self.cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                return self.cache[cache_key]['maps']
+            self.cache_misses += 1
+
         # reshape the wl_bins and hfov arrays for calculation (to (n, 1, 1))
         wl_bins = np.array([self.data.inst['wl_bins']])  # wavelength in m
         if wl_bins.shape[-1] > 1:
             wl_bins = np.reshape(wl_bins, (wl_bins.shape[-1], 1, 1))
 
+        wl_invariant = False
         if direct_mode:
             alpha = d_alpha
             beta = d_beta
@@ -89,12 +433,27 @@ class TransmissionMap(TransmissionModule):
             # angle matrix in y-direction ("beta")
             beta = alpha.T
 
+            # if the field of view scales with the wavelength (hfov = wl / (2 * D)), the phase
+            # L * alpha / wl is the same in every spectral bin and only a single map needs to be
+            # calculated
+            fov_per_wl = hfov / wl_bins
+            wl_invariant = ((hfov.size == wl_bins.size)
+                            and np.allclose(fov_per_wl, fov_per_wl.flat[0], rtol=1e-12, atol=0))
+            if wl_invariant:
+                map_shape = (wl_bins.shape[0], image_size, image_size)
+                hfov = fov_per_wl.flat[0]
+                wl_bins = 1.
+
             # convert angle matrices to fov units
             alpha = alpha * hfov
             beta = beta * hfov
 
-        # smaller distance of apertures from center line
-        L = self.data.inst['bl'] / 2
+        # smaller distance of apertures from center line. If the baseline is given as an array
+        # (one baseline per star or planet), the individual baselines are placed along a leading
+        # axis of the returned maps
+        L = bl / 2
+        if np.ndim(L) > 0:
+            L = np.reshape(L, (-1, 1, 1, 1))
 
         tm1, tm2, tm3, tm4, tm_chop = None, None, None, None, None
 
@@ -131,48 +490,158 @@ class TransmissionMap(TransmissionModule):
                     # chopped transm. map
                     4 * self.data.options.array['ratio'] * np.pi * L * beta / wl_bins)
 
+        # hand out the wavelength invariant maps as read-only views spanning all spectral bins
+        if wl_invariant:
+            map_shape = np.broadcast_shapes(np.shape(L), map_shape)
+            tm1, tm2, tm3, tm4, tm_chop = [None if tm is None else np.broadcast_to(tm, map_shape)
+                                           for tm in (tm1, tm2, tm3, tm4, tm_chop)]
+
+        if cache_key is not None:
+            self.cache_add(key=cache_key,
+                           maps=(tm1, tm2, tm3, tm4, tm_chop))
+
         return tm1, tm2, tm3, tm4, tm_chop
 
+    def transmission_profile(self,
+                             t_map: np.ndarray):
+        """
+        Sums a transmission map over the rings of pixels defined in `data.inst['ring_pixels']`
+        and `data.inst['ring_starts']`, resulting in a radial transmission profile.
+
+        Parameters
+        ----------
+        t_map : np.ndarray
+            Transmission map in the shape (..., wl_bins, image_size, image_size).
+
+        Returns
+        -------
+        t_profile
+            Summed transmission of all pixels in a ring in the shape (..., wl_bins, 1, rings).
+            For a map that is the same in all spectral bins, the profile is only calculated once
+            and returned with a single spectral bin. If `t_map` was taken from the cache of
+            `transmission_map`, the profile is cached along with it.
+        """
+
+        # the profile is usually requested for the map that was calculated or taken from the
+        # cache most recently
+        entry, position = None, None
+        if self.cache:
+            entry = self.cache[next(reversed(self.cache))]
+            position = next((i for i, tm in enumerate(entry['maps']) if tm is t_map), None)
+            if position is not None and entry['profiles'][position] is not None:
+                return entry['profiles'][position]
+
+        # a wavelength invariant map only needs to be integrated in a single spectral bin
+        if t_map.strides[-3] == 0:
+            t_map = t_map[..., :1, :, :]
+
+        t_flat = np.reshape(t_map, t_map.shape[:-2] + (-1, ))
+        t_profile = np.add.reduceat(t_flat[..., self.data.inst['ring_pixels']],
+                                    self.data.inst['ring_starts'],
+                                    axis=-1)[..., np.newaxis, :]
+
+        if position is not None:
+            t_profile.flags.writeable = False
+            entry['profiles'][position] = t_profile
+
+        return t_profile
+
     def transmission_efficiency(self,
-                                index: Union[int, None]):
+                                index: Union[int, np.ndarray, None],
+                                analytic: bool = True,
+                                angsep: Union[float, np.ndarray, None] = None):
         """
         Integrates over transmission curves to get the transmission efficiency for signal and noise
 
         Parameters
         ----------
-        bl : float
-            Length of the shorter, nulling baseline in [m]
-        wl_bins : np.ndarray
-            Central values of the spectral bins in the wavelength regime in [m]
-        angsep : float
-            Angular separation between the observed star and the observed exoplanet in [arcsec]
-        ratio : float
-            Ratio between the nulling and the imaging baseline. E.g. if the imaging baseline is
-            twice as long as the nulling baseline, the ratio will be 2
+        index : Union[int, np.ndarray, None]
+            Integer row position of the planet in the catalog. If an array of row positions is
+            given, the efficiencies of all planets are calculated at once and returned in the
+            shape (planets, wl_bins). If `None` is given, the angular separation in
+            `data.single` is used.
+        analytic : bool
+            If set to True, the azimuthal averages are evaluated in closed form using Bessel
+            functions. If set to False, the transmission curves are sampled in 360 azimuthal steps
+            and averaged numerically
+        angsep : Union[float, np.ndarray, None]
+            Angular separation between the observed star and the observed exoplanet in [arcsec].
+            If given, it is used instead of the angular separation of the planets at `index`. For
+            an array of angular separations, `data.inst['bl']` needs to hold a single baseline or
+            one baseline per angular separation.
 
         Returns
         -------
         transm_eff
             Transmission efficiency per spectral bin for the exoplanet signal
         transm_noise
-            Transmission efficiency per spectral bin for the photon noise received from the exoplanet
-            signal
+            Transmission efficiency per spectral bin for the photon noise received from the
+            exoplanet signal
+
+        Notes
+        -----
+        With the nulling baseline L in `data.inst['bl']`, the ratio between the imaging and the
+        nulling baseline in `options.array['ratio']` and the phases u = 2 pi L angsep / wl and
+        v = ratio * u, the mean squares of the chopped transmission and of tm4 over a full rotation
+        of the array are
+
+            <tm_chop^2> = (3 - 4 J0(2u) + J0(4u) - 3 J0(4v) + 4 J0(sqrt(4u^2 + 16v^2))
+                           - J0(sqrt(16u^2 + 16v^2))) / 16
+            <tm4^2> = (9 - 12 J0(2u) + 3 J0(4u) - 3 J0(4v) + 4 J0(sqrt(4u^2 + 16v^2))
+                       - J0(sqrt(16u^2 + 16v^2))) / 64
+
+        where J0 is the Bessel function of the first kind of order zero. Both expressions vanish
+        with u^4 close to the null, where the Bessel functions cancel each other. For u below 0.5
+        they are therefore evaluated as power series in u^2 (and in v^2 for arguments of J0 below
+        1), such that the relative error stays below 1e-13 for all separations. The sampled
+        average agrees with these expressions to machine precision as long as the arguments of J0
+        are small compared to the number of azimuthal steps. For larger separations the sampled
+        average is affected by aliasing.
         """
 
-        if index is None:
+        if angsep is not None:
+            pass
+        elif index is None:
             angsep = self.data.single['angsep']
-        else:
+        elif np.ndim(index) == 0:
             angsep = self.data.catalog.angsep.iloc[index]
+        else:
+            angsep = self.data.catalog.angsep.to_numpy()[index]
+
+        if not analytic:
+            tc_chop, tc_tm4 = self.transmission_curve(angsep=angsep)
+
+            # integrate over angles to get transmission efficiency
+            transm_eff = np.sqrt((tc_chop ** 2).mean(axis=(-2, -1)))
+            transm_noise = np.sqrt((tc_tm4 ** 2).mean(axis=(-2, -1)))
+            return transm_eff, transm_noise
 
-        tc_chop, tc_tm4 = self.transmission_curve(angsep=angsep)
+        # convert angular separation to radians, multiple planets are placed along the first axis
+        angsep_rad = angsep / (3600 * 180) * np.pi
+        if np.ndim(angsep_rad) > 0:
+            angsep_rad = np.reshape(angsep_rad, (-1, 1))
 
-        # integrate over angles to get transmission efficiency
-        transm_eff = np.sqrt((tc_chop ** 2).mean(axis=(-2, -1)))
-        transm_noise = np.sqrt((tc_tm4 ** 2).mean(axis=(-2, -1)))
+        L = self.data.inst['bl'] / 2
+        if np.ndim(L) > 0:
+            L = np.reshape(L, (-1, 1))
+
+        # phases of the transmission pattern in the direction of the nulling and imaging baseline
+        u = 2 * np.pi * L * angsep_rad / self.data.inst['wl_bins']
+        u, v = np.broadcast_arrays(u, self.data.options.array['ratio'] * u)
+        u, v = np.atleast_1d(u, v)
+
+        # azimuthal averages of tm_chop^2 = sin^4(u cos(phi)) * sin^2(2 v sin(phi)) and
+        # tm4^2 = sin^4(u cos(phi)) * cos^4(v sin(phi) + pi / 4)
+        transm_eff = np.sqrt(_mean_square(u=u, v=v, const=3, terms=_CHOP_TERMS,
+                                          series=_CHOP_SERIES, u_series=_CHOP_U_SERIES,
+                                          norm=16))
+        transm_noise = np.sqrt(_mean_square(u=u, v=v, const=9, terms=_TM4_TERMS,
+                                            series=_TM4_SERIES, u_series=_TM4_U_SERIES,
+                                            norm=64))
         return transm_eff, transm_noise
 
     def transmission_curve(self,
-                           angsep: float,
+                           angsep: Union[float, np.ndarray],
                            phi_n: int = 360):
         """
         Calculates the radial transmission curve of the LIFE array
@@ -183,7 +652,7 @@ class TransmissionMap(TransmissionModule):
             Length of the shorter, nulling baseline in [m]
         wl_bins : np.ndarray
             Central values of the spectral bins in the wavelength regime in [m]
-        angsep : float
+        angsep : Union[float, np.ndarray]
             Angular separation between the observed star and the observed exoplanet in [arcsec]
         phi_n : int
             Number of rotation steps used in integration
@@ -202,6 +671,11 @@ class TransmissionMap(TransmissionModule):
         # convert angular separation to radians
         angsep_rad = angsep / (3600 * 180) * np.pi
 
+        # for multiple angular separations, move the planets to a leading axis such that the
+        # curves are returned in the shape (planets, wl_bins, 1, phi_n)
+        if np.ndim(angsep_rad) > 0:
+            angsep_rad = np.reshape(angsep_rad, (-1, 1, 1, 1))
+
         # create 1D array with azimuthal coordinates
         phi_lin = np.linspace(0, 2 * np.pi, phi_n, endpoint=False)
 
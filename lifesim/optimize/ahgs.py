@@ -1,91 +1,234 @@
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+from typing import Union
+
 import numpy as np
+from tqdm import tqdm
 
 from lifesim.core.modules import SlopeModule
 
+# state of the planets used by the aHGS algorithm, held in data.optm while the observation time is
+# distributed
+AHGS_STATE = ['detected', 'snr_current', 'int_time', 't_slew', 't_detected']
+
+
 class AhgsModule(SlopeModule):
+    """
+    Distributes the observation time with the aHGS algorithm. During the distribution, the state
+    of the planets is held in arrays in `data.optm` in which the planets are sorted by their host
+    star, such that the planets of the i-th star of the star index are located in the slice
+    ``offsets[i]:offsets[i + 1]``. The state is written to the catalog once the distribution is
+    finished.
+
+    Since the algorithm is greedy, the observations of a shorter search phase are the beginning of
+    the observations of a longer one. The time at which every planet is detected is therefore
+    recorded, from which the yield of any shorter search phase follows (see `yield_curve`).
+    """
+
     def __init__(self,
                  name: str):
         super().__init__(name=name)
 
-    def obs_array_star(self, nstar):
-        mask = self.data.catalog.nstar == nstar
+    def obs_array_star(self,
+                       star: int):
+        """
+        Calculates the observation time per newly detected planet for the observation of a star,
+        given for the detection of its one, two, three, ... easiest planets.
 
-        if not bool(np.isin(element=self.data.catalog.stype.loc[mask].iloc[0],
+        Parameters
+        ----------
+        star : int
+            Position of the star in the star index of the catalog.
+
+        Returns
+        -------
+        obs : np.ndarray
+            Observation time per detected planet in [s].
+        """
+
+        if not bool(np.isin(element=self.data.optm['stype'][star],
                             test_elements=self.data.options.optimization['limit'][0][np.invert(
                                 self.data.optm['hit_limit'])])):
             return np.array((np.inf, np.inf))
         else:
+            rows = slice(self.data.optm['offsets'][star], self.data.optm['offsets'][star + 1])
             if self.data.options.optimization['habitable']:
-                mask = np.logical_and.reduce((mask,
-                                              self.data.catalog.habitable,
-                                              np.invert(self.data.catalog.detected)))
+                mask = np.logical_and(self.data.optm['habitable'][rows],
+                                      np.invert(self.data.optm['detected'][rows]))
             else:
-                mask = np.logical_and(mask, np.invert(self.data.catalog.detected))
+                mask = np.invert(self.data.optm['detected'][rows])
             obs = (60 * 60 *
                    (self.data.options.optimization['snr_target'] ** 2
-                    - self.data.catalog['snr_current'].loc[mask] ** 2)
-                   / self.data.catalog.snr_1h.loc[mask] ** 2)
-            obs -= self.data.catalog.t_slew.loc[mask]
-            obs = np.sort(obs) / np.arange(1, np.count_nonzero(mask) + 1, 1)
+                    - self.data.optm['snr_current'][rows][mask] ** 2)
+                   / self.data.optm['snr_1h'][rows][mask] ** 2)
+            obs -= self.data.optm['t_slew'][rows][mask]
+            obs = np.sort(obs) / np.arange(1, obs.shape[0] + 1, 1)
             return obs
 
     def observe_star(self,
-                     nstar,
-                     int_time,
-                     delete=False):
-        mask = self.data.catalog.nstar == nstar
-
-        if not delete:
-            self.data.optm['tot_time'] += int_time
-
-            slew_time = self.data.catalog.loc[mask, 't_slew'].iloc[0]
-            if not (slew_time == 0):
-                if (slew_time + int_time) < 0:
-                    self.data.catalog.loc[mask, 't_slew'] += int_time
-                    int_actual = 0
-                else:
-                    self.data.catalog.loc[mask, 't_slew'] = 0
-                    self.data.catalog.loc[mask, 'int_time'] += (slew_time + int_time)
-                    int_actual = slew_time + int_time
+                     star: int,
+                     int_time: float):
+        """
+        Observes all planets of a star for the given time, the slew time is subtracted from the
+        first observation of the star.
+
+        Parameters
+        ----------
+        star : int
+            Position of the star in the star index of the catalog.
+        int_time : float
+            Observation time in [s].
+        """
+
+        rows = slice(self.data.optm['offsets'][star], self.data.optm['offsets'][star + 1])
+
+        # time needed by the planets to reach the target SNR from the start of the observation
+        t_start = self.data.optm['tot_time']
+        t_need = (60 * 60 *
+                  (self.data.options.optimization['snr_target'] ** 2
+                   - self.data.optm['snr_current'][rows] ** 2)
+                  / self.data.optm['snr_1h'][rows] ** 2
+                  - self.data.optm['t_slew'][rows])
+
+        self.data.optm['tot_time'] += int_time
+
+        slew_time = self.data.optm['t_slew'][rows.start]
+        if not (slew_time == 0):
+            if (slew_time + int_time) < 0:
+                self.data.optm['t_slew'][rows] += int_time
+                int_actual = 0
             else:
-                self.data.catalog.loc[mask, 'int_time'] += int_time
-                int_actual = int_time
-
-            self.data.catalog.loc[mask, 'snr_current'] = np.sqrt(
-                self.data.catalog.loc[mask, 'snr_current'] ** 2
-                + (self.data.catalog.loc[mask, 'snr_1h']
-                   * np.sqrt(int_actual
-                             / (60 * 60)))**2)
-
-            for _, i in enumerate(np.where(mask)[0]):
-                if (not self.data.catalog.detected.iloc[i]) and \
-                        (self.data.catalog.snr_current.iloc[i]
-                         >= self.data.options.optimization['snr_target']):
-                    self.data.catalog.detected.iat[i] = True
-                    if self.data.catalog.habitable.iloc[i]:
-                        self.data.optm['sum_detected'][np.where(
-                            self.data.options.optimization['limit'][0][:]
-                            == self.data.catalog.stype.iloc[i])] += 1
+                self.data.optm['t_slew'][rows] = 0
+                self.data.optm['int_time'][rows] += (slew_time + int_time)
+                int_actual = slew_time + int_time
         else:
-            pass
-            # self.planets.slew_time[mask_star] = -self.t_slew
-            # self.planets.int_time[mask_star] = 0
-            # self.planets.SNR_prediction_sum[mask_star] = 0
-            # for _, i in enumerate(np.where(mask_star)[0]):
-            #     if self.planets.detected[i] and self.planets.habitable[i]:
-            #         self.sum_detected[np.where(self.limits[0][:] == self.planets.Stype[i])] \
-            #             -= 1
-            # self.planets.detected[mask_star] = 0
+            self.data.optm['int_time'][rows] += int_time
+            int_actual = int_time
 
-    def distribute_time(self):
-        stars, n = np.unique(ar=self.data.catalog.nstar,
-                             return_counts=True)
-        obs = np.zeros((stars.shape[0], np.max(n))) + np.inf
+        self.data.optm['snr_current'][rows] = np.sqrt(
+            self.data.optm['snr_current'][rows] ** 2
+            + (self.data.optm['snr_1h'][rows]
+               * np.sqrt(int_actual
+                         / (60 * 60))) ** 2)
+
+        new = np.logical_and(np.invert(self.data.optm['detected'][rows]),
+                             self.data.optm['snr_current'][rows]
+                             >= self.data.options.optimization['snr_target'])
+        self.data.optm['detected'][rows] |= new
+        self.data.optm['t_detected'][rows][new] = t_start + np.clip(t_need[new], 0, int_time)
+        self.data.optm['sum_detected'][np.where(
+            self.data.options.optimization['limit'][0][:]
+            == self.data.optm['stype'][star])] += np.count_nonzero(
+            np.logical_and(new, self.data.optm['habitable'][rows]))
+
+    def best_slope(self,
+                   star: int):
+        """
+        Returns the entry of a star in the priority queue of `distribute_time`, consisting of the
+        lowest observation time per detected planet, the position of the star and the number of
+        planets minus one that are detected at this observation time. On equal observation times,
+        the entries are ordered by the star and the number of planets.
+
+        Parameters
+        ----------
+        star : int
+            Position of the star in the star index of the catalog.
+
+        Returns
+        -------
+        entry : tuple
+            Entry of the star in the priority queue.
+        """
+
+        obs = self.obs_array_star(star=star)
+        if obs.shape[0] == 0:
+            return np.inf, star, 0
+        ind_t = int(np.argmin(obs))
+        return obs[ind_t], star, ind_t
 
-        # fill the observation time array
-        for i, nstar in enumerate(stars):
-            temp = self.obs_array_star(nstar=nstar)
-            obs[i, :temp.shape[0]] = temp
+    def yield_curve(self):
+        """
+        Returns the number of detected planets in the habitable zone per universe as function of the
+        duration of the search phase, given by the detection times of the planets in the catalog.
+
+        Returns
+        -------
+        curve : np.ndarray
+            Array of the shape (detections + 1, stellar types + 1). The first column contains the
+            duration of the search phase in [s] at which the planets are detected, starting at
+            zero. The other columns contain the cumulative number of detections per universe
+            around the stellar types in the order of `options.optimization['limit'][0]`.
+        """
+
+        rows = np.where(np.logical_and(self.data.catalog.detected.to_numpy(),
+                                       self.data.catalog.habitable.to_numpy()))[0]
+        rows = rows[np.argsort(self.data.catalog.t_detected.to_numpy()[rows], kind='stable')]
+
+        curve = np.zeros((rows.shape[0] + 1,
+                          self.data.options.optimization['limit'][0].shape[0] + 1))
+        curve[1:, 0] = (self.data.catalog.t_detected.to_numpy()[rows]
+                        / self.data.options.array['t_efficiency'])
+        curve[1:, 1:] = np.cumsum(self.data.star_column('stype', rows)[:, np.newaxis]
+                                  == self.data.options.optimization['limit'][0][np.newaxis, :],
+                                  axis=0) / self.data.optm['num_universe']
+
+        return curve
+
+    def prepare_state(self,
+                      rows: Union[np.ndarray, type(None)] = None):
+        """
+        Copies the properties of the planets needed by the aHGS algorithm to arrays in `data.optm`
+        sorted by their host star. The arrays only depend on the catalog and can be shared by
+        multiple runs of the algorithm.
+
+        Parameters
+        ----------
+        rows : Union[np.ndarray, type(None)]
+            Row positions of the planets in the catalog to which the observation time is
+            distributed, e.g. the planets of a single universe. If `None` is given, all planets
+            are used.
+        """
+
+        if rows is None:
+            self.data.catalog_star_index()
+            self.data.optm['order'] = self.data.star_index['order']
+            self.data.optm['offsets'] = self.data.star_index['offsets']
+        else:
+            # group the planets by star in the same way as the star index of the catalog
+            nstar = self.data.catalog.nstar.to_numpy()[rows]
+            sorter = np.argsort(nstar, kind='stable')
+            _, offsets = np.unique(nstar[sorter], return_index=True)
+            self.data.optm['order'] = rows[sorter]
+            self.data.optm['offsets'] = np.append(offsets, rows.shape[0])
+        self.data.optm['stype'] = self.data.star_column(
+            'stype', self.data.optm['order'][self.data.optm['offsets'][:-1]])
+        for _, key in enumerate(['snr_1h', 'habitable']):
+            self.data.optm[key] = self.data.catalog[key].to_numpy()[self.data.optm['order']]
+
+    def clear_state(self):
+        """
+        Removes the arrays created by `prepare_state` and the state of the planets from
+        `data.optm`.
+        """
+
+        for _, key in enumerate(AHGS_STATE + ['snr_1h', 'habitable', 'order', 'offsets',
+                                              'stype']):
+            self.data.optm.pop(key, None)
+
+    def allocate(self):
+        """
+        Runs the aHGS algorithm on the state of the planets in `data.optm` until the time of the
+        search phase is used up.
+        """
+
+        stars = self.data.optm['stype'].shape[0]
+
+        # the stars are kept in a priority queue sorted by their best slope. Instead of removing
+        # the outdated entry of an observed star, its version is increased and the entries of
+        # older versions are dropped when they reach the top of the queue
+        version = np.zeros(stars, dtype=int)
+        queue = [self.best_slope(star=i) + (0, ) for i in range(stars)]
+        heapq.heapify(queue)
 
         obs_time = (self.data.options.optimization['t_search']
                     * self.data.options.array['t_efficiency'])
@@ -94,28 +237,21 @@ class AhgsModule(SlopeModule):
 
         while tot_time < obs_time:
             # find the best global slope and observe star
-            no_star, ind_t = np.unravel_index(np.argmin(obs), obs.shape)
-            if (tot_time + obs[no_star, ind_t] * (ind_t + 1) + 0.01) > obs_time:
+            while queue[0][3] != version[queue[0][1]]:
+                heapq.heappop(queue)
+            obs, no_star, ind_t, _ = queue[0]
+
+            if (tot_time + obs * (ind_t + 1) + 0.01) > obs_time:
                 rem_time = obs_time - tot_time
-                self.observe_star(nstar=stars[no_star],
+                self.observe_star(star=no_star,
                                   int_time=rem_time)
                 tot_time += rem_time
-                # if False:
-                #     tot_time += rem_time
-                #     return rem_time
-                # else:
-                #     self.observe_star(nstar=stars[no_star],
-                #                       int_time=rem_time)
-                #     tot_time += rem_time
             else:
-                self.observe_star(nstar=stars[no_star],
-                                  int_time=obs[no_star, ind_t] * (ind_t + 1) + 0.01)
-                temp = self.obs_array_star(nstar=stars[no_star])
-                tot_time += obs[no_star, ind_t] * (ind_t + 1) + 0.01
-                obs[no_star, :] = np.inf
-                obs[no_star, :temp.shape[0]] = temp
-
-            print(self.data.optm['sum_detected'] / self.data.optm['num_universe'])
+                self.observe_star(star=no_star,
+                                  int_time=obs * (ind_t + 1) + 0.01)
+                tot_time += obs * (ind_t + 1) + 0.01
+                version[no_star] += 1
+                heapq.heappush(queue, self.best_slope(star=no_star) + (version[no_star], ))
 
             if np.any(
                     np.logical_and(
@@ -126,9 +262,198 @@ class AhgsModule(SlopeModule):
                 self.data.optm['hit_limit'] = ((self.data.optm['sum_detected']
                                                 / (self.data.optm['num_universe']))
                                                >= self.data.options.optimization['limit'][1][:])
-                obs = np.zeros((stars.shape[0], np.max(n))) + np.inf
 
-                # fill the observation time array
-                for i, nstar in enumerate(stars):
-                    temp = self.obs_array_star(nstar=nstar)
-                    obs[i, :temp.shape[0]] = temp
+                # rebuild the queue
+                version[:] = 0
+                queue = [self.best_slope(star=i) + (0, ) for i in range(stars)]
+                heapq.heapify(queue)
+
+    def distribute_time(self):
+        """
+        Distributes the time of the search phase over the stars, see `SlopeModule`.
+
+        Returns
+        -------
+        curve : np.ndarray
+            Number of detected planets in the habitable zone per universe as function of the
+            duration of the search phase (see `yield_curve`), also saved to
+            `data.optm['yield_curve']`. Up to the first time a detection limit is reached, it
+            equals the yield of a shorter search phase.
+        """
+
+        # the state of the planets is copied to arrays sorted by the host star
+        self.prepare_state()
+        for _, key in enumerate(AHGS_STATE):
+            self.data.optm[key] = self.data.catalog[key].to_numpy()[self.data.optm['order']]
+
+        self.allocate()
+
+        print(self.data.optm['sum_detected'] / self.data.optm['num_universe'])
+
+        # write the state of the planets to the catalog in a single step
+        for _, key in enumerate(AHGS_STATE):
+            values = self.data.catalog[key].to_numpy().copy()
+            values[self.data.optm['order']] = self.data.optm[key]
+            self.data.catalog[key] = values
+        self.clear_state()
+
+        self.data.optm['yield_curve'] = self.yield_curve()
+        return self.data.optm['yield_curve']
+
+    def distribute_scenario(self,
+                            scenario: dict):
+        """
+        Runs the aHGS algorithm for a scenario of options on the arrays created by
+        `prepare_state`, without changing the catalog or the options.
+
+        Parameters
+        ----------
+        scenario : dict
+            Options that differ from the ones in `data.options`, with the option name as key,
+            e.g. ``{'snr_target': 5}``.
+
+        Returns
+        -------
+        sum_detected : np.ndarray
+            Number of detected planets in the habitable zone around the stellar types in the order
+            of `options.optimization['limit'][0]` of the scenario.
+        stypes : np.ndarray
+            Stellar types in the order of `sum_detected`.
+        """
+
+        # the options are restored after the run
+        saved = {key: dict(getattr(self.data.options, key))
+                 for key in ('array', 'other', 'models', 'optimization')}
+        try:
+            self.data.options.set_manual(**scenario)
+
+            planets = self.data.optm['order'].shape[0]
+            self.data.optm['detected'] = np.zeros(planets, dtype=bool)
+            self.data.optm['snr_current'] = np.zeros(planets)
+            self.data.optm['int_time'] = np.zeros(planets)
+            self.data.optm['t_slew'] = np.full(planets, -self.data.options.array['t_slew'])
+            self.data.optm['t_detected'] = np.full(planets, np.inf)
+
+            self.data.optm['sum_detected'] = np.zeros(
+                self.data.options.optimization['limit'][0].shape[0])
+            self.data.optm['hit_limit'] = ((self.data.optm['sum_detected']
+                                            / (self.data.optm['num_universe']))
+                                           >= self.data.options.optimization['limit'][1][:])
+            self.data.optm['tot_time'] = 0
+
+            self.allocate()
+
+            return (self.data.optm['sum_detected'],
+                    np.array(self.data.options.optimization['limit'][0]))
+        finally:
+            for key, value in saved.items():
+                setattr(self.data.options, key, value)
+
+    def distribute_scenarios(self,
+                             scenarios: list,
+                             workers: int = 1):
+        """
+        Runs the aHGS algorithm for multiple scenarios of options, see `distribute_scenario`. The
+        properties of the planets sorted by star are prepared once and shared by all scenarios.
+
+        Parameters
+        ----------
+        scenarios : list
+            Scenarios given as dictionaries of options.
+        workers : int
+            Number of processes the scenarios are distributed over.
+
+        Returns
+        -------
+        results : list
+            Results of `distribute_scenario` in the order of `scenarios`.
+        """
+
+        self.prepare_state()
+        try:
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers,
+                                         initializer=_init_ahgs_worker,
+                                         initargs=(self,)) as executor:
+                    results = list(tqdm(executor.map(_run_ahgs_worker, scenarios),
+                                        total=len(scenarios)))
+            else:
+                results = [self.distribute_scenario(scenario=scenario)
+                           for scenario in tqdm(scenarios)]
+        finally:
+            self.clear_state()
+
+        return results
+
+    def distribute_universes(self,
+                             universes: list,
+                             workers: int = 1):
+        """
+        Runs the aHGS algorithm independently for every universe, i.e. the full time of the search
+        phase is distributed to the planets of each universe and the detection limits are applied
+        per universe. The catalog and the options are not changed.
+
+        Parameters
+        ----------
+        universes : list
+            Row positions of the planets of every universe in the catalog.
+        workers : int
+            Number of processes the universes are distributed over.
+
+        Returns
+        -------
+        results : list
+            Results of `distribute_scenario` for every universe in the order of `universes`.
+        """
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers,
+                                     initializer=_init_ahgs_worker,
+                                     initargs=(self,)) as executor:
+                results = list(tqdm(executor.map(_run_universe_worker, universes,
+                                                 chunksize=max(1, len(universes)
+                                                               // (4 * workers))),
+                                    total=len(universes)))
+        else:
+            results = [_run_universe(module=self, rows=rows) for rows in tqdm(universes)]
+
+        return results
+
+
+def _run_universe(module: AhgsModule,
+                  rows: np.ndarray):
+    """
+    Runs the aHGS algorithm for the planets of a single universe.
+    """
+    num_universe = module.data.optm.get('num_universe')
+    module.data.optm['num_universe'] = 1
+    module.prepare_state(rows=rows)
+    try:
+        return module.distribute_scenario(scenario={})
+    finally:
+        module.clear_state()
+        module.data.optm['num_universe'] = num_universe
+
+
+def _run_universe_worker(rows: np.ndarray):
+    """
+    Runs the aHGS algorithm for a single universe on the module of a worker process.
+    """
+    return _run_universe(module=_ahgs_worker_module,
+                         rows=rows)
+
+
+def _init_ahgs_worker(module: AhgsModule):
+    """
+    Initializes a worker process of `AhgsModule.distribute_scenarios` with a copy of the module
+    and the prepared arrays of the planets.
+    """
+    global _ahgs_worker_module
+    _ahgs_worker_module = module
+
+
+def _run_ahgs_worker(scenario: dict):
+    """
+    Runs `AhgsModule.distribute_scenario` on the module of a worker process.
+    """
+    return _ahgs_worker_module.distribute_scenario(scenario=scenario)
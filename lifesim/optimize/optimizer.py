@@ -1,6 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+
 import numpy as np
+import pandas as pd
 from tqdm import tqdm
 
+from lifesim.core.data import STYPE_KEY
 from lifesim.core.modules import OptimizationModule
 
 class Optimizer(OptimizationModule):
@@ -9,59 +14,143 @@ class Optimizer(OptimizationModule):
                  name: str):
         super().__init__(name=name)
 
+    def get_phase_batch_size(self):
+        """
+        Returns the number of planets of which the phase curves are calculated at once in
+        `find_phase`. The number is chosen such that the intermediate arrays fit into the memory
+        specified in `data.options.other['batch_memory']`.
+
+        Returns
+        -------
+        int
+            Number of planets per batch.
+        """
+
+        # about ten arrays of the shape (N_pf, wl_bins) are held in memory per planet
+        bytes_planet = (10 * 8 * self.data.options.optimization['N_pf']
+                        * self.data.inst['wl_bins'].shape[0])
+
+        return int(max(1, self.data.options.other['batch_memory'] * 1e9 // bytes_planet))
+
+    def phase_curves(self,
+                     rows: np.ndarray,
+                     theta_p: np.ndarray):
+        """
+        Calculates the signal-to-noise ratio of the specified planets at the given orbital phases.
+        The baseline is adjusted to the habitable zone of the host star of every planet.
+
+        Parameters
+        ----------
+        rows : np.ndarray
+            Row positions of the planets in the catalog.
+        theta_p : np.ndarray
+            Orbital phases in [rad].
+
+        Returns
+        -------
+        snr_phase : np.ndarray
+            Signal-to-noise ratio of the planets in the shape (planets, phases).
+        """
+
+        distance_s = self.data.star_column('distance_s', rows)
+
+        # all combinations of planets and phases are calculated at once, with one baseline per
+        # combination
+        self.run_socket(s_name='instrument',
+                        method='adjust_bl_to_hz',
+                        hz_center=np.repeat(self.data.star_column('hz_center', rows),
+                                            theta_p.shape[0]),
+                        distance_s=np.repeat(distance_s, theta_p.shape[0]))
+
+        angsep = (self.data.catalog.semimajor_p.to_numpy()[rows, np.newaxis]
+                  / distance_s[:, np.newaxis]
+                  * np.sqrt(
+                    np.cos(self.data.catalog.small_omega_p.to_numpy()[rows, np.newaxis]
+                           + theta_p) ** 2
+                    + np.cos(self.data.catalog.inc_p.to_numpy()[rows, np.newaxis]) ** 2
+                    * np.sin(self.data.catalog.small_omega_p.to_numpy()[rows, np.newaxis]
+                             + theta_p) ** 2))
+
+        transm_eff, transm_noise = self.run_socket(s_name='transmission',
+                                                   method='transmission_efficiency',
+                                                   index=None,
+                                                   angsep=angsep.reshape(-1))
+        transm_eff = transm_eff.reshape(angsep.shape + (-1, ))
+        transm_noise = transm_noise.reshape(angsep.shape + (-1, ))
+
+        planet_flux_use = self.data.spectrum('planet_flux_use', rows)[:, np.newaxis, :]
+        noise = (self.data.spectrum('noise_astro', rows)[:, np.newaxis, :]
+                 + planet_flux_use * transm_noise * 2)
+        flux_planet = planet_flux_use * transm_eff
+
+        return np.sqrt((flux_planet ** 2 / noise).sum(axis=-1))
+
     def find_phase(self,
-                   recalc: bool = False):
+                   recalc: bool = False,
+                   workers: int = 1):
+        """
+        Finds the orbital phase at which every planet is observed with the highest
+        signal-to-noise ratio and sets the phase, the angular separation and the signal-to-noise
+        ratio of the planets to the ones at this phase. Requires the spectral results of
+        `Instrument.get_snr` in safe mode.
+
+        Parameters
+        ----------
+        recalc : bool
+            If set to True, the signal-to-noise ratio is calculated at `N_pf` phases for all
+            planets and saved to `data.spectra['snr_phase']`. Otherwise, the existing phase curves
+            are used.
+        workers : int
+            Number of processes the planets are distributed over.
+        """
+
         self.run_socket(s_name='instrument',
                         method='apply_options')
-        self.data.catalog['snr_new'] = 0.
         theta_p = np.linspace(start=0,
                               stop=2 * np.pi,
                               num=self.data.options.optimization['N_pf'])
 
         if recalc:
-            self.data.catalog['snr_phase'] = None
-
-            for n_p in tqdm(range(self.data.catalog.shape[0])):
-                snr_phase = np.zeros_like(theta_p)
-
-                self.run_socket(s_name='instrument',
-                                method='adjust_bl_to_hz',
-                                hz_center=float(self.data.catalog.hz_center.iloc[n_p]),
-                                distance_s=float(self.data.catalog.distance_s.iloc[n_p]))
-
-                if n_p == 3200:
-                    break
-                for i, theta in enumerate(theta_p):
-                    self.data.catalog.angsep.iat[n_p] = (self.data.catalog.semimajor_p.iloc[n_p]
-                                                         / self.data.catalog.distance_s.iloc[n_p]
-                                                         * np.sqrt(
-                        np.cos(self.data.catalog.small_omega_p.iloc[n_p] + theta) ** 2
-                        + np.cos(self.data.catalog.inc_p.iloc[n_p]) ** 2
-                        * np.sin(self.data.catalog.small_omega_p.iloc[n_p] + theta) ** 2))
-
-                    transm_eff, transm_noise = self.run_socket(s_name='transmission',
-                                                               method='transmission_efficiency',
-                                                               index=n_p)
-                    noise = (self.data.catalog.noise_astro.iloc[n_p][0]
-                             + self.data.catalog.planet_flux_use.iloc[n_p][0] * transm_noise * 2)
-                    flux_planet = self.data.catalog.planet_flux_use.iloc[n_p][0] * transm_eff
-                    snr_phase[i] = np.sqrt((flux_planet ** 2 / noise).sum())
-
-                self.data.catalog.snr_phase.iat[n_p] = [snr_phase]
-
-        for n_p in tqdm(range(self.data.catalog.shape[0])):
-            i = np.argmax(self.data.catalog.snr_phase.iloc[n_p][0])
-            self.data.catalog.theta_p.iat[n_p] = theta_p[i]
-            self.data.catalog.angsep.iat[n_p] = (self.data.catalog.semimajor_p.iloc[n_p]
-                                                 / self.data.catalog.distance_s.iloc[n_p]
-                                                 * np.sqrt(
-                        np.cos(self.data.catalog.small_omega_p.iloc[n_p]
-                               + self.data.catalog.theta_p.iloc[n_p]) ** 2
-                        + np.cos(self.data.catalog.inc_p.iloc[n_p]) ** 2
-                        * np.sin(self.data.catalog.small_omega_p.iloc[n_p]
-                                 + self.data.catalog.theta_p.iloc[n_p]) ** 2))
-            self.data.catalog.snr_new.iat[n_p] = self.data.catalog.snr_phase.iloc[n_p][0][i]
+            rows = np.arange(0, self.data.catalog.shape[0], 1)
+            # with multiple workers, several chunks per worker allow the workers that finish early
+            # to pick up the remaining work
+            n_chunks = int(np.ceil(rows.shape[0] / self.get_phase_batch_size()))
+            if workers > 1:
+                n_chunks = max(n_chunks, 4 * workers)
+            chunks = np.array_split(rows, max(1, min(n_chunks, rows.shape[0])))
+
+            with (ProcessPoolExecutor(max_workers=workers,
+                                      initializer=_init_phase_worker,
+                                      initargs=(self,))
+                  if workers > 1 else nullcontext()) as executor:
+                if workers > 1:
+                    futures = [executor.submit(_run_phase_worker, chunk, theta_p)
+                               for chunk in chunks]
+                    results = (future.result() for future in tqdm(as_completed(futures),
+                                                                  total=len(futures)))
+                else:
+                    results = ((chunk, self.phase_curves(rows=chunk,
+                                                         theta_p=theta_p))
+                               for chunk in tqdm(chunks))
+
+                self.data.spectra_add(name='snr_phase',
+                                      n_col=theta_p.shape[0])
+                spectrum = self.data.catalog['spectrum'].to_numpy()
+                for chunk, snr_phase in results:
+                    self.data.spectra['snr_phase'][spectrum[chunk]] = snr_phase
 
+        snr_phase = self.data.spectrum('snr_phase')
+        i = np.argmax(snr_phase, axis=1)
+        self.data.catalog['theta_p'] = theta_p[i]
+        self.data.catalog['angsep'] = (self.data.catalog.semimajor_p.to_numpy()
+                                       / self.data.star_column('distance_s')
+                                       * np.sqrt(
+                    np.cos(self.data.catalog.small_omega_p.to_numpy()
+                           + self.data.catalog.theta_p.to_numpy()) ** 2
+                    + np.cos(self.data.catalog.inc_p.to_numpy()) ** 2
+                    * np.sin(self.data.catalog.small_omega_p.to_numpy()
+                             + self.data.catalog.theta_p.to_numpy()) ** 2))
+        self.data.catalog['snr_new'] = snr_phase[np.arange(0, snr_phase.shape[0], 1), i]
 
     def ahgs(self):
         self.data.optm['hit_limit'] = np.zeros(5)
@@ -76,7 +165,126 @@ class Optimizer(OptimizationModule):
         self.data.catalog['snr_current'] = 0.
         self.data.catalog['int_time'] = 0.
         self.data.catalog['t_slew'] = -self.data.options.array['t_slew']
-        self.run_socket(s_name='slope',
-                        method='distribute_time')
+        self.data.catalog['t_detected'] = np.inf
+        return self.run_socket(s_name='slope',
+                               method='distribute_time')
+
+    def ahgs_scenarios(self,
+                       scenarios: list,
+                       workers: int = 1):
+        """
+        Distributes the observation time with the aHGS algorithm for multiple scenarios of the
+        optimization options, e.g. different target SNRs or detection limits. The catalog and the
+        options of the data class are not changed.
+
+        Parameters
+        ----------
+        scenarios : list
+            Scenarios given as dictionaries of the options that differ from the ones in
+            `data.options`, e.g. ``[{'snr_target': 5}, {'snr_target': 7}]``.
+        workers : int
+            Number of processes the scenarios are distributed over.
+
+        Returns
+        -------
+        yields : pd.DataFrame
+            Table with one row per scenario, containing the options of the scenario and the
+            number of detected planets in the habitable zone per universe for every stellar type
+            and in total.
+        """
+
+        self.data.optm['num_universe'] = self.data.catalog.nuniverse.max() + 1
+
+        results = self.run_socket(s_name='slope',
+                                  method='distribute_scenarios',
+                                  scenarios=scenarios,
+                                  workers=workers)
+
+        yields = pd.DataFrame([dict(scenario) for scenario in scenarios])
+        for key, value in self.yield_columns(results=results).items():
+            yields[key] = value / self.data.optm['num_universe']
+
+        return yields
+
+    def ahgs_universes(self,
+                       workers: int = 1):
+        """
+        Distributes the observation time with the aHGS algorithm independently for every universe
+        of the catalog, giving the spread of the yield between the universes. The full time of the
+        search phase is distributed to the planets of each universe, using the signal-to-noise
+        ratios already in the catalog. The detection limits are applied per universe. The catalog
+        and the options of the data class are not changed.
+
+        Parameters
+        ----------
+        workers : int
+            Number of processes the universes are distributed over.
+
+        Returns
+        -------
+        yields : pd.DataFrame
+            Table with one row per universe, indexed by the universe, containing the number of
+            detected planets in the habitable zone for every stellar type and in total.
+        summary : pd.DataFrame
+            Summary statistics of the yields over all universes (mean, standard deviation,
+            minimum, 5th, 50th and 95th percentiles and maximum).
+        """
+
+        # the planets of every universe
+        nuniverse = self.data.catalog.nuniverse.to_numpy()
+        order = np.argsort(nuniverse, kind='stable')
+        universes, offsets = np.unique(nuniverse[order], return_index=True)
+        rows = np.split(order, offsets[1:])
+
+        results = self.run_socket(s_name='slope',
+                                  method='distribute_universes',
+                                  universes=rows,
+                                  workers=workers)
+
+        yields = pd.DataFrame(self.yield_columns(results=results),
+                              index=pd.Index(universes, name='nuniverse'))
+        summary = yields.describe(percentiles=[0.05, 0.5, 0.95]).drop(index='count')
+
+        return yields, summary
+
+    def yield_columns(self,
+                      results: list):
+        """
+        Sorts the detections of multiple runs of the aHGS algorithm by stellar type.
+
+        Parameters
+        ----------
+        results : list
+            Results of `AhgsModule.distribute_scenario`.
+
+        Returns
+        -------
+        columns : dict
+            Number of detected planets in the habitable zone of every run with the stellar type
+            as key, and the sum over all stellar types under the key `'total'`.
+        """
+
+        columns = {key: np.array([sum_detected[stypes == value].sum()
+                                  for sum_detected, stypes in results])
+                   for key, value in self.data.other.get('stype_key', STYPE_KEY).items()}
+        columns['total'] = np.array([sum_detected.sum() for sum_detected, _ in results])
+
+        return columns
+
+
+def _init_phase_worker(optimizer: Optimizer):
+    """
+    Initializes a worker process of `Optimizer.find_phase` with a copy of the optimizer module and
+    the data and modules connected to it.
+    """
+    global _phase_worker_optimizer
+    _phase_worker_optimizer = optimizer
 
 
+def _run_phase_worker(rows: np.ndarray,
+                      theta_p: np.ndarray):
+    """
+    Runs `Optimizer.phase_curves` on the optimizer module of a worker process.
+    """
+    return rows, _phase_worker_optimizer.phase_curves(rows=rows,
+                                                      theta_p=theta_p)
@@ -0,0 +1,327 @@
+import json
+import os
+import shutil
+from typing import Union
+
+import numpy as np
+
+# version of the layout of the directory, increased on incompatible changes
+FORMAT_VERSION = 1
+
+
+def read_metadata(path: str):
+    """
+    Reads the metadata of a columnar catalog directory.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+
+    Returns
+    -------
+    metadata : dict
+        Metadata of the directory. Under the key `'tables'`, the number of rows and the stored
+        columns of every table are listed.
+
+    Raises
+    ------
+    ValueError
+        If the directory does not contain a columnar catalog of a supported format.
+    """
+
+    if not os.path.isfile(os.path.join(path, 'metadata.json')):
+        raise ValueError('No columnar catalog found at ' + path)
+
+    with open(os.path.join(path, 'metadata.json'), 'r') as f:
+        metadata = json.load(f)
+
+    if metadata['format'] > FORMAT_VERSION:
+        raise ValueError('The columnar catalog was written in a newer format')
+
+    return metadata
+
+
+def _json_default(o):
+    """
+    Converts objects that are not serializable by json, arrays and numpy scalars are converted to
+    lists and numbers, all other objects to their string representation.
+    """
+
+    if isinstance(o, (np.ndarray, np.generic)):
+        return o.tolist()
+    return str(o)
+
+
+def write_metadata(path: str,
+                   metadata: dict):
+    """
+    Writes the metadata of a columnar catalog directory. Arrays contained in the metadata (e.g.
+    in the options) are saved as lists.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    metadata : dict
+        Metadata of the directory.
+    """
+
+    # the metadata is replaced in one step, such that an interrupted write does not leave a
+    # corrupted file behind
+    with open(os.path.join(path, 'metadata.json.tmp'), 'w') as f:
+        json.dump(metadata, f, indent=1, default=_json_default)
+    os.replace(os.path.join(path, 'metadata.json.tmp'), os.path.join(path, 'metadata.json'))
+
+
+def encode_column(values: np.ndarray):
+    """
+    Converts a column to an array of a fixed-size type that can be saved without pickling.
+    Columns of objects are converted if they contain strings or arrays wrapped in lists (as
+    the spectral results and phase curves of earlier versions of LIFEsim). In the latter case, the
+    arrays are stacked along the second axis and missing entries (`None`) are filled with NaN.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values of the column.
+
+    Returns
+    -------
+    array
+        Array of a fixed-size type.
+    wrapped
+        True if the entries of the column are arrays wrapped in lists.
+
+    Raises
+    ------
+    ValueError
+        If the column contains objects that can not be converted.
+    """
+
+    values = np.asarray(values)
+    if values.dtype != object:
+        return values, False
+
+    present = [value for value in values if value is not None]
+    if present and isinstance(present[0], list):
+        fill = np.full_like(np.asarray(present[0][0], dtype=float), np.nan)
+        array = np.stack([fill if value is None else np.asarray(value[0], dtype=float)
+                          for value in values])
+        return array, True
+
+    array = np.array(values.tolist())
+    if array.dtype == object:
+        raise ValueError('Column of objects can not be saved')
+    return array, False
+
+
+def decode_column(array: np.ndarray,
+                  wrapped: bool):
+    """
+    Reverses the conversion of `encode_column`.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array as read from the directory.
+    wrapped : bool
+        True if the entries of the column are arrays wrapped in lists.
+
+    Returns
+    -------
+    values
+        Values of the column.
+    """
+
+    if not wrapped:
+        return array
+
+    values = np.full(array.shape[0], None, dtype=object)
+    for i, row in enumerate(array):
+        if not np.all(np.isnan(row)):
+            values[i] = [row]
+    return values
+
+
+def write_table(path: str,
+                metadata: dict,
+                table: str,
+                columns: dict,
+                chunksize: int):
+    """
+    Writes columns of a table to a columnar catalog directory. Every column is split into chunks
+    of rows, which are saved as separate compressed files. Columns already present in the
+    directory are replaced, all other columns are left untouched.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    metadata : dict
+        Metadata of the directory, which is updated with the written columns. It needs to be
+        saved with `write_metadata` afterwards.
+    table : str
+        Name of the table, e.g. `'catalog'`.
+    columns : dict
+        Columns to write with the column name as key. All columns need to have the same number of
+        rows as the table in the directory.
+    chunksize : int
+        Number of rows per chunk file. If the table already exists in the directory, the chunks
+        of the existing columns are used instead.
+
+    Raises
+    ------
+    ValueError
+        If the number of rows does not match the table in the directory.
+    """
+
+    for name, values in columns.items():
+        array, wrapped = encode_column(values)
+
+        if table not in metadata['tables']:
+            metadata['tables'][table] = {'rows': array.shape[0],
+                                         'chunks': [min(chunksize, array.shape[0] - start)
+                                                    for start in range(0, array.shape[0],
+                                                                       chunksize)],
+                                         'columns': {}}
+        entry = metadata['tables'][table]
+        if array.shape[0] != entry['rows']:
+            raise ValueError('Column ' + name + ' does not match the number of rows of the '
+                             'table ' + table)
+
+        column_path = os.path.join(path, table, name)
+        if os.path.isdir(column_path):
+            shutil.rmtree(column_path)
+        os.makedirs(column_path)
+
+        starts = np.cumsum([0] + entry['chunks'])
+        for k in range(len(entry['chunks'])):
+            np.savez_compressed(os.path.join(column_path, '%05d.npz' % k),
+                                data=array[starts[k]:starts[k + 1]])
+
+        entry['columns'][name] = {'dtype': array.dtype.str,
+                                  'shape': list(array.shape[1:]),
+                                  'wrapped': wrapped}
+
+
+def append_rows(path: str,
+                metadata: dict,
+                table: str,
+                columns: dict):
+    """
+    Appends rows to a table of a columnar catalog directory. The rows are saved as a new chunk
+    of every column, the existing chunks are left untouched.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    metadata : dict
+        Metadata of the directory, which is updated with the written rows. It needs to be saved
+        with `write_metadata` afterwards.
+    table : str
+        Name of the table, e.g. `'catalog'`.
+    columns : dict
+        Rows to append with the column name as key. If the table already exists in the
+        directory, the same columns as in the directory need to be given.
+
+    Raises
+    ------
+    ValueError
+        If the columns do not match the columns of the table in the directory.
+    """
+
+    rows = {len(value) for value in columns.values()}
+    if len(rows) > 1:
+        raise ValueError('The appended columns differ in length')
+    rows = rows.pop() if rows else 0
+
+    if table not in metadata['tables']:
+        if rows > 0:
+            write_table(path=path,
+                        metadata=metadata,
+                        table=table,
+                        columns=columns,
+                        chunksize=rows)
+        return
+
+    entry = metadata['tables'][table]
+    if set(columns.keys()) != set(entry['columns'].keys()):
+        raise ValueError('The appended columns do not match the columns of the table ' + table)
+    if rows == 0:
+        return
+
+    k = len(entry['chunks'])
+    for name, values in columns.items():
+        array, wrapped = encode_column(values)
+        if ((array.dtype.str != entry['columns'][name]['dtype'])
+                or (list(array.shape[1:]) != entry['columns'][name]['shape'])):
+            raise ValueError('The appended column ' + name + ' does not match the type of the '
+                             'column in the table ' + table)
+        np.savez_compressed(os.path.join(path, table, name, '%05d.npz' % k),
+                            data=array)
+
+    entry['chunks'].append(rows)
+    entry['rows'] += rows
+
+
+def read_table(path: str,
+               metadata: dict,
+               table: str,
+               columns: Union[list, type(None)] = None,
+               rows: Union[np.ndarray, type(None)] = None):
+    """
+    Reads columns of a table from a columnar catalog directory. Only the chunk files of the
+    requested columns containing the requested rows are read.
+
+    Parameters
+    ----------
+    path : str
+        Path to the directory.
+    metadata : dict
+        Metadata of the directory.
+    table : str
+        Name of the table, e.g. `'catalog'`.
+    columns : Union[list, type(None)]
+        Names of the columns to read. If `None` is given, all columns of the table are read.
+    rows : Union[np.ndarray, type(None)]
+        Row positions to read in ascending order. If `None` is given, all rows are read.
+
+    Returns
+    -------
+    columns : dict
+        Read columns with the column name as key.
+    """
+
+    entry = metadata['tables'][table]
+    if columns is None:
+        columns = list(entry['columns'].keys())
+
+    starts = np.cumsum([0] + entry['chunks'])
+    if rows is None:
+        chunks = np.arange(0, len(entry['chunks']), 1)
+    else:
+        rows = np.asarray(rows)
+        chunk_of_row = np.searchsorted(starts, rows, side='right') - 1
+        chunks = np.unique(chunk_of_row)
+
+    result = {}
+    for name in columns:
+        column = entry['columns'][name]
+        parts = []
+        for k in chunks:
+            with np.load(os.path.join(path, table, name, '%05d.npz' % k),
+                         allow_pickle=False) as f:
+                part = f['data']
+            if rows is not None:
+                part = part[rows[chunk_of_row == k] - starts[k]]
+            parts.append(part)
+
+        if parts:
+            array = np.concatenate(parts)
+        else:
+            array = np.zeros((0, ) + tuple(column['shape']), dtype=np.dtype(column['dtype']))
+        result[name] = decode_column(array, column['wrapped'])
+
+    return result
@@ -0,0 +1,50 @@
+from typing import Union
+
+import numpy as np
+
+# rotation matrix from ICRS to the barycentric mean ecliptic and equinox of J2000 (TT), including
+# the frame bias and the precession to J2000. The values are those of erfa.ecm06(2451545.0, 0.),
+# which is the matrix used by astropy for the transformation from ICRS to
+# BarycentricMeanEcliptic(equinox='J2000')
+ECLIPTIC_J2000 = np.array([[9.9999999999999412e-01, -7.0783689609715561e-08, 8.0562139776131861e-08],
+                           [3.2897004077419646e-08, 9.1748212991495837e-01, 3.9777699944404793e-01],
+                           [-1.0207044725484355e-07, -3.9777699944404304e-01, 9.1748212991495559e-01]])
+
+
+def equatorial_to_ecliptic(ra: Union[float, np.ndarray],
+                           dec: Union[float, np.ndarray]):
+    """
+    Transforms ICRS equatorial coordinates to barycentric mean ecliptic coordinates of the
+    equinox J2000. Since both frames are barycentric and the equinox is fixed, the transformation
+    is a single rotation. The result agrees with the transformation of an astropy `SkyCoord` to
+    `BarycentricMeanEcliptic()` to better than 1e-14 rad.
+
+    Parameters
+    ----------
+    ra : Union[float, np.ndarray]
+        Right ascension in [deg].
+    dec : Union[float, np.ndarray]
+        Declination in [deg].
+
+    Returns
+    -------
+    lon
+        Ecliptic longitude in [rad] in the range [0, 2 pi).
+    lat
+        Ecliptic latitude in [rad].
+    """
+
+    ra = np.radians(ra)
+    dec = np.radians(dec)
+
+    # rotate the cartesian unit vectors to the ecliptic frame
+    x, y, z = np.tensordot(ECLIPTIC_J2000,
+                           np.array([np.cos(dec) * np.cos(ra),
+                                     np.cos(dec) * np.sin(ra),
+                                     np.sin(dec)]),
+                           axes=1)
+
+    lon = np.mod(np.arctan2(y, x), 2 * np.pi)
+    lat = np.arctan2(z, np.hypot(x, y))
+
+    return lon, lat
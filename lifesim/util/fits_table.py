@@ -0,0 +1,117 @@
+from typing import Union
+
+import numpy as np
+from astropy.io import fits
+
+
+class FitsTable(object):
+    """
+    Read access to a binary table of a FITS file without loading it into memory. Only the header
+    is parsed when opening the file, the table itself is memory-mapped and a column is only read
+    from the file once it is requested. FITS tables are saved in big-endian byte order, the
+    conversion to the native byte order is done on the first request of a column (or of selected
+    rows of a column) and the converted column is kept for later requests.
+
+    Attributes
+    ----------
+    data : np.memmap
+        Memory-mapped binary table as structured array in the byte order of the file.
+    names : list
+        Names of the columns in the table.
+    cache : dict
+        Columns converted to the native byte order with the column name as key.
+    """
+
+    def __init__(self,
+                 path: str,
+                 hdu: int = 1):
+        """
+        Parameters
+        ----------
+        path : str
+            Path to the FITS file.
+        hdu : int
+            Index of the binary table extension in the FITS file.
+
+        Raises
+        ------
+        ValueError
+            If the table contains scaled columns, which need to be converted by astropy.
+        """
+
+        # only the header of the table is read by astropy, the data is mapped directly
+        with fits.open(path, memmap=True) as hdul:
+            columns = hdul[hdu].columns
+            rows = hdul[hdu].header['NAXIS2']
+            offset = hdul.fileinfo(hdu)['datLoc']
+
+            if any((column.bscale is not None) or (column.bzero is not None)
+                   for column in columns):
+                raise ValueError('Scaled columns are not supported')
+
+            # the binary table is always saved in big-endian byte order
+            self.names = columns.names
+            self.data = np.memmap(path,
+                                  dtype=columns.dtype.newbyteorder('>'),
+                                  mode='r',
+                                  offset=offset,
+                                  shape=(rows, ))
+        self.cache = {}
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def column(self,
+               name: str,
+               rows: Union[np.ndarray, type(None)] = None,
+               dtype: Union[type, type(None)] = None):
+        """
+        Returns a column of the table in the native byte order.
+
+        Parameters
+        ----------
+        name : str
+            Name of the column.
+        rows : Union[np.ndarray, type(None)]
+            Row positions to read. If `None` is given, the full column is read and kept for later
+            requests. Otherwise, only the requested rows are read from the file, unless the full
+            column was requested before.
+        dtype : Union[type, type(None)]
+            Type of the returned array. If `None` is given, the type of the column is used. Text
+            columns are returned as strings without trailing spaces.
+
+        Returns
+        -------
+        column
+            Values of the column.
+        """
+
+        if name in self.cache:
+            values = self.cache[name]
+            if rows is not None:
+                values = values[rows]
+        else:
+            values = self.data[name]
+            if rows is not None:
+                values = values[rows]
+
+            # the byte order is converted while copying from the memory-map
+            if values.dtype.kind == 'S':
+                values = np.char.rstrip(values.astype(str))
+            else:
+                values = np.array(values, dtype=values.dtype.newbyteorder('='))
+
+            if rows is None:
+                self.cache[name] = values
+
+        if dtype is not None:
+            values = values.astype(dtype, copy=False)
+
+        return values
+
+    def close(self):
+        """
+        Releases the memory-map of the file. The columns kept in `cache` remain accessible.
+        """
+
+        del self.data
@@ -1,20 +1,36 @@
+from typing import Union
+
 import numpy as np
 
+# coefficients (s0, a, b, c, d) of the effective stellar flux at the inner (first tuple) and outer
+# (second tuple) edge of the habitable zone. 'MS' and 'POST-MS' are taken from Kaltenegger+2017
+# Table 1, the 'Kopparapu' models from Kopparapu+2014
+HZ_MODELS = {'MS': ((1.7665, 1.3351E-4, 3.1515E-9, -3.3488E-12, 0),
+                    (0.3240, 5.3221E-5, 1.4288E-9, -1.1049E-12, 0)),
+             'POST-MS': ((1.1066, 1.2181E-4, 1.5340E-8, -1.5018E-12, 0),
+                         (0.3240, 5.3221E-5, 1.4288E-9, -1.1049E-12, 0)),
+             'Kopparapu-Optimistic': ((1.776, 2.136e-4, 2.533e-8, -1.332e-11, -3.097e-15),
+                                      (0.32, 5.547e-5, 1.526e-9, -2.874e-12, -5.011e-16)),
+             'Kopparapu-Conservative': ((1.107, 1.332e-4, 1.58e-8, -8.308e-12, -1.931e-15),
+                                        (0.356, 6.171e-5, 1.698e-9, -3.198e-12, -5.575e-16))}
+
 
 def single_habitable_zone(model: str,
-                          temp_s: float,
-                          radius_s: float):
+                          temp_s: Union[float, np.ndarray],
+                          radius_s: Union[float, np.ndarray]):
     """
     Calculates the location of the habitable zone according to Kaltenegger+2017.
 
     Parameters
     ----------
     model : str
-        Specifies the model for the habitable zone. The options are 'MS' and 'PRE-MS' according to
-        Kaltenegger+2017 Table 1.
-    temp_s : float
-        Temperature of the star in [K].
-    radius_s : float
+        Specifies the model for the habitable zone. The options are the keys of `HZ_MODELS`, i.e.
+        'MS' and 'POST-MS' according to Kaltenegger+2017 Table 1 and 'Kopparapu-Optimistic' and
+        'Kopparapu-Conservative'.
+    temp_s : Union[float, np.ndarray]
+        Temperature of the star in [K]. If arrays are given for `temp_s` and `radius_s`, the
+        habitable zones of all stars are calculated at once.
+    radius_s : Union[float, np.ndarray]
         Radius of the star in [solar radii].
 
     Returns
@@ -37,33 +53,9 @@ def single_habitable_zone(model: str,
     ValueError
         If the specified model does not exits.
     """
-    # model based on Kaltenegger+2017
-    if model == 'MS':
-        s0_in, s0_out = 1.7665, 0.3240
-        a_in, a_out = 1.3351E-4, 5.3221E-5
-        b_in, b_out = 3.1515E-9, 1.4288E-9
-        c_in, c_out = -3.3488E-12, -1.1049E-12
-        d_in, d_out = 0, 0
-    elif model == 'POST-MS':
-        s0_in, s0_out = 1.1066, 0.3240
-        a_in, a_out = 1.2181E-4, 5.3221E-5
-        b_in, b_out = 1.5340E-8, 1.4288E-9
-        c_in, c_out = -1.5018E-12, -1.1049E-12
-        d_in, d_out = 0, 0
-    elif model == 'Kopparapu-Optimistic':
-        s0_in, s0_out = 1.776, 0.32
-        a_in, a_out = 2.136e-4, 5.547e-5
-        b_in, b_out = 2.533e-8, 1.526e-9
-        c_in, c_out = -1.332e-11, -2.874e-12
-        d_in, d_out = -3.097e-15, -5.011e-16
-    elif model == 'Kopparapu-Conservative':
-        s0_in, s0_out = 1.107, 0.356
-        a_in, a_out = 1.332e-4, 6.171e-5
-        b_in, b_out = 1.58e-8, 1.698e-9
-        c_in, c_out = -8.308e-12, -3.198e-12
-        d_in, d_out = -1.931e-15, -5.575e-16
-    else:
+    if model not in HZ_MODELS:
         raise ValueError('Unknown model')
+    (s0_in, a_in, b_in, c_in, d_in), (s0_out, a_out, b_out, c_out, d_out) = HZ_MODELS[model]
 
     t_star = temp_s - 5780
 
@@ -40,6 +40,25 @@ class Options(object):
               detector will be simulated with 512^2 pixels.
             - ``'wl_optimal'`` : The wavelength to which the baseline is optimized in [micron].
             - ``'n_plugins'`` : Number of sockets the instrument class will feature.
+            - ``'batch_memory'`` : Memory in [GB] that the intermediate arrays of the batch mode
+              of the SNR calculation are allowed to occupy.
+            - ``'exozodi_mode'`` : Integration of the exozodi leakage, possible options are
+              ``'map'`` for the summation over all pixels of the transmission map and ``'radial'``
+              for the integration over the azimuthally summed transmission profile.
+            - ``'localzodi_mode'`` : Calculation of the transmission averaged over the field of
+              view for the localzodi leakage, possible options are ``'analytic'`` for the closed
+              form and ``'map'`` for the average over the pixels of the transmission map.
+            - ``'star_mode'`` : Calculation of the transmission averaged over the stellar disk for
+              the stellar leakage, possible options are ``'analytic'`` for the closed form and
+              ``'map'`` for the average over a transmission map of the stellar disk.
+            - ``'cache_memory'`` : Memory in [GB] that the cached transmission maps are allowed
+              to occupy. If set to zero, no maps are cached.
+            - ``'bl_quantization'`` : Step in [m] to which the baseline is rounded for the cached
+              transmission maps. If set to zero, the maps are calculated at the exact baseline.
+              The relative change of the signal-to-noise ratio stays below
+              ``bl_quantization / (2 * baseline)``, a step of 0.1 m is recommended.
+            - ``'spectra_path'`` : Directory in which the spectral results of the planets are
+              stored as memory-mapped .npy files. If empty, the results are held in memory.
     models : dict
         Options concerning different models used in the simulation. They are
             - ``'localzodi'`` : Model for the localzodi, possible options are ``'glasse'`` and
@@ -78,7 +97,14 @@ class Options(object):
 
         self.other = {'image_size': 0,
                       'wl_optimal': 0.,
-                      'n_plugins': 0}
+                      'n_plugins': 0,
+                      'batch_memory': 0.,
+                      'exozodi_mode': '',
+                      'localzodi_mode': '',
+                      'star_mode': '',
+                      'cache_memory': 0.,
+                      'bl_quantization': 0.,
+                      'spectra_path': ''}
 
         self.models = {'localzodi': '',
                        'habitable': ''}
@@ -116,6 +142,13 @@ class Options(object):
         self.other['image_size'] = 256  # TODO: or 512?
         self.other['wl_optimal'] = 15
         self.other['n_plugins'] = 5
+        self.other['batch_memory'] = 1.
+        self.other['exozodi_mode'] = 'map'
+        self.other['localzodi_mode'] = 'analytic'
+        self.other['star_mode'] = 'analytic'
+        self.other['cache_memory'] = 0.5
+        self.other['bl_quantization'] = 0.
+        self.other['spectra_path'] = ''
 
         self.models['localzodi'] = 'darwinsim'
         self.models['habitable'] = 'MS'
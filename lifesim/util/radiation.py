@@ -61,8 +61,8 @@ def black_body(mode: str,
                bins: np.ndarray,
                width: np.ndarray,
                temp: Union[float, np.ndarray],
-               radius: float = None,
-               distance: float = None):
+               radius: Union[float, np.ndarray] = None,
+               distance: Union[float, np.ndarray] = None):
     """
     Calculates the black body photon flux in wavelength or frequency as well as for planetary or
     stellar sources
@@ -89,11 +89,13 @@ def black_body(mode: str,
         [m] or [Hz] respectively
     temp : Union[float, np.ndarray]
         The temperature of the black body
-    radius : float
+    radius : Union[float, np.ndarray]
         The radius of the spherical black body object. For ``mode = 'star'`` in [sun_radii], for
         ``mode = 'planet'`` in [earth_radii]
-    distance : float
-        The distance between the instrument and the observed object in [pc]
+    distance : Union[float, np.ndarray]
+        The distance between the instrument and the observed object in [pc]. To calculate the
+        flux of multiple objects at once, ``temp``, ``radius`` and ``distance`` can be given as
+        arrays of shape (objects, 1), resulting in a flux of shape (objects, bins)
 
     Raises
     ------
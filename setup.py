@@ -23,6 +23,7 @@ setup(
                       'numpy==1.20.3',
                       'pandas==1.2.4',
                       'PyQt5==5.15.4',
+                      'scipy==1.6.3',
                       'tqdm==4.61.0',
                       'tables==3.6.1'
                       ],
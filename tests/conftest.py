@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import lifesim
+from lifesim.core.data import PPOP_COLUMNS
+
+
+def write_ppop(path,
+               n_universes: int = 2,
+               n_stars: int = 4,
+               n_planets: int = 3,
+               seed: int = 1):
+    """
+    Writes a small P-Pop output file in .txt format with `n_planets` planets around each of
+    `n_stars` stars in every universe. The stars are the same in all universes.
+    """
+
+    rng = np.random.default_rng(seed)
+    stypes = np.array(['F', 'G', 'K', 'M'])[np.arange(n_stars) % 4]
+    temp_s = np.array([6500., 5800., 4500., 3400.])[np.arange(n_stars) % 4]
+    radius_s = np.array([1.3, 1., 0.7, 0.35])[np.arange(n_stars) % 4]
+    distance_s = np.linspace(4., 15., n_stars)
+
+    lines = []
+    for nuniverse in range(n_universes):
+        for nstar in range(n_stars):
+            for _ in range(n_planets):
+                semimajor_p = (np.sqrt(radius_s[nstar] ** 2 * (temp_s[nstar] / 5772.) ** 4)
+                               * rng.uniform(0.5, 2.))
+                row = {'Nuniverse': nuniverse,
+                       'Rp': rng.uniform(0.5, 2.),
+                       'Porb': 365. * semimajor_p ** 1.5,
+                       'Mp': 1.,
+                       'ep': 0.,
+                       'ip': rng.uniform(0., np.pi),
+                       'Omegap': rng.uniform(0., 2 * np.pi),
+                       'omegap': rng.uniform(0., 2 * np.pi),
+                       'thetap': rng.uniform(0., 2 * np.pi),
+                       'Abond': 0.3,
+                       'AgeomVIS': 0.3,
+                       'AgeomMIR': 0.3,
+                       'z': rng.uniform(0.5, 5.),
+                       'ap': semimajor_p,
+                       'rp': semimajor_p,
+                       'AngSep': semimajor_p / distance_s[nstar] * rng.uniform(0.3, 1.),
+                       'maxAngSep': semimajor_p / distance_s[nstar],
+                       'Fp': 1.,
+                       'fp': 1e-7,
+                       'Tp': rng.uniform(200., 400.),
+                       'Nstar': nstar,
+                       'Rs': radius_s[nstar],
+                       'Ms': 1.,
+                       'Ts': temp_s[nstar],
+                       'Ds': distance_s[nstar],
+                       'RA': 30. * nstar,
+                       'Dec': 10. * nstar - 20.,
+                       'Stype': stypes[nstar]}
+                lines.append('\t'.join([str(value) for value in row.values()]))
+
+    names = list(PPOP_COLUMNS.keys()) + ['Stype']
+    with open(path, 'w') as file:
+        file.write('\t'.join(names) + '\n')
+        file.write('\t'.join(names) + '\n')
+        file.write('\n'.join(lines) + '\n')
+
+
+def make_bus(ppop_path,
+             transmission=lifesim.TransmissionMap,
+             **options):
+    """
+    Creates a bus with a catalog read from `ppop_path` and an instrument connected to a
+    transmission module and the three photon noise modules.
+    """
+
+    bus = lifesim.Bus()
+    bus.data.options.set_scenario('baseline')
+    bus.data.options.set_manual(**{'image_size': 64, **options})
+    bus.data.catalog_from_ppop(input_path=str(ppop_path))
+
+    bus.add_module(lifesim.Instrument(name='inst'))
+    bus.add_module(transmission(name='transm'))
+    bus.add_module(lifesim.PhotonNoiseExozodi(name='exo'))
+    bus.add_module(lifesim.PhotonNoiseLocalzodi(name='local'))
+    bus.add_module(lifesim.PhotonNoiseStar(name='star'))
+    bus.connect(('inst', 'transm'))
+    bus.connect(('inst', 'exo'))
+    bus.connect(('inst', 'local'))
+    bus.connect(('inst', 'star'))
+    bus.connect(('star', 'transm'))
+
+    return bus
+
+
+@pytest.fixture
+def ppop_path(tmp_path):
+    path = tmp_path / 'ppop.txt'
+    write_ppop(path)
+    return path
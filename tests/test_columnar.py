@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import lifesim
+from lifesim.util import columnar
+
+from conftest import make_bus
+
+
+def assert_data_equal(data, reference):
+    catalog = data.catalog.drop(columns=['spectrum', 'star'], errors='ignore')
+    pd.testing.assert_frame_equal(catalog,
+                                  reference.catalog[catalog.keys()].reset_index(drop=True))
+    pd.testing.assert_frame_equal(data.stars.reset_index(drop=True),
+                                  reference.stars.reset_index(drop=True))
+    assert data.spectra.keys() == reference.spectra.keys()
+    for key in data.spectra.keys():
+        assert np.all(data.spectrum(key) == reference.spectrum(key))
+    assert np.all(data.star_column('distance_s') == reference.star_column('distance_s'))
+
+
+def import_catalog(path, **kwargs):
+    bus = lifesim.Bus()
+    bus.data.options.set_scenario('baseline')
+    bus.data.import_catalog(input_path=str(path), **kwargs)
+    return bus.data
+
+
+@pytest.fixture
+def simulated(ppop_path):
+    bus = make_bus(ppop_path)
+    bus.modules['inst'].get_snr(safe_mode=True)
+    return bus.data
+
+
+def test_write_read_table(tmp_path):
+    metadata = {'format': columnar.FORMAT_VERSION,
+                'tables': {}}
+    columns = {'int': np.arange(10),
+               'float': np.linspace(0., 1., 10),
+               'str': np.array(['G', 'K'] * 5),
+               'spectra': np.arange(30.).reshape((10, 3)),
+               'wrapped': np.array([[np.arange(2.) + i] if i % 3 else None for i in range(10)],
+                                   dtype=object)}
+    columnar.write_table(path=str(tmp_path), metadata=metadata, table='t', columns=columns,
+                         chunksize=4)
+    columnar.append_rows(path=str(tmp_path), metadata=metadata, table='t',
+                         columns={key: value[:3] for key, value in columns.items()})
+    columnar.write_metadata(path=str(tmp_path), metadata=metadata)
+
+    metadata = columnar.read_metadata(str(tmp_path))
+    assert metadata['tables']['t']['chunks'] == [4, 4, 2, 3]
+    result = columnar.read_table(path=str(tmp_path), metadata=metadata, table='t')
+    for key, value in columns.items():
+        expected = np.concatenate([value, value[:3]])
+        if key == 'wrapped':
+            assert [None if v is None else v[0].tolist() for v in result[key]] \
+                   == [None if v is None else v[0].tolist() for v in expected]
+        else:
+            assert result[key].dtype == value.dtype
+            assert np.all(result[key] == expected)
+
+    # rows spread over several chunks
+    rows = np.array([1, 5, 6, 12])
+    result = columnar.read_table(path=str(tmp_path), metadata=metadata, table='t',
+                                 columns=['float'], rows=rows)
+    assert list(result.keys()) == ['float']
+    assert np.all(result['float'] == np.concatenate([columns['float'],
+                                                     columns['float'][:3]])[rows])
+
+    with pytest.raises(ValueError):
+        columnar.append_rows(path=str(tmp_path), metadata=metadata, table='t',
+                             columns={'int': np.arange(2)})
+
+
+@pytest.mark.parametrize('chunksize', [5, 1000000])
+def test_export_import(tmp_path, simulated, chunksize):
+    simulated.export_catalog(output_path=str(tmp_path / 'catalog'),
+                             chunksize=chunksize)
+    assert_data_equal(import_catalog(tmp_path / 'catalog'), simulated)
+
+    # the hdf-format gives the same result
+    simulated.export_catalog(output_path=str(tmp_path / 'catalog.hdf5'))
+    assert_data_equal(import_catalog(tmp_path / 'catalog.hdf5'), simulated)
+
+
+def test_export_append_columns(tmp_path, simulated):
+    simulated.export_catalog(output_path=str(tmp_path),
+                             columns=['z', 'noise_astro'])
+    data = import_catalog(tmp_path)
+    assert set(data.catalog.keys()) == {'nstar', 'z', 'spectrum', 'star'}
+    assert list(data.spectra.keys()) == ['noise_astro']
+
+    simulated.export_catalog(output_path=str(tmp_path),
+                             append=True)
+    assert_data_equal(import_catalog(tmp_path), simulated)
+
+    # a different catalog can not be appended to
+    simulated.catalog_remove_distance(stype=4, mode='larger', dist=0.)
+    with pytest.raises(ValueError):
+        simulated.export_catalog(output_path=str(tmp_path),
+                                 append=True)
+
+
+def test_export_append_rows(tmp_path, ppop_path, simulated):
+    # the catalog is written block by block and read back as a whole
+    bus = make_bus(ppop_path)
+    for i, _ in enumerate(bus.data.catalog_blocks_from_ppop(input_path=str(ppop_path),
+                                                            universes_per_block=1)):
+        bus.modules['inst'].get_snr(safe_mode=True)
+        bus.data.export_catalog(output_path=str(tmp_path),
+                                append_rows=(i > 0))
+
+    data = import_catalog(tmp_path)
+    assert_data_equal(data, simulated)
+
+    # import of selected rows and columns
+    rows = np.where(simulated.catalog.nuniverse.to_numpy() == 1)[0]
+    data = import_catalog(tmp_path, rows=rows, columns=['snr_1h', 'noise_astro'])
+    assert np.all(data.catalog.snr_1h.to_numpy() == simulated.catalog.snr_1h.to_numpy()[rows])
+    assert np.all(data.spectrum('noise_astro') == simulated.spectrum('noise_astro', rows))
+    assert np.all(data.star_column('distance_s') == simulated.star_column('distance_s', rows))
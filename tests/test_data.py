@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+from astropy.io import fits
+
+import lifesim
+from lifesim.core.data import STAR_COLUMNS
+
+
+def read_catalog(path, **kwargs):
+    bus = lifesim.Bus()
+    bus.data.options.set_scenario('baseline')
+    bus.data.catalog_from_ppop(input_path=str(path), **kwargs)
+    return bus.data
+
+
+def test_catalog_columns(ppop_path):
+    # the star table is complete when only some of the planet columns are read
+    full = read_catalog(ppop_path)
+    selected = read_catalog(ppop_path, columns=['z', 'temp_p', 'angsep'])
+
+    assert set(STAR_COLUMNS) <= set(selected.stars.keys())
+    pd.testing.assert_frame_equal(selected.stars, full.stars)
+    assert 'mass_p' not in selected.catalog.keys()
+
+
+def test_catalog_star_rows(ppop_path):
+    data = read_catalog(ppop_path)
+    nstar = data.catalog.nstar.to_numpy()
+
+    for n in np.unique(nstar):
+        assert np.all(data.catalog_star_rows(nstar=n) == np.where(nstar == n)[0])
+    assert np.all(data.catalog_star_rows(nstar=np.array([2, 0]))
+                  == np.concatenate([np.where(nstar == 2)[0], np.where(nstar == 0)[0]]))
+
+    # stars that are not in the catalog
+    data.catalog = data.catalog[nstar != 1]
+    data.catalog_star_index()
+    for missing in [1, -1, 100, np.array([0, 1])]:
+        with pytest.raises(KeyError):
+            data.catalog_star_rows(nstar=missing)
+
+
+def write_fits(ppop_path, fits_path):
+    # converts the P-Pop output to a .fits table, where the indices are saved as 32-bit integers
+    # to test the conversion of the data types
+    table = pd.read_csv(ppop_path, sep='\t', skiprows=1, header=0, float_precision='round_trip')
+    columns = [fits.Column(name=key,
+                           format='A1' if key == 'Stype'
+                           else 'J' if key in ['Nuniverse', 'Nstar'] else 'D',
+                           array=table[key].to_numpy())
+               for key in table.keys()]
+    fits.BinTableHDU.from_columns(columns).writeto(fits_path)
+
+
+@pytest.mark.parametrize('kwargs', [{},
+                                    {'columns': ['z', 'temp_p', 'angsep']},
+                                    {'universes': [1]},
+                                    {'stypes': [2, 4], 'chunksize': 5},
+                                    {'distance': {3: 8.}, 'universes': [0], 'chunksize': 7}])
+def test_catalog_fits(ppop_path, tmp_path, kwargs):
+    # the .fits table gives the same catalog as the .txt file
+    write_fits(ppop_path, tmp_path / 'ppop.fits')
+    text = read_catalog(ppop_path, **kwargs)
+    table = read_catalog(tmp_path / 'ppop.fits', **kwargs)
+
+    assert table.catalog.shape[0] > 0
+    pd.testing.assert_frame_equal(table.catalog, text.catalog, check_exact=False, rtol=1e-13)
+    pd.testing.assert_frame_equal(table.stars, text.stars, check_exact=False, rtol=1e-13)
+
+
+@pytest.mark.parametrize('kwargs', [{'stypes': [1, 2, 4]},
+                                    {'distance': {4: 14., 2: 7.}},
+                                    {'distance': {3: 10.}},
+                                    {'stypes': [2, 3, 4], 'distance': {4: 14.}}])
+def test_catalog_selection(ppop_path, kwargs):
+    # the selection while reading gives the same catalog as the removal of the planets afterwards
+    selected = read_catalog(ppop_path, **kwargs)
+
+    data = read_catalog(ppop_path)
+    for stype, dist in kwargs.get('distance', {}).items():
+        data.catalog_remove_distance(stype=stype,
+                                     dist=dist,
+                                     mode='larger')
+    if 'stypes' in kwargs:
+        keep = np.isin(data.star_column('stype'), kwargs['stypes'])
+        data.catalog = data.catalog[keep]
+        data.catalog.index = np.arange(0, data.catalog.shape[0], 1)
+        data.catalog_remove_stars()
+        data.catalog_star_index()
+
+    assert 0 < selected.catalog.shape[0] < 24
+    pd.testing.assert_frame_equal(selected.catalog, data.catalog)
+    pd.testing.assert_frame_equal(selected.stars, data.stars)
+    for key in ['nstar', 'order', 'offsets']:
+        assert np.all(selected.star_index[key] == data.star_index[key])
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from conftest import make_bus
+
+
+@pytest.mark.parametrize('batch_mode', [False, True])
+def test_get_snr_workers(ppop_path, batch_mode):
+    # the results do not depend on the number of worker processes
+    serial = make_bus(ppop_path)
+    serial.modules['inst'].get_snr(safe_mode=True,
+                                   batch_mode=batch_mode)
+    parallel = make_bus(ppop_path)
+    parallel.modules['inst'].get_snr(safe_mode=True,
+                                     batch_mode=batch_mode,
+                                     workers=2)
+
+    for key in ['snr_1h', 'baseline', 'photon_rate_planet', 'photon_rate_noise']:
+        assert np.all(parallel.data.catalog[key].to_numpy()
+                      == serial.data.catalog[key].to_numpy())
+    for key in ['noise_astro', 'planet_flux_use']:
+        assert np.all(parallel.data.spectrum(key) == serial.data.spectrum(key))
+
+
+def test_get_snr_spectra_path(ppop_path, tmp_path):
+    # the memory-mapped spectra hold the same results as the arrays in memory
+    memory = make_bus(ppop_path)
+    memory.modules['inst'].get_snr(safe_mode=True)
+    mapped = make_bus(ppop_path,
+                      spectra_path=str(tmp_path / 'spectra'))
+    mapped.modules['inst'].get_snr(safe_mode=True)
+
+    assert mapped.data.spectra.keys() == memory.data.spectra.keys()
+    for name in memory.data.spectra.keys():
+        assert isinstance(mapped.data.spectra[name], np.memmap)
+        assert np.all(mapped.data.spectrum(name) == memory.data.spectrum(name))
+        assert np.all(np.load(tmp_path / 'spectra' / (name + '.npy'))
+                      == memory.data.spectra[name])
+    assert np.all(mapped.data.catalog.snr_1h.to_numpy() == memory.data.catalog.snr_1h.to_numpy())
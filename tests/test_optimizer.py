@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import lifesim
+from lifesim.core.data import STYPE_KEY
+
+from conftest import make_bus, write_ppop
+
+
+def add_optimizer(bus):
+    bus.add_module(lifesim.Optimizer(name='opt'))
+    bus.add_module(lifesim.AhgsModule(name='ahgs'))
+    bus.connect(('transm', 'opt'))
+    bus.connect(('inst', 'opt'))
+    bus.connect(('opt', 'ahgs'))
+    return bus
+
+
+@pytest.mark.parametrize('transmission', [lifesim.TransmissionMap,
+                                          lifesim.OrbitalTransmissionMap])
+def test_find_phase(ppop_path, transmission):
+    # the phase curves only depend on the angular separation of the planets, such that they are
+    # the same for both transmission modules
+    bus = add_optimizer(make_bus(ppop_path, transmission=transmission))
+    bus.modules['inst'].get_snr(safe_mode=True)
+    bus.modules['opt'].find_phase(recalc=True)
+
+    reference = add_optimizer(make_bus(ppop_path))
+    reference.modules['inst'].get_snr(safe_mode=True)
+    reference.modules['opt'].find_phase(recalc=True)
+
+    np.testing.assert_allclose(bus.data.spectrum('snr_phase'),
+                               reference.data.spectrum('snr_phase'),
+                               rtol=1e-12)
+    assert np.all(bus.data.catalog.snr_new.to_numpy()
+                  == np.max(bus.data.spectrum('snr_phase'), axis=1))
+
+
+@pytest.mark.parametrize('analytic', [True, False])
+def test_orbital_angsep(ppop_path, analytic):
+    # for a given angular separation, the orbital module places the planet at a fixed position
+    bus = make_bus(ppop_path, transmission=lifesim.OrbitalTransmissionMap)
+    bus.modules['inst'].apply_options()
+    bus.data.inst['bl'] = np.array([10., 20., 40.])
+    angsep = np.array([0.01, 0.05, 0.1])
+
+    reference = make_bus(ppop_path)
+    reference.modules['inst'].apply_options()
+    reference.data.inst['bl'] = bus.data.inst['bl']
+
+    orbital = bus.modules['transm'].transmission_efficiency(index=None,
+                                                            analytic=analytic,
+                                                            angsep=angsep)
+    static = reference.modules['transm'].transmission_efficiency(index=None,
+                                                                 analytic=analytic,
+                                                                 angsep=angsep)
+
+    for o, s in zip(orbital, static):
+        assert o.shape == (3, bus.data.inst['wl_bins'].shape[0])
+        np.testing.assert_allclose(o, s, rtol=1e-12)
+
+
+def test_find_phase_workers(ppop_path):
+    # the results do not depend on the number of worker processes
+    serial = add_optimizer(make_bus(ppop_path))
+    serial.modules['inst'].get_snr(safe_mode=True)
+    serial.modules['opt'].find_phase(recalc=True)
+
+    parallel = add_optimizer(make_bus(ppop_path))
+    parallel.modules['inst'].get_snr(safe_mode=True)
+    parallel.modules['opt'].find_phase(recalc=True,
+                                       workers=2)
+
+    assert np.all(parallel.data.spectrum('snr_phase') == serial.data.spectrum('snr_phase'))
+    for key in ['theta_p', 'angsep', 'snr_new']:
+        assert np.all(parallel.data.catalog[key].to_numpy() == serial.data.catalog[key].to_numpy())
+
+
+def scan_allocate(module):
+    # allocation of the observation time as in earlier versions of LIFEsim, where the best slope
+    # is searched for in an array holding the slopes of all stars
+    def slopes():
+        obs = np.full((stars, planets), np.inf)
+        for i in range(stars):
+            temp = module.obs_array_star(star=i)
+            obs[i, :temp.shape[0]] = temp
+        return obs
+
+    optm = module.data.optm
+    stars = optm['stype'].shape[0]
+    planets = np.max(np.diff(optm['offsets']))
+    obs = slopes()
+    obs_time = (module.data.options.optimization['t_search']
+                * module.data.options.array['t_efficiency'])
+
+    tot_time = 0
+    while tot_time < obs_time:
+        no_star, ind_t = np.unravel_index(np.argmin(obs), obs.shape)
+        if (tot_time + obs[no_star, ind_t] * (ind_t + 1) + 0.01) > obs_time:
+            rem_time = obs_time - tot_time
+            module.observe_star(star=no_star,
+                                int_time=rem_time)
+            tot_time += rem_time
+        else:
+            module.observe_star(star=no_star,
+                                int_time=obs[no_star, ind_t] * (ind_t + 1) + 0.01)
+            tot_time += obs[no_star, ind_t] * (ind_t + 1) + 0.01
+            temp = module.obs_array_star(star=no_star)
+            obs[no_star, :] = np.inf
+            obs[no_star, :temp.shape[0]] = temp
+
+        if np.any(np.logical_and((optm['sum_detected'] / optm['num_universe'])
+                                 > module.data.options.optimization['limit'][1][:],
+                                 np.invert(optm['hit_limit']))):
+            optm['hit_limit'] = ((optm['sum_detected'] / optm['num_universe'])
+                                 >= module.data.options.optimization['limit'][1][:])
+            obs = slopes()
+
+
+@pytest.mark.parametrize('t_search', [1e5, 1e6, 1e7])
+def test_ahgs_scan(tmp_path, t_search):
+    # the priority queue of the aHGS module observes the stars in the same order as the search
+    # in the array of all slopes, also when the detection limits are reached
+    write_ppop(tmp_path / 'ppop.txt', n_stars=8)
+    limit = np.array(((0, 1, 2, 3, 4),
+                      (np.inf, 1., np.inf, 2., np.inf)))
+
+    buses = []
+    for _ in range(2):
+        bus = add_optimizer(make_bus(tmp_path / 'ppop.txt',
+                                     t_search=t_search))
+        bus.data.options.optimization['limit'] = limit
+        bus.modules['inst'].get_snr(safe_mode=True)
+        bus.data.catalog['habitable'] = True
+        buses.append(bus)
+    heap, scan = buses
+    scan.modules['ahgs'].allocate = lambda: scan_allocate(scan.modules['ahgs'])
+
+    heap.modules['opt'].ahgs()
+    scan.modules['opt'].ahgs()
+
+    for key in ['sum_detected', 'hit_limit', 'tot_time']:
+        assert np.all(heap.data.optm[key] == scan.data.optm[key])
+    for key in ['detected', 'snr_current', 'int_time', 't_slew', 't_detected']:
+        assert np.all(heap.data.catalog[key].to_numpy() == scan.data.catalog[key].to_numpy())
+    if t_search > 1e5:
+        assert np.any(heap.data.optm['hit_limit'])
+
+
+def run_ahgs(ppop_path, **options):
+    bus = add_optimizer(make_bus(ppop_path, **options))
+    bus.modules['inst'].get_snr(safe_mode=True)
+    bus.data.catalog['habitable'] = True
+    curve = bus.modules['opt'].ahgs()
+    return bus, curve
+
+
+@pytest.mark.parametrize('t_search', [2e5, 5e5, 1e6])
+def test_yield_curve(tmp_path, t_search):
+    # the yield curve of a long search phase gives the yield per universe of a shorter one
+    write_ppop(tmp_path / 'ppop.txt', n_universes=3, n_stars=8)
+    _, curve = run_ahgs(tmp_path / 'ppop.txt', t_search=1e7)
+    bus, _ = run_ahgs(tmp_path / 'ppop.txt', t_search=t_search)
+    assert np.any(bus.data.optm['sum_detected'] > 0)
+
+    assert np.all(curve[np.searchsorted(curve[:, 0], t_search, side='right') - 1, 1:]
+                  == bus.data.optm['sum_detected'] / bus.data.optm['num_universe'])
+
+
+def options_state(options):
+    return {key: {name: np.copy(value) if isinstance(value, np.ndarray) else value
+                  for name, value in getattr(options, key).items()}
+            for key in ('array', 'other', 'models', 'optimization')}
+
+
+def assert_options_equal(state, options):
+    for key, values in state.items():
+        assert getattr(options, key).keys() == values.keys()
+        for name, value in values.items():
+            assert np.array_equal(getattr(options, key)[name], value)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ahgs_scenarios(tmp_path, workers):
+    write_ppop(tmp_path / 'ppop.txt', n_universes=3, n_stars=8)
+    limit = np.array(((0, 1, 2, 3, 4),
+                      (np.inf, 1., np.inf, 2., np.inf)))
+    scenarios = [{}, {'snr_target': 5, 't_search': 5e5}]
+
+    bus, _ = run_ahgs(tmp_path / 'ppop.txt', t_search=1e6, limit=limit)
+    catalog = bus.data.catalog.copy()
+    options = options_state(bus.data.options)
+
+    yields = bus.modules['opt'].ahgs_scenarios(scenarios=scenarios,
+                                               workers=workers)
+
+    # the catalog and the options are left unchanged
+    pd.testing.assert_frame_equal(bus.data.catalog, catalog)
+    assert_options_equal(options, bus.data.options)
+
+    # every scenario gives the yield of a run of the aHGS algorithm with its options
+    for i, scenario in enumerate(scenarios):
+        reference, _ = run_ahgs(tmp_path / 'ppop.txt', **{'t_search': 1e6, **scenario},
+                                limit=limit)
+        detected = (reference.data.optm['sum_detected']
+                    / reference.data.optm['num_universe'])
+        for key, value in STYPE_KEY.items():
+            assert yields[key].iloc[i] == detected[limit[0] == value].sum()
+        assert yields['total'].iloc[i] == detected.sum()
+    assert np.any(yields['total'] > 0)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ahgs_universes(tmp_path, workers):
+    write_ppop(tmp_path / 'ppop.txt', n_universes=3, n_stars=8)
+    limit = np.array(((0, 1, 2, 3, 4),
+                      (np.inf, 1., np.inf, 2., np.inf)))
+
+    bus, _ = run_ahgs(tmp_path / 'ppop.txt', t_search=5e5, limit=limit)
+    catalog = bus.data.catalog.copy()
+    yields, summary = bus.modules['opt'].ahgs_universes(workers=workers)
+    pd.testing.assert_frame_equal(bus.data.catalog, catalog)
+
+    # every universe gives the yield of a run of the aHGS algorithm on a catalog containing only
+    # this universe, for which the universe is renumbered such that the yield is not averaged
+    assert list(yields.index) == [0, 1, 2]
+    for nuniverse in yields.index:
+        reference = add_optimizer(make_bus(tmp_path / 'ppop.txt', t_search=5e5, limit=limit))
+        reference.data.catalog_from_ppop(input_path=str(tmp_path / 'ppop.txt'),
+                                         universes=[nuniverse],
+                                         overwrite=True)
+        reference.modules['inst'].get_snr(safe_mode=True)
+        reference.data.catalog['habitable'] = True
+        reference.data.catalog['nuniverse'] = 0
+        reference.modules['opt'].ahgs()
+        detected = reference.data.optm['sum_detected']
+        for key, value in STYPE_KEY.items():
+            assert yields.loc[nuniverse, key] == detected[limit[0] == value].sum()
+        assert yields.loc[nuniverse, 'total'] == detected.sum()
+
+    assert np.any(yields['total'] > 0)
+    assert np.all(summary.loc['mean'] == yields.mean())
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import lifesim
+
+from conftest import make_bus
+
+
+@pytest.mark.parametrize('batch_mode', [False, True])
+def test_get_snr_orbital(ppop_path, batch_mode):
+    # regression test: get_snr hands the row positions of all planets of a star to the
+    # transmission module at once
+    bus = make_bus(ppop_path, transmission=lifesim.OrbitalTransmissionMap)
+    bus.modules['inst'].get_snr(safe_mode=True,
+                                batch_mode=batch_mode)
+
+    # recalculate the signal-to-noise ratio planet by planet
+    transm = bus.modules['transm']
+    snr = np.zeros(bus.data.catalog.shape[0])
+    for n in range(bus.data.catalog.shape[0]):
+        bus.data.inst['bl'] = bus.data.catalog.baseline.iloc[n]
+        transm_eff, transm_noise = transm.transmission_efficiency(index=n)
+        assert transm_eff.shape == bus.data.inst['wl_bins'].shape
+
+        planet_flux_use = bus.data.spectrum('planet_flux_use', n)
+        noise = bus.data.spectrum('noise_astro', n) + planet_flux_use * transm_noise * 2
+        snr[n] = np.sqrt(((planet_flux_use * transm_eff) ** 2 / noise).sum())
+
+    assert np.all(bus.data.catalog.snr_1h.to_numpy() > 0)
+    np.testing.assert_allclose(bus.data.catalog.snr_1h.to_numpy(), snr, rtol=1e-12)
@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+from lifesim.instrument.transmission import disk_transmission
+
+from conftest import make_bus
+
+
+def disk_mean(k, ratio, n_r=200, n_phi=2048):
+    # mean of the TM3 transmission sin^2(k x) * cos^2(ratio * k * y - pi / 4) over the unit disk,
+    # with Gauss-Legendre quadrature in the radius and the trapezoidal rule in the azimuth
+    r, w = np.polynomial.legendre.leggauss(n_r)
+    r, w = (r + 1) / 2, w / 2
+    phi = np.linspace(0, 2 * np.pi, n_phi, endpoint=False)[:, np.newaxis]
+    tm3 = (np.sin(k * r * np.cos(phi)) ** 2
+           * np.cos(ratio * k * r * np.sin(phi) - np.pi / 4) ** 2)
+    return 2 * (tm3.mean(axis=0) * r * w).sum()
+
+
+@pytest.mark.parametrize('ratio', [1., 6.])
+@pytest.mark.parametrize('k', [1e-3, 0.1, 0.49, 0.51, 1., 5., 20.])
+def test_disk_transmission_quadrature(k, ratio):
+    assert disk_transmission(k) == pytest.approx(disk_mean(k, ratio), rel=1e-12, abs=0)
+
+
+def test_disk_transmission_array():
+    k = np.array([[0., 0.2], [0.5, 3.]])
+    assert disk_transmission(k).shape == k.shape
+    assert disk_transmission(k)[0, 0] == 0.
+    assert np.all(disk_transmission(k)[0] == [disk_transmission(0.), disk_transmission(0.2)])
+
+
+@pytest.mark.parametrize('bl', [10., 35., 100.])
+def test_localzodi_modes(ppop_path, bl):
+    # the closed form agrees with the average over the pixels of the transmission map up to the
+    # pixelation of the aperture edge
+    bus = make_bus(ppop_path, image_size=256)
+    bus.modules['inst'].apply_options()
+    bus.modules['inst'].apply_baseline(baseline=bl)
+    _, _, bus.data.inst['t_map'], _, _ = bus.modules['transm'].transmission_map(
+        map_selection='tm3')
+
+    noise = {}
+    for mode in ['analytic', 'map']:
+        bus.data.options.other['localzodi_mode'] = mode
+        noise[mode] = bus.modules['local'].noise(index=0)
+
+    np.testing.assert_allclose(noise['analytic'], noise['map'], rtol=2e-3)
+
+
+def test_star_modes(ppop_path):
+    # the pixelated stellar disk of the map mode is slightly larger than the star, resulting in an
+    # about 5% larger leakage
+    bus = make_bus(ppop_path)
+    bus.modules['inst'].apply_options()
+    bus.data.inst['bl'] = np.array([10., 35., 100.])
+    index = np.array([0, 3, 6])
+
+    noise = {}
+    for mode in ['analytic', 'map']:
+        bus.data.options.other['star_mode'] = mode
+        noise[mode] = bus.modules['star'].noise(index=index)
+
+    assert noise['analytic'].shape == (3, bus.data.inst['wl_bins'].shape[0])
+    assert np.all(noise['analytic'] < noise['map'])
+    np.testing.assert_allclose(noise['analytic'], noise['map'], rtol=0.1)
+
+    # the stars of a batch agree with the stars calculated one by one
+    bus.data.options.other['star_mode'] = 'analytic'
+    bl = bus.data.inst['bl']
+    for i, n in enumerate(index):
+        bus.data.inst['bl'] = bl[i]
+        np.testing.assert_allclose(bus.modules['star'].noise(index=n), noise['analytic'][i],
+                                   rtol=1e-14)
+
+
+@pytest.mark.parametrize('batch_mode', [False, True])
+def test_exozodi_scaling(ppop_path, batch_mode):
+    # every planet receives the exozodi leakage of its own zodi level, even though the leakage is
+    # only calculated once per star
+    bus = make_bus(ppop_path)
+    bus.modules['inst'].get_snr(safe_mode=True,
+                                batch_mode=batch_mode)
+    integration_time = 60 * 60 * bus.data.options.array['rotation_period']
+    z = bus.data.catalog.z.to_numpy()
+
+    for n in range(bus.data.catalog.shape[0]):
+        bus.modules['inst'].apply_baseline(baseline=bus.data.catalog.baseline.iloc[n])
+        _, _, bus.data.inst['t_map'], _, _ = bus.modules['transm'].transmission_map(
+            map_selection='tm3')
+
+        exozodi = bus.modules['exo'].noise(index=n)
+        np.testing.assert_allclose(bus.modules['exo'].noise(index=n, unit_zodi=True) * z[n],
+                                   exozodi, rtol=1e-14)
+
+        noise = (exozodi
+                 + bus.modules['local'].noise(index=n)
+                 + bus.modules['star'].noise(index=n))
+        np.testing.assert_allclose(bus.data.spectrum('noise_astro', n),
+                                   noise * integration_time * bus.data.inst['eff_tot'] * 2,
+                                   rtol=1e-12)
+
+    # the planets around the same star differ in their zodi level and background noise
+    rows = bus.data.catalog_star_rows(nstar=0)
+    assert np.unique(z[rows]).shape[0] == rows.shape[0]
+    assert np.unique(bus.data.spectrum('noise_astro', rows)[:, 0]).shape[0] == rows.shape[0]
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from scipy.special import factorial, jv
+
+from lifesim.instrument import transmission
+
+from conftest import make_bus, write_ppop
+
+
+def azimuthal_mean(integrand, n_phi=8192):
+    # the integrands are smooth and periodic, such that the trapezoidal rule converges
+    # exponentially. All samples are positive and their sum does not suffer from cancellation
+    phi = np.linspace(0, 2 * np.pi, n_phi, endpoint=False)
+    return integrand(phi).mean()
+
+
+# phases u along the nulling baseline on both sides of the cutoffs of the power series
+U_VALUES = [1e-3, 0.01, 0.04, 0.042, 0.1, 0.3, 0.45, 0.499, 0.501, 0.55, 1., 3., 10.]
+
+
+@pytest.mark.parametrize('ratio', [1., 2., 6.])
+@pytest.mark.parametrize('u', U_VALUES)
+def test_mean_square_quadrature(u, ratio):
+    v = ratio * u
+
+    chop = transmission._mean_square(u=np.array([u]), v=np.array([v]), const=3,
+                                     terms=transmission._CHOP_TERMS,
+                                     series=transmission._CHOP_SERIES,
+                                     u_series=transmission._CHOP_U_SERIES,
+                                     norm=16)[0]
+    tm4 = transmission._mean_square(u=np.array([u]), v=np.array([v]), const=9,
+                                    terms=transmission._TM4_TERMS,
+                                    series=transmission._TM4_SERIES,
+                                    u_series=transmission._TM4_U_SERIES,
+                                    norm=64)[0]
+
+    chop_ref = azimuthal_mean(lambda phi: (np.sin(u * np.cos(phi)) ** 4
+                                           * np.sin(2 * v * np.sin(phi)) ** 2))
+    tm4_ref = azimuthal_mean(lambda phi: (np.sin(u * np.cos(phi)) ** 4
+                                          * np.cos(v * np.sin(phi) + np.pi / 4) ** 4))
+
+    assert chop == pytest.approx(chop_ref, rel=1e-13, abs=0)
+    assert tm4 == pytest.approx(tm4_ref, rel=1e-13, abs=0)
+
+
+def test_bessel_ratios():
+    x = np.array([1e-3, 0.5, 0.999, 1., 1.5, 7., 40.])
+    ratios = transmission._bessel_ratios(12, np.append(0., x))
+
+    for k in range(13):
+        assert ratios[k, 0] == 1 / (2 ** k * factorial(k))
+        np.testing.assert_allclose(ratios[k, 1:], jv(k, x) / x ** k, rtol=1e-12, atol=0)
+
+
+def test_transmission_efficiency_sampled(ppop_path):
+    # for moderate separations, the closed form agrees with the sampled average over a rotation
+    bus = make_bus(ppop_path)
+    bus.modules['inst'].apply_options()
+    bus.data.inst['bl'] = 15.
+    angsep = np.array([1e-4, 1e-3, 0.01, 0.03])
+
+    analytic = bus.modules['transm'].transmission_efficiency(index=None, angsep=angsep)
+    sampled = bus.modules['transm'].transmission_efficiency(index=None, angsep=angsep,
+                                                            analytic=False)
+
+    for a, s in zip(analytic, sampled):
+        np.testing.assert_allclose(a, s, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize('bl_quantization', [0.1, 0.5])
+def test_bl_quantization(tmp_path, bl_quantization):
+    # the documented tolerance of the rounded baselines of the cached transmission maps
+    path = tmp_path / 'ppop.txt'
+    write_ppop(path, n_universes=1, n_stars=20, n_planets=2, seed=3)
+
+    exact = make_bus(path)
+    exact.modules['inst'].get_snr()
+    rounded = make_bus(path, bl_quantization=bl_quantization)
+    rounded.modules['inst'].get_snr()
+
+    snr = exact.data.catalog.snr_1h.to_numpy()
+    bl = exact.data.catalog.baseline.to_numpy()
+    assert np.all(np.abs(rounded.data.catalog.snr_1h.to_numpy() / snr - 1)
+                  <= bl_quantization / (2 * bl))